@@ -4,11 +4,17 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import os
+import sys
 import json
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
 import uvicorn
+
+# Shared modules (connection pool, search agent) live in the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_pool import get_connection, pool_stats
+
 # Optional imports for Google Sheets functionality
 try:
     from .job_sync_service import get_job_sync_service
@@ -45,7 +51,7 @@ def get_db():
     if not DATABASE_URL:
         raise HTTPException(status_code=500, detail="Database URL not configured")
     
-    conn = psycopg2.connect(DATABASE_URL)
+    conn = get_connection(DATABASE_URL)
     try:
         yield conn
     finally:
@@ -60,6 +66,11 @@ class JobResponse(BaseModel):
     description: Optional[str]
     job_url: Optional[str]
     match_score: Optional[int]
+    base_score: Optional[int]
+    location_bonus: Optional[int]
+    company_bonus: Optional[int]
+    match_rationale: Optional[str]
+    score_status: Optional[str]
     ai_analysis: Optional[str]
     contacts: Optional[dict]
     status: str
@@ -94,7 +105,7 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "message": "API is running", "cors_test": "success"}
+    return {"status": "healthy", "message": "API is running", "cors_test": "success", "db_pool": pool_stats()}
 
 @app.get("/api/jobs")
 async def get_jobs(
@@ -116,74 +127,74 @@ async def get_jobs(
             )
         
         # Connect to database
-        print(f"🔌 Connecting to database...")
-        conn = psycopg2.connect(DATABASE_URL)
-        
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            # First, check if table exists
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'jobs'
-                );
-            """)
-            table_exists = cur.fetchone()['exists']
-            print(f"📋 Jobs table exists: {table_exists}")
+        print(f"🔌 Checking out a pooled database connection...")
+        conn = get_connection(DATABASE_URL)
+        
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                # First, check if table exists
+                cur.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables 
+                        WHERE table_name = 'jobs'
+                    );
+                """)
+                table_exists = cur.fetchone()['exists']
+                print(f"📋 Jobs table exists: {table_exists}")
             
-            if not table_exists:
-                conn.close()
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": "Database not initialized", "detail": "Jobs table does not exist. Please run /api/init-database first."}
-                )
+                if not table_exists:
+                    return JSONResponse(
+                        status_code=500,
+                        content={"error": "Database not initialized", "detail": "Jobs table does not exist. Please run /api/init-database first."}
+                    )
             
-            # Build query
-            query = """
-                SELECT * FROM jobs 
-                WHERE 1=1
-            """
-            params = []
+                # Build query
+                query = """
+                    SELECT * FROM jobs 
+                    WHERE 1=1
+                """
+                params = []
             
-            if status:
-                query += " AND status = %s"
-                params.append(status)
+                if status:
+                    query += " AND status = %s"
+                    params.append(status)
             
-            if exclude_status:
-                query += " AND status != %s"
-                params.append(exclude_status)
+                if exclude_status:
+                    query += " AND status != %s"
+                    params.append(exclude_status)
                 
-            if min_score:
-                query += " AND match_score >= %s"
-                params.append(min_score)
+                if min_score:
+                    query += " AND match_score >= %s"
+                    params.append(min_score)
                 
-            query += " ORDER BY match_score DESC, created_at DESC LIMIT %s"
-            params.append(limit)
+                query += " ORDER BY match_score DESC NULLS LAST, relevance_score DESC NULLS LAST, created_at DESC LIMIT %s"
+                params.append(limit)
             
-            print(f"📝 Executing query: {query}")
-            print(f"🔢 With params: {params}")
+                print(f"📝 Executing query: {query}")
+                print(f"🔢 With params: {params}")
             
-            cur.execute(query, params)
-            jobs = cur.fetchall()
+                cur.execute(query, params)
+                jobs = cur.fetchall()
             
-            print(f"📊 Raw database results: {len(jobs)} jobs found")
-            if jobs:
-                print(f"📋 First job raw: {dict(jobs[0])}")
+                print(f"📊 Raw database results: {len(jobs)} jobs found")
+                if jobs:
+                    print(f"📋 First job raw: {dict(jobs[0])}")
             
-            # Convert to list of dicts and handle JSON fields
-            result = []
-            for job in jobs:
-                job_dict = dict(job)
-                if job_dict['contacts'] is None:
-                    job_dict['contacts'] = []
-                result.append(job_dict)
+                # Convert to list of dicts and handle JSON fields
+                result = []
+                for job in jobs:
+                    job_dict = dict(job)
+                    if job_dict['contacts'] is None:
+                        job_dict['contacts'] = []
+                    result.append(job_dict)
             
-            conn.close()
-            
-            print(f"✅ Returning {len(result)} jobs to frontend")
-            if result:
-                print(f"📋 First job processed keys: {list(result[0].keys())}")
+                print(f"✅ Returning {len(result)} jobs to frontend")
+                if result:
+                    print(f"📋 First job processed keys: {list(result[0].keys())}")
                 
-            return result
+                return result
+        finally:
+            conn.close()
             
     except psycopg2.Error as db_error:
         print(f"❌ Database connection/query error: {str(db_error)}")
@@ -272,11 +283,11 @@ async def get_stats(conn = Depends(get_db)):
             cur.execute("SELECT AVG(match_score) as avg_score FROM jobs WHERE match_score IS NOT NULL")
             avg_score = cur.fetchone()['avg_score']
             
-            # Top companies
+            # Top companies - grouped by canonical company so "Stripe" and "Stripe, Inc." count together
             cur.execute("""
-                SELECT company_name, COUNT(*) as count 
+                SELECT MIN(company_name) as company_name, COUNT(*) as count 
                 FROM jobs 
-                GROUP BY company_name 
+                GROUP BY COALESCE(company_canonical, LOWER(company_name)) 
                 ORDER BY count DESC 
                 LIMIT 10
             """)
@@ -292,6 +303,54 @@ async def get_stats(conn = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+@app.get("/api/runs")
+async def get_runs(limit: int = 20, conn = Depends(get_db)):
+    """Recent search runs with their per-stage metrics and totals"""
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT id, trigger, status, stage, attempts, queries_fetched, jobs_scored,
+                       jobs_persisted, started_at, updated_at, finished_at
+                FROM search_runs
+                ORDER BY started_at DESC
+                LIMIT %s
+            """, (limit,))
+            runs = [dict(row) for row in cur.fetchall()]
+            if not runs:
+                return []
+            
+            cur.execute("""
+                SELECT run_id, stage, metric, value
+                FROM run_metrics
+                WHERE run_id = ANY(%s)
+            """, ([run['id'] for run in runs],))
+            metrics = {}
+            for row in cur.fetchall():
+                metrics.setdefault(row['run_id'], {}).setdefault(row['stage'], {})[row['metric']] = row['value']
+            
+        for run in runs:
+            stages = metrics.get(run['id'], {})
+            run['metrics'] = stages
+            # Money and volume at a glance
+            run['totals'] = {
+                "wall_seconds": stages.get('run', {}).get('wall_seconds', 0),
+                "serpapi_calls": sum(v.get('calls', 0) for k, v in stages.items() if k.startswith('serpapi:')),
+                "serpapi_credits": sum(v.get('credits', 0) for k, v in stages.items() if k.startswith('serpapi:')),
+                "serpapi_cache_hits": sum(v.get('cache_hits', 0) for k, v in stages.items() if k.startswith('serpapi:')),
+                "openai_calls": sum(v.get('calls', 0) for k, v in stages.items() if k.startswith('openai:')),
+                "openai_prompt_tokens": sum(v.get('prompt_tokens', 0) for k, v in stages.items() if k.startswith('openai:')),
+                "openai_completion_tokens": sum(v.get('completion_tokens', 0) for k, v in stages.items() if k.startswith('openai:')),
+                "score_cache_hits": stages.get('score', {}).get('cache_hits', 0),
+                "jobs_seen": stages.get('jobs', {}).get('seen', 0),
+                "jobs_new": stages.get('jobs', {}).get('new', 0),
+                "jobs_duplicate": sum(stages.get('jobs', {}).get(key, 0)
+                                      for key in ('batch_duplicates', 'stored_duplicates', 'already_stored')),
+            }
+        return runs
+            
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
 @app.post("/api/init-database")
 async def init_database():
     """Initialize database with schema - run this once after deployment"""
@@ -309,10 +368,18 @@ async def init_database():
             job_hash VARCHAR(32) UNIQUE NOT NULL,
             title VARCHAR(255) NOT NULL,
             company_name VARCHAR(255) NOT NULL,
+            company_canonical VARCHAR(255),
             location VARCHAR(255),
             description TEXT,
             job_url TEXT,
             match_score INTEGER,
+            base_score INTEGER,
+            location_bonus INTEGER,
+            company_bonus INTEGER,
+            match_rationale TEXT,
+            score_status VARCHAR(20) DEFAULT 'scored',
+            last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            relevance_score INTEGER,
             ai_analysis TEXT,
             contacts JSONB,
             status VARCHAR(50) DEFAULT 'new',
@@ -333,6 +400,10 @@ async def init_database():
             name VARCHAR(255) NOT NULL,
             company VARCHAR(255),
             linkedin_url TEXT,
+            company_canonical VARCHAR(255),
+            snippet TEXT,
+            source VARCHAR(50),
+            discovered_at TIMESTAMP,
             position VARCHAR(255),
             notes TEXT,
             last_contacted TIMESTAMP,
@@ -346,10 +417,83 @@ async def init_database():
             PRIMARY KEY (job_id, contact_id)
         );
 
+        CREATE TABLE IF NOT EXISTS query_yields (
+            id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+            source VARCHAR(100) NOT NULL,
+            query TEXT NOT NULL,
+            credits INTEGER NOT NULL DEFAULT 1,
+            results INTEGER NOT NULL DEFAULT 0,
+            new_jobs INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_query_yields_lookup ON query_yields(source, query, created_at DESC);
+
+        CREATE TABLE IF NOT EXISTS query_fingerprints (
+            source VARCHAR(100) NOT NULL,
+            query TEXT NOT NULL,
+            fingerprint VARCHAR(64) NOT NULL,
+            result_count INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, query)
+        );
+
+        CREATE TABLE IF NOT EXISTS search_runs (
+            id SERIAL PRIMARY KEY,
+            trigger VARCHAR(20) NOT NULL DEFAULT 'manual',
+            status VARCHAR(20) NOT NULL DEFAULT 'running',
+            stage VARCHAR(30) NOT NULL DEFAULT 'search',
+            attempts INTEGER NOT NULL DEFAULT 1,
+            queries_fetched INTEGER NOT NULL DEFAULT 0,
+            jobs_scored INTEGER NOT NULL DEFAULT 0,
+            jobs_persisted INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_search_runs_status ON search_runs(status, started_at DESC);
+
+        CREATE TABLE IF NOT EXISTS search_run_checkpoints (
+            run_id INTEGER NOT NULL REFERENCES search_runs(id) ON DELETE CASCADE,
+            stage VARCHAR(30) NOT NULL,
+            key TEXT NOT NULL,
+            payload JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_id, stage, key)
+        );
+
+        CREATE TABLE IF NOT EXISTS run_metrics (
+            run_id INTEGER NOT NULL REFERENCES search_runs(id) ON DELETE CASCADE,
+            stage VARCHAR(100) NOT NULL,
+            metric VARCHAR(50) NOT NULL,
+            value DOUBLE PRECISION NOT NULL DEFAULT 0,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_id, stage, metric)
+        );
+
         CREATE INDEX IF NOT EXISTS idx_jobs_match_score ON jobs(match_score DESC);
         CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
         CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
         CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company_name);
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS company_canonical VARCHAR(255);
+        CREATE INDEX IF NOT EXISTS idx_jobs_company_canonical ON jobs(company_canonical);
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS score_status VARCHAR(20) DEFAULT 'scored';
+        CREATE INDEX IF NOT EXISTS idx_jobs_score_status ON jobs(score_status);
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS relevance_score INTEGER;
+        CREATE INDEX IF NOT EXISTS idx_jobs_relevance_score ON jobs(relevance_score DESC);
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS base_score INTEGER;
+        CREATE INDEX IF NOT EXISTS idx_jobs_base_score ON jobs(base_score DESC);
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+        CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen DESC);
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS location_bonus INTEGER;
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS company_bonus INTEGER;
+        ALTER TABLE jobs ADD COLUMN IF NOT EXISTS match_rationale TEXT;
+        ALTER TABLE contacts ADD COLUMN IF NOT EXISTS company_canonical VARCHAR(255);
+        ALTER TABLE contacts ADD COLUMN IF NOT EXISTS snippet TEXT;
+        ALTER TABLE contacts ADD COLUMN IF NOT EXISTS source VARCHAR(50);
+        ALTER TABLE contacts ADD COLUMN IF NOT EXISTS discovered_at TIMESTAMP;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_contacts_company_linkedin ON contacts(company_canonical, linkedin_url);
 
         CREATE OR REPLACE FUNCTION update_updated_at_column()
         RETURNS TRIGGER AS $$
@@ -367,11 +511,23 @@ async def init_database():
         """
         
         # Connect and execute schema
-        conn = psycopg2.connect(database_url)
-        with conn.cursor() as cur:
-            cur.execute(schema_sql)
-        conn.commit()
-        conn.close()
+        conn = get_connection(database_url)
+        try:
+            with conn.cursor() as cur:
+                cur.execute(schema_sql)
+            conn.commit()
+        finally:
+            conn.close()
+        
+        # Canonical company IDs for rows stored before the column existed
+        try:
+            import sys
+            sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+            from job_search_agent import backfill_company_canonical
+            backfilled = backfill_company_canonical()
+            print(f"🏢 Backfilled company_canonical for {backfilled} companies")
+        except Exception as e:
+            print(f"⚠️ company_canonical backfill skipped: {e}")
         
         return {"message": "✅ Database initialized successfully! Tables created."}
         
@@ -392,12 +548,14 @@ async def run_job_search():
         print(f"📁 Current working directory: {os.getcwd()}")
         print(f"📂 Script exists: {os.path.exists(script_path)}")
         
-        # Run the job search script
+        # Run the job search script; a run cut short by the timeout is
+        # checkpointed in search_runs and resumed by the next call
         result = subprocess.run(
             ["python", script_path],
             capture_output=True,
             text=True,
-            timeout=300  # 5 minute timeout
+            timeout=300,  # 5 minute timeout
+            env={**os.environ, "SEARCH_RUN_TRIGGER": "api"}
         )
         
         print(f"🏁 Script finished with return code: {result.returncode}")
@@ -412,7 +570,7 @@ async def run_job_search():
         }
         
     except subprocess.TimeoutExpired:
-        raise HTTPException(status_code=408, detail="Search timed out after 5 minutes")
+        raise HTTPException(status_code=408, detail="Search timed out after 5 minutes - run it again to resume from its last checkpoint")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error running search: {str(e)}")
 
@@ -476,8 +634,12 @@ async def import_jobs_from_sheets(request: GoogleSheetsSync):
 async def test_serpapi():
     """Test if SERPAPI_KEY is working"""
     try:
+        import sys
         import os
-        from serpapi import GoogleSearch
+        sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+        
+        # Live call (no cache) that still goes through the shared SerpAPI rate limiter
+        from serpapi_client import serpapi_search
         
         serpapi_key = os.getenv("SERPAPI_KEY")
         print(f"🔑 Testing SERPAPI_KEY: {bool(serpapi_key)}")
@@ -492,8 +654,7 @@ async def test_serpapi():
             "api_key": serpapi_key
         }
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = serpapi_search(params, use_cache=False)
         
         jobs_count = len(results.get("jobs_results", []))
         print(f"🔍 Test search returned {jobs_count} jobs")
@@ -518,7 +679,7 @@ async def search_company_jobs(request: CompanySearchRequest):
         import os
         sys.path.append(os.path.dirname(os.path.dirname(__file__)))
         
-        from job_search_agent import search_single_company, user_profile, match_job_to_user, save_job_to_db, create_job_hash, job_exists
+        from job_search_agent import search_single_company, user_profile, score_jobs_async, fill_with_local_scores, new_job_writer, create_job_hash, filter_new_job_hashes
         
         company_name = request.company_name.strip()
         if not company_name:
@@ -551,51 +712,47 @@ async def search_company_jobs(request: CompanySearchRequest):
         new_jobs_count = 0
         processed_jobs = []
         
-        for job in jobs:
-            # Create job hash for deduplication
-            job_hash = create_job_hash(job)
-            
-            # Skip if job already exists
-            if job_exists(job_hash):
+        # Skip jobs that already exist - one existence query for the whole batch
+        hashed_jobs = [(create_job_hash(job), job) for job in jobs]
+        new_hashes = set(filter_new_job_hashes([job_hash for job_hash, _ in hashed_jobs]))
+        new_jobs = []
+        for job_hash, job in hashed_jobs:
+            if job_hash not in new_hashes:
                 print(f"  ⏭️ Skipping existing job: {job.get('title', 'Unknown')}")
                 continue
+            new_jobs.append((job_hash, job))
+        
+        # Get AI match scores for all new jobs in concurrent batched requests;
+        # jobs that can't be scored get a local relevance estimate and stay pending
+        scores = await score_jobs_async([job for _, job in new_jobs], user_profile)
+        scores, relevance_scores = fill_with_local_scores([job for _, job in new_jobs], scores, user_profile)
+        
+        with new_job_writer() as writer:
+            for (job_hash, job), score, relevance_score in zip(new_jobs, scores, relevance_scores):
+                # Get job URL
+                job_url = (job.get('job_url') or 
+                          job.get('link') or 
+                          job.get('source_url') or '')
             
-            # Get AI match score
-            try:
-                score_output = match_job_to_user(job, user_profile)
-                # Extract numeric score
-                import re
-                score_numbers = re.findall(r'\b(\d+)\b', score_output)
-                numeric_score = int(score_numbers[0]) if score_numbers else 75
-            except Exception as e:
-                print(f"  ⚠️ Error getting AI score: {e}")
-                score_output = f"Score: 75 - Company search result for {company_name}"
-                numeric_score = 75
-            
-            # Get job URL
-            job_url = (job.get('job_url') or 
-                      job.get('link') or 
-                      job.get('source_url') or '')
-            
-            # Prepare job data for database
-            job_data = {
-                'job_hash': job_hash,
-                'title': job.get('title', ''),
-                'company_name': job.get('company_name', company_name),
-                'location': job.get('location', 'See Company Site'),
-                'description': job.get('description', ''),
-                'job_url': job_url,
-                'match_score': numeric_score,
-                'ai_analysis': score_output,
-                'contacts': []  # No LinkedIn search for custom company search
-            }
+                # Prepare job data for database
+                job_data = {
+                    'job_hash': job_hash,
+                    'title': job.get('title', ''),
+                    'company_name': job.get('company_name', company_name),
+                    'location': job.get('location', 'See Company Site'),
+                    'description': job.get('description', ''),
+                    'job_url': job_url,
+                    **score.columns(),
+                    'relevance_score': relevance_score,
+                    'contacts': []  # No LinkedIn search for custom company search
+                }
             
-            # Save to database
-            save_job_to_db(job_data)
-            new_jobs_count += 1
-            processed_jobs.append(job_data)
+                # Buffered - the writer upserts the whole batch on exit
+                writer.add(job_data)
+                new_jobs_count += 1
+                processed_jobs.append(job_data)
             
-            print(f"  ✅ Saved: {job.get('title', 'Unknown')} - Score: {numeric_score}")
+                print(f"  ✅ Queued: {job.get('title', 'Unknown')} - Score: {score.total}")
         
         return {
             "success": True,
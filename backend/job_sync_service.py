@@ -4,6 +4,8 @@ from datetime import datetime
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from google_sheets_service import sheets_service
+from company_index import company_id
+from db_pool import get_connection
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,16 +27,18 @@ class JobSyncService:
     def get_jobs_from_database(self) -> List[Dict]:
         """Fetch all jobs from database"""
         try:
-            conn = psycopg2.connect(self.database_url)
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT * FROM jobs 
-                    ORDER BY created_at DESC
-                """)
-                jobs = cur.fetchall()
+            conn = get_connection(self.database_url)
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute("""
+                        SELECT * FROM jobs 
+                        ORDER BY created_at DESC
+                    """)
+                    jobs = cur.fetchall()
+            finally:
                 conn.close()
                 
-                return [dict(job) for job in jobs]
+            return [dict(job) for job in jobs]
                 
         except Exception as e:
             logger.error(f"Error fetching jobs from database: {str(e)}")
@@ -147,7 +151,7 @@ class JobSyncService:
             data_rows = sheet_data[1:]
             imported_count = 0
             
-            conn = psycopg2.connect(self.database_url)
+            conn = get_connection(self.database_url)
             
             for row in data_rows:
                 # Pad row if it has fewer columns
@@ -187,10 +191,10 @@ class JobSyncService:
                         
                         # Insert new job
                         cur.execute("""
-                            INSERT INTO jobs (job_hash, title, company_name, location, 
+                            INSERT INTO jobs (job_hash, title, company_name, company_canonical, location, 
                                             job_url, match_score, ai_analysis, status)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        """, (job_hash, title, company, location, job_url, 
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """, (job_hash, title, company, company_id(company), location, job_url, 
                               match_score, ai_analysis, status))
                         
                         imported_count += 1
@@ -0,0 +1,184 @@
+"""
+Fixture-backed SerpAPI and OpenAI clients for offline benchmarks
+
+install() points the repo's upstream clients at recorded responses from
+benchmarks/fixtures/ instead of the network:
+
+- serpapi_client.GoogleSearch answers Google Jobs searches with the
+  recorded page, its jobs_results replaced by the next synthetic jobs, and
+  plain Google searches with the recorded organic (or LinkedIn) results
+- llm_executor.AsyncOpenAI answers every scoring request with the recorded
+  record_job_scores completion, rewritten to cover exactly the jobs in the
+  prompt with deterministic scores
+
+Each fake waits recorded_latency_ms * latency_scale before answering
+(0 by default, so runs measure the code rather than the network). Caches
+and rate limits are switched off and DATABASE_URL is pinned to the
+benchmark database (or to nothing), so a run can never spend credits or
+touch a real database.
+"""
+
+import asyncio
+import copy
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from types import SimpleNamespace
+from synthetic import generate_jobs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+GOOGLE_JOBS_PAGE_SIZE = 10
+SEARCH_COMPANIES = 2000   # Distinct companies behind the open-ended search stream
+_JOB_NUMBER = re.compile(r"\bJOB (\d+):")
+
+
+def load_fixture(name):
+    """(response dict, recorded latency in seconds) for fixtures/<name>.json"""
+    with open(os.path.join(FIXTURES_DIR, name + ".json"), encoding="utf-8") as f:
+        fixture = json.load(f)
+    return fixture["response"], fixture.get("recorded_latency_ms", 0) / 1000
+
+
+def to_namespace(value):
+    """JSON data as attribute-access objects, like the OpenAI SDK's response models"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [to_namespace(item) for item in value]
+    return value
+
+
+class FixtureSerpApi:
+    """Serves SerpAPI responses from fixtures, with a fresh synthetic job stream for Google Jobs"""
+
+    def __init__(self, latency_scale=0.0, seed=42, dup_rate=0.15):
+        self.latency_scale = latency_scale
+        self.google_jobs, self.google_jobs_latency = load_fixture("serpapi_google_jobs")
+        self.organic, self.organic_latency = load_fixture("serpapi_google_organic")
+        self.linkedin, self.linkedin_latency = load_fixture("serpapi_google_linkedin")
+        self.jobs = generate_jobs(10 ** 9, seed=seed, dup_rate=dup_rate, companies=SEARCH_COMPANIES)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def respond(self, params):
+        with self._lock:
+            self.calls += 1
+            if params.get("engine") == "google_jobs":
+                jobs = list(itertools.islice(self.jobs, GOOGLE_JOBS_PAGE_SIZE))
+        if params.get("engine") == "google_jobs":
+            response, latency = copy.deepcopy(self.google_jobs), self.google_jobs_latency
+            response["jobs_results"] = jobs
+        elif "linkedin.com/in" in params.get("q", ""):
+            response, latency = copy.deepcopy(self.linkedin), self.linkedin_latency
+        else:
+            response, latency = copy.deepcopy(self.organic), self.organic_latency
+        response["search_parameters"] = dict(response.get("search_parameters", {}), q=params.get("q", ""))
+        if self.latency_scale:
+            time.sleep(latency * self.latency_scale)
+        return response
+
+    def search_class(self):
+        """Drop-in for serpapi.GoogleSearch"""
+        serpapi = self
+
+        class FixtureGoogleSearch:
+            def __init__(self, params):
+                self.params = params
+
+            def get_dict(self):
+                return serpapi.respond(self.params)
+
+        return FixtureGoogleSearch
+
+
+class FixtureOpenAI:
+    """Answers record_job_scores requests from the recorded completion"""
+
+    def __init__(self, latency_scale=0.0):
+        self.latency_scale = latency_scale
+        self.completion, self.latency = load_fixture("openai_score_completion")
+        arguments = self.completion["choices"][0]["message"]["tool_calls"][0]["function"]["arguments"]
+        self.rationales = [item["rationale"] for item in json.loads(arguments)["results"]]
+        self.calls = 0
+
+    def respond(self, request):
+        self.calls += 1
+        prompt = "\n".join(message.get("content") or "" for message in request.get("messages", []))
+        user = request["messages"][-1]["content"]
+        blocks = _JOB_NUMBER.split(user)[1:]   # [number, text, number, text, ...]
+        results = []
+        for number, text in zip(blocks[::2], blocks[1::2]):
+            digest = int(hashlib.md5(text.encode()).hexdigest(), 16)
+            results.append({
+                "job": int(number),
+                "score": 35 + digest % 61,
+                "rationale": self.rationales[digest % len(self.rationales)],
+            })
+
+        completion = copy.deepcopy(self.completion)
+        completion["model"] = request.get("model", completion["model"])
+        arguments = json.dumps({"results": results})
+        completion["choices"][0]["message"]["tool_calls"][0]["function"]["arguments"] = arguments
+        completion["usage"] = {
+            "prompt_tokens": len(prompt) // 4 + 1,
+            "completion_tokens": len(arguments) // 4 + 1,
+            "total_tokens": len(prompt) // 4 + len(arguments) // 4 + 2,
+        }
+        return to_namespace(completion)
+
+    def client_class(self):
+        """Drop-in for openai.AsyncOpenAI"""
+        fixture = self
+
+        class FixtureCompletions:
+            async def create(self, **request):
+                if fixture.latency_scale:
+                    await asyncio.sleep(fixture.latency * fixture.latency_scale)
+                return fixture.respond(request)
+
+        class FixtureAsyncOpenAI:
+            def __init__(self, *args, **kwargs):
+                self.chat = SimpleNamespace(completions=FixtureCompletions())
+
+            async def close(self):
+                pass
+
+        return FixtureAsyncOpenAI
+
+
+def install(latency_scale=0.0, seed=42, dup_rate=0.15, database_url=None, spool_path=None):
+    """
+    Configure the environment and patch the upstream clients; call before
+    importing job_search_agent. Returns (FixtureSerpApi, FixtureOpenAI).
+    """
+    os.environ.update({
+        "DATABASE_URL": database_url or "",
+        "SERPAPI_KEY": "benchmark",
+        "OPENAI_API_KEY": "benchmark",
+        "SERPAPI_CACHE_DISABLED": "1",
+        "SCORE_CACHE_DISABLED": "1",
+        "SERPAPI_RATE_PER_SEC": "1000000",
+        "SERPAPI_BURST": "1000000",
+    })
+    if spool_path:
+        os.environ["JOB_SPOOL_PATH"] = spool_path
+
+    import serpapi_client
+    import llm_executor
+    from rate_limit import TokenBucket
+    from source_registry import SOURCES
+
+    serpapi = FixtureSerpApi(latency_scale, seed=seed, dup_rate=dup_rate)
+    openai = FixtureOpenAI(latency_scale)
+    serpapi_client.GoogleSearch = serpapi.search_class()
+    llm_executor.AsyncOpenAI = openai.client_class()
+
+    # Per-source buckets are built when sources register; lift them once they exist
+    import job_search_agent   # Registers the sources
+    for source in SOURCES.values():
+        source.limiter = TokenBucket(1000000, 1000000)
+    return serpapi, openai
@@ -0,0 +1,139 @@
+"""
+Disposable Postgres for benchmarks
+
+LocalPostgres initdb's a throwaway cluster in a temp directory, starts it
+on a Unix socket inside that directory (durability switched off - nothing
+here needs to survive a crash), loads schema.sql and deletes everything on
+exit. It needs the Postgres server binaries (initdb, pg_ctl) on PATH or in
+`pg_config --bindir`, and cannot run as root.
+
+benchmark_database() uses BENCH_DATABASE_URL instead when it is set. That
+database is truncated before every DB benchmark, so only ever point it at
+a scratch database.
+"""
+
+import glob
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+import psycopg2
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(REPO_ROOT, "schema.sql")
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+PORT = 5432   # Only names the socket file inside our own directory, so never conflicts
+
+
+def postgres_bindir():
+    """Directory holding initdb/pg_ctl, or None if the server isn't installed"""
+    initdb = shutil.which("initdb")
+    if initdb:
+        return os.path.dirname(initdb)
+    try:
+        bindir = subprocess.run(["pg_config", "--bindir"], capture_output=True, text=True, check=True).stdout.strip()
+        if os.path.exists(os.path.join(bindir, "initdb")):
+            return bindir
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    candidates = sorted(glob.glob("/usr/lib/postgresql/*/bin/initdb"))   # Debian/Ubuntu keep them off PATH
+    return os.path.dirname(candidates[-1]) if candidates else None
+
+
+def apply_schema(dsn):
+    """Load schema.sql unless the jobs table already exists"""
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('public.jobs')")
+            if cur.fetchone()[0] is None:
+                with open(SCHEMA_PATH) as f:
+                    cur.execute(f.read())
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def reset_database(dsn):
+    """Empty every table a benchmark writes to"""
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE jobs, contacts, job_contacts, job_actions CASCADE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class LocalPostgres:
+    """A throwaway Postgres cluster; use as a context manager, dsn is set on enter"""
+
+    def __init__(self, bindir=None):
+        self.bindir = bindir or postgres_bindir()
+        self.directory = None
+        self.dsn = None
+
+    def _run(self, *args):
+        subprocess.run([os.path.join(self.bindir, args[0]), *args[1:]],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    def start(self):
+        if not self.bindir:
+            raise RuntimeError("Postgres server binaries (initdb, pg_ctl) not found - install Postgres or set BENCH_DATABASE_URL")
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            raise RuntimeError("initdb refuses to run as root - run as another user or set BENCH_DATABASE_URL")
+
+        self.directory = tempfile.mkdtemp(prefix="bench-pg-")
+        data = os.path.join(self.directory, "data")
+        self._run("initdb", "-D", data, "-U", "bench", "-A", "trust", "-E", "UTF8", "--no-sync")
+        options = (f"-p {PORT} -k {self.directory} -c listen_addresses='' "
+                   "-c fsync=off -c synchronous_commit=off -c full_page_writes=off")
+        self._run("pg_ctl", "-D", data, "-l", os.path.join(self.directory, "postgres.log"), "-o", options, "-w", "start")
+        self.dsn = f"postgresql://bench@/postgres?host={self.directory}&port={PORT}"
+        apply_schema(self.dsn)
+        return self
+
+    def stop(self):
+        if self.directory is None:
+            return
+        try:
+            self._run("pg_ctl", "-D", os.path.join(self.directory, "data"), "-m", "immediate", "-w", "stop")
+        except (OSError, subprocess.CalledProcessError):
+            pass   # Never started; nothing to stop
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory = None
+
+    def __enter__(self):
+        try:
+            return self.start()
+        except Exception:
+            self.stop()
+            raise
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextmanager
+def benchmark_database():
+    """
+    DSN of a database to benchmark against, or None when none can be had.
+
+    BENCH_DATABASE_URL wins; otherwise a LocalPostgres lives for the block.
+    """
+    if BENCH_DATABASE_URL:
+        apply_schema(BENCH_DATABASE_URL)
+        yield BENCH_DATABASE_URL
+        return
+    try:
+        server = LocalPostgres().__enter__()
+    except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", None)
+        print(f"⚠️ No benchmark database: {stderr.decode().strip() if stderr else e}")
+        yield None
+        return
+    try:
+        yield server.dsn
+    finally:
+        server.stop()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Re-record the benchmark fixtures from live SerpAPI and OpenAI calls
+Costs 3 SerpAPI credits and one OpenAI request. Uses the keys in .env and
+the agent's own request builders, so the fixtures keep the exact shape the
+pipeline parses. Run after changing a query, the parser or the scoring
+prompt, then commit the updated benchmarks/fixtures/*.json.
+"""
+
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from serpapi import GoogleSearch
+from openai import OpenAI
+from job_search_agent import (CORE_QUERIES, SERPAPI_KEY, google_jobs_params, get_source, user_profile,
+                              build_profile_prompt, build_job_details, calculate_job_bonuses, scoring_request,
+                              normalize_google_job)
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+
+def record(name, call):
+    """Time one live call and store its response as fixtures/<name>.json"""
+    started = time.monotonic()
+    response = call()
+    latency_ms = round((time.monotonic() - started) * 1000)
+    with open(os.path.join(FIXTURES_DIR, name + ".json"), "w", encoding="utf-8") as f:
+        json.dump({"recorded_latency_ms": latency_ms, "response": response}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"💾 {name}: {latency_ms} ms")
+    return response
+
+
+if __name__ == "__main__":
+    if not SERPAPI_KEY or not os.getenv("OPENAI_API_KEY"):
+        print("❌ SERPAPI_KEY and OPENAI_API_KEY are needed to record fixtures")
+        sys.exit(1)
+
+    jobs_page = record("serpapi_google_jobs", lambda: GoogleSearch(google_jobs_params(CORE_QUERIES[0])).get_dict())
+    record("serpapi_google_organic", lambda: GoogleSearch(get_source("builtin").build_params("seattle")).get_dict())
+    record("serpapi_google_linkedin", lambda: GoogleSearch({
+        "engine": "google",
+        "q": "site:linkedin.com/in/ senior product manager Remitly",
+        "api_key": SERPAPI_KEY
+    }).get_dict())
+
+    jobs = [normalize_google_job(job, "google_jobs") for job in jobs_page.get("jobs_results", [])[:3]]
+    if not jobs:
+        print("❌ The Google Jobs search returned no jobs to score")
+        sys.exit(1)
+    blocks = [build_job_details(job, *calculate_job_bonuses(job, user_profile)) for job in jobs]
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    record("openai_score_completion", lambda: client.chat.completions.create(
+        **scoring_request(build_profile_prompt(user_profile), blocks)
+    ).model_dump())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the ingestion pipeline
+Runs search, dedupe, pre-filter, scoring, persistence and the whole daily
+pipeline on synthetic jobs, with SerpAPI and OpenAI answered from recorded
+fixtures and the database stages writing to a disposable local Postgres.
+No API credits are used and no real database is touched.
+
+Every (stage, size) runs in its own process so peak memory is measured per
+stage. Reports jobs/sec, p50/p95 latency and peak memory, and can save the
+results as a JSON baseline or compare against one:
+
+    python benchmarks/run_benchmarks.py --sizes 10k,100k
+    python benchmarks/run_benchmarks.py --save       # write benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare    # exit 1 on a regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import nullcontext, redirect_stdout
+from datetime import datetime
+from types import SimpleNamespace
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+STAGE_ORDER = ["search", "dedupe", "prefilter", "score", "persist", "pipeline"]
+THROUGHPUT_TOLERANCE = 0.15   # Slower than the baseline by more than this is a regression
+MEMORY_TOLERANCE = 0.20       # Same for peak memory growth...
+MEMORY_NOISE_MB = 5.0         # ...once it is bigger than allocator noise
+
+
+def parse_size(text):
+    """'10000', '10k' or '1m' -> int"""
+    text = text.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_stage(stage, size, args, dsn):
+    """Child process: run one benchmark and print its summary as the last line of stdout"""
+    sys.path.insert(0, BENCH_DIR)
+    import fakes
+    from stages import STAGES
+
+    benchmark, needs_database = STAGES[stage]
+    with tempfile.TemporaryDirectory(prefix="bench-spool-") as spool_dir:
+        spool_path = os.path.join(spool_dir, "jobs_spool.jsonl")
+        serpapi, openai = fakes.install(args.latency_scale, seed=args.seed, dup_rate=args.dup_rate,
+                                        database_url=dsn if needs_database else None, spool_path=spool_path)
+        if needs_database:
+            from local_postgres import reset_database
+            reset_database(dsn)
+
+        context = SimpleNamespace(seed=args.seed, dup_rate=args.dup_rate, dsn=dsn, spool_path=spool_path,
+                                  serpapi=serpapi, openai=openai)
+        memory_before = peak_rss_mb()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            result = benchmark(size, context)
+        peak = peak_rss_mb()
+
+    latencies = result["latencies"]
+    summary = {
+        "jobs": result["jobs"],
+        "seconds": round(result["seconds"], 3),
+        "jobs_per_sec": round(result["jobs"] / result["seconds"], 1) if result["seconds"] else None,
+        "latency_unit": result["latency_unit"],
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+        "peak_memory_mb": round(peak, 1),
+        "memory_growth_mb": round(peak - memory_before, 1),
+        **result.get("extra", {}),
+    }
+    print(json.dumps(summary))
+
+
+def spawn_stage(stage, size, args, dsn):
+    """Run one benchmark in a fresh interpreter; returns its summary or None if it failed"""
+    command = [sys.executable, os.path.abspath(__file__), "--child", stage, str(size),
+               "--seed", str(args.seed), "--dup-rate", str(args.dup_rate),
+               "--latency-scale", str(args.latency_scale)]
+    env = dict(os.environ, BENCH_CHILD_DSN=dsn or "")
+    completed = subprocess.run(command, capture_output=True, text=True, env=env, cwd=REPO_ROOT)
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        print(f"  ❌ {stage} @ {size} failed:\n{completed.stderr.strip()[-2000:]}")
+        return None
+    return json.loads(lines[-1])
+
+
+def print_result(stage, size, result):
+    p50 = result["latency_p50_ms"]
+    p95 = result["latency_p95_ms"]
+    print(f"  ✓ {stage:>9} @ {size:>8}: {result['jobs_per_sec'] or 0:>10.1f} jobs/s | "
+          f"p50 {p50 if p50 is not None else '-'} ms, p95 {p95 if p95 is not None else '-'} ms "
+          f"per {result['latency_unit']} | peak {result['peak_memory_mb']} MB "
+          f"(+{result['memory_growth_mb']} MB)")
+    for name, stats in result.get("stages", {}).items():
+        print(f"      {name:>9}: {stats['received']} in, {stats['busy_seconds']:.2f}s busy, "
+              f"{stats['jobs_per_sec'] or '-'} jobs/s")
+
+
+def compare(baseline, current):
+    """Print current vs baseline for every shared (stage, size); returns the regressions"""
+    regressions = []
+    print(f"\n📊 Compared with baseline from {baseline['meta'].get('created_at')} "
+          f"(commit {baseline['meta'].get('git_commit')})")
+    for stage, sizes in current["results"].items():
+        for size, result in sizes.items():
+            base = baseline["results"].get(stage, {}).get(size)
+            if not base:
+                print(f"  ➕ {stage} @ {size}: not in baseline")
+                continue
+            notes = []
+            if base.get("jobs_per_sec") and result.get("jobs_per_sec"):
+                change = result["jobs_per_sec"] / base["jobs_per_sec"] - 1
+                notes.append(f"throughput {change:+.0%}")
+                if change < -THROUGHPUT_TOLERANCE:
+                    regressions.append(f"{stage} @ {size}: {base['jobs_per_sec']} -> {result['jobs_per_sec']} jobs/s")
+            growth, base_growth = result["memory_growth_mb"], base["memory_growth_mb"]
+            notes.append(f"memory +{base_growth} -> +{growth} MB")
+            if growth - base_growth > MEMORY_NOISE_MB and growth > base_growth * (1 + MEMORY_TOLERANCE):
+                regressions.append(f"{stage} @ {size}: memory growth {base_growth} -> {growth} MB")
+            print(f"  {stage:>9} @ {size:>8}: {', '.join(notes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10k", help="comma-separated job counts, e.g. 10k,100k,1m")
+    parser.add_argument("--stages", default=",".join(STAGE_ORDER), help="comma-separated stages to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dup-rate", type=float, default=0.15, help="share of synthetic jobs that repeat a recent one")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="replay this fraction of the fixtures' recorded upstream latency (0 = none)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare with the baseline, exit 1 on a regression")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--child", nargs=2, metavar=("STAGE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_stage(args.child[0], int(args.child[1]), args, os.getenv("BENCH_CHILD_DSN") or None)
+        return
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    stages = [stage.strip() for stage in args.stages.split(",")]
+    unknown = set(stages) - set(STAGE_ORDER)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    sys.path.insert(0, BENCH_DIR)
+    from local_postgres import benchmark_database
+    from stages import STAGES
+
+    current = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "dup_rate": args.dup_rate,
+            "latency_scale": args.latency_scale,
+        },
+        "results": {},
+    }
+
+    started = time.time()
+    needs_database = any(STAGES[stage][1] for stage in stages)
+    with benchmark_database() if needs_database else nullcontext() as dsn:
+        current["meta"]["database"] = None if dsn is None else ("external" if os.getenv("BENCH_DATABASE_URL") else "local")
+        for stage in stages:
+            if STAGES[stage][1] and dsn is None:
+                print(f"⏭️ Skipping {stage}: no benchmark database")
+                continue
+            for size in sizes:
+                print(f"⏱️ {stage} @ {size}...")
+                result = spawn_stage(stage, size, args, dsn)
+                if result is not None:
+                    current["results"].setdefault(stage, {})[str(size)] = result
+                    print_result(stage, size, result)
+    print(f"\n🏁 Benchmarks finished in {time.time() - started:.1f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    regressions = []
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline} - create one with --save")
+            sys.exit(1)
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), current)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    if regressions:
+        print("\n❌ Performance regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Benchmarked stages of the ingestion pipeline
+
+Each stage function takes (n, context) and runs n synthetic jobs through
+one part of the pipeline, returning the jobs processed, the seconds spent
+in the code under test and one latency sample per call (a search query, a
+batch, or - for the end-to-end pipeline - one job from source to persist).
+Batch sizes match what run_daily_pipeline() hands each stage.
+
+They expect fakes.install() to have run first; the database stages also
+need context.dsn.
+"""
+
+import itertools
+import time
+from array import array
+from synthetic import generate_jobs
+
+
+def batches(items, size):
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def timed_batches(items, size, fn):
+    """Call fn on successive batches of items; returns (items processed, per-batch seconds)"""
+    processed, latencies = 0, array('d')
+    for batch in batches(items, size):
+        started = time.perf_counter()
+        fn(batch)
+        latencies.append(time.perf_counter() - started)
+        processed += len(batch)
+    return processed, latencies
+
+
+def normalized_jobs(n, context):
+    """Synthetic jobs as the Google Jobs parser hands them on"""
+    import job_search_agent as agent
+    return (agent.normalize_google_job(job, "google_jobs")
+            for job in generate_jobs(n, seed=context.seed, dup_rate=context.dup_rate))
+
+
+def bench_search(n, context):
+    """search_all_sources() over fixture responses, repeated until n jobs came back"""
+    import job_search_agent as agent
+    from credit_planner import CreditPlanner
+
+    latencies = array('d')
+
+    class TimedExecutor(agent.FanOutExecutor):
+        def run(self, tasks):
+            for result in super().run(tasks):
+                latencies.append(result.elapsed)
+                yield result
+
+    agent.FanOutExecutor = TimedExecutor
+    processed, runs = 0, 0
+    started = time.perf_counter()
+    while processed < n:
+        # Offline planner with no credit cap: every registered query runs
+        processed += len(agent.search_all_sources(planner=CreditPlanner(lambda: None, budget=10 ** 9)))
+        runs += 1
+    return {
+        "jobs": processed,
+        "seconds": time.perf_counter() - started,
+        "latencies": latencies,
+        "latency_unit": "search query",
+        "extra": {"runs": runs, "serpapi_calls": context.serpapi.calls},
+    }
+
+
+def bench_dedupe(n, context):
+    """Exact and near-duplicate removal (IncrementalDeduper over a NearDuplicateIndex)"""
+    import job_search_agent as agent
+    from dedup import IncrementalDeduper, NearDuplicateIndex
+
+    deduper = IncrementalDeduper(agent.create_job_hash, NearDuplicateIndex())
+    processed, latencies = timed_batches(normalized_jobs(n, context), 50,
+                                         lambda batch: [deduper.add(job) for job in batch])
+    return {
+        "jobs": processed,
+        "seconds": sum(latencies),
+        "latencies": latencies,
+        "latency_unit": "batch of 50",
+        "extra": {"unique": len(deduper), "duplicates": processed - len(deduper)},
+    }
+
+
+def bench_prefilter(n, context):
+    """LocalPrefilter.split() with the agent's profile and bonuses"""
+    import job_search_agent as agent
+    from prefilter import LocalPrefilter
+
+    prefilter = LocalPrefilter(agent.user_profile, lambda job: agent.calculate_job_bonuses(job, agent.user_profile))
+    processed, latencies = timed_batches(normalized_jobs(n, context), 50, prefilter.split)
+    return {
+        "jobs": processed,
+        "seconds": sum(latencies),
+        "latencies": latencies,
+        "latency_unit": "batch of 50",
+        "extra": {"rejected": prefilter.rejected},
+    }
+
+
+def bench_score(n, context):
+    """match_jobs_to_user() against the recorded OpenAI completion"""
+    import job_search_agent as agent
+    from run_metrics import metrics
+
+    batch_size = agent.SCORING_MAX_BATCH_SIZE * agent.SCORING_CONCURRENCY
+    deadline = time.monotonic() + 24 * 3600
+    unscored = 0
+
+    def score(batch):
+        nonlocal unscored
+        unscored += sum(1 for match in agent.match_jobs_to_user(batch, agent.user_profile, deadline=deadline)
+                        if match is None)
+
+    processed, latencies = timed_batches(normalized_jobs(n, context), batch_size, score)
+    usage = metrics.snapshot().get(f"openai:{agent.SCORING_MODEL}", {})
+    return {
+        "jobs": processed,
+        "seconds": sum(latencies),
+        "latencies": latencies,
+        "latency_unit": f"batch of {batch_size}",
+        "extra": {
+            "openai_calls": context.openai.calls,
+            "prompt_tokens": int(usage.get("prompt_tokens", 0)),
+            "completion_tokens": int(usage.get("completion_tokens", 0)),
+            "unscored": unscored,
+        },
+    }
+
+
+def bench_persist(n, context):
+    """JobBatchWriter upserts into the benchmark database (what save_job_to_db() wraps)"""
+    import job_search_agent as agent
+    from db_pool import get_connection
+    from job_spool import JobSpool
+    from job_writer import JobBatchWriter, JOB_WRITER_MAX_ROWS
+    from match_score import MatchScore
+
+    def record(job):
+        match = MatchScore(70, *agent.calculate_job_bonuses(job, agent.user_profile), rationale="Benchmark score.")
+        return {
+            'job_hash': agent.create_job_hash(job),
+            'title': job['title'],
+            'company_name': job['company_name'],
+            'location': job['location'],
+            'description': job['description'],
+            'job_url': agent.job_url_for(job),
+            **match.columns(),
+            'relevance_score': 50.0,
+            'contacts': [],
+        }
+
+    spool = JobSpool(context.spool_path)
+    writer = JobBatchWriter(lambda: get_connection(context.dsn), spool, max_seconds=24 * 3600)
+    records = (record(job) for job in normalized_jobs(n, context))
+    processed, latencies = timed_batches(records, JOB_WRITER_MAX_ROWS, lambda batch: [writer.add(row) for row in batch])
+    started = time.perf_counter()
+    writer.close()
+    latencies.append(time.perf_counter() - started)
+
+    conn = get_connection(context.dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM jobs")
+            stored = cur.fetchone()[0]
+    finally:
+        conn.close()
+    return {
+        "jobs": processed,
+        "seconds": sum(latencies),
+        "latencies": latencies,
+        "latency_unit": f"batch of {JOB_WRITER_MAX_ROWS}",
+        "extra": {"stored": stored, "flushes": writer.flushes, "spooled": spool.spooled},
+    }
+
+
+def bench_pipeline(n, context):
+    """run_daily_pipeline() end to end, fed n synthetic jobs instead of live searches"""
+    import job_search_agent as agent
+
+    latencies = array('d')
+
+    def synthetic_sources(planner=None, fingerprints=None, run=None):
+        for job in normalized_jobs(n, context):
+            job['_bench_started'] = time.perf_counter()
+            yield job
+
+    # job_url_for() runs once per job in the persist stage, just before it is buffered
+    job_url_for = agent.job_url_for
+
+    def timed_job_url_for(job):
+        started = job.pop('_bench_started', None)
+        if started is not None:
+            latencies.append(time.perf_counter() - started)
+        return job_url_for(job)
+
+    agent.iter_all_sources = synthetic_sources
+    agent.job_url_for = timed_job_url_for
+    agent.known_jobs.warm()
+
+    started = time.perf_counter()
+    run = agent.run_daily_pipeline(None, time.monotonic() + 24 * 3600, job_budget=n)
+    seconds = time.perf_counter() - started
+    return {
+        "jobs": n,
+        "seconds": seconds,
+        "latencies": latencies,
+        "latency_unit": "job, source to persist",
+        "extra": {
+            "persisted": len(run["results"]),
+            "stages": {
+                stats["stage"]: {
+                    "received": stats["received"],
+                    "busy_seconds": stats["busy_seconds"],
+                    "jobs_per_sec": round(stats["received"] / stats["busy_seconds"], 1) if stats["busy_seconds"] else None,
+                }
+                for stats in run["stages"]
+            },
+        },
+    }
+
+
+# name -> (benchmark, needs a database)
+STAGES = {
+    "search": (bench_search, False),
+    "dedupe": (bench_dedupe, False),
+    "prefilter": (bench_prefilter, False),
+    "score": (bench_score, False),
+    "persist": (bench_persist, True),
+    "pipeline": (bench_pipeline, True),
+}
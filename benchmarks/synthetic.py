@@ -0,0 +1,150 @@
+"""
+Synthetic job postings for benchmarks
+
+generate_jobs() lazily yields Google Jobs results (the shape
+normalize_google_job() and every later stage consume), deterministic for a
+given seed, so 10k-1M job runs never hold the whole data set in memory
+unless the code under test does. A share of the stream repeats earlier
+postings: exact copies (same link, same hash) and near duplicates the way
+other sources reformat them ("Sr. PM" at "Stripe, Inc."), so the dedupe
+stages do realistic work.
+"""
+
+import random
+from collections import deque
+
+SENIORITIES = ["", "Senior", "Senior", "Principal", "Staff", "Lead", "Group", "Associate"]
+ROLES = [
+    "Product Manager", "Product Manager", "Product Manager", "Technical Product Manager",
+    "Director of Product", "Head of Product", "Chief of Staff", "Head of Operations",
+    "General Manager", "Head of Growth", "Software Engineer", "Data Scientist",
+    "Product Designer", "Account Executive", "Program Manager", "Product Marketing Manager",
+]
+TEAMS = [
+    "Payments", "Growth", "Platform", "Core Experience", "AI", "Developer Tools", "Onboarding",
+    "Marketplace", "Risk", "Search", "Mobile", "Data", "Billing", "Integrations", "Consumer",
+    "Enterprise", "Trust & Safety", "Monetization", "Identity", "Notifications",
+]
+LOCATIONS = [
+    "Remote", "Anywhere", "Seattle, WA", "Bellevue, WA", "Kirkland, WA", "Redmond, WA",
+    "Austin, TX", "Denver, CO", "Boston, MA", "Los Angeles, CA", "Portland, OR",
+    "Vancouver, BC, Canada", "San Francisco, CA", "New York, NY", "Palo Alto, CA",
+    "Chicago, IL", "Atlanta, GA", "Miami, FL", "Toronto, ON, Canada", "London, UK",
+]
+COMPANY_WORDS = [
+    "North", "Blue", "Bright", "Clear", "Iron", "Silver", "Pine", "Harbor", "Summit", "River",
+    "Cedar", "Signal", "Atlas", "Nimbus", "Quartz", "Maple", "Orbit", "Vector", "Lumen", "Beacon",
+    "Canyon", "Falcon", "Juniper", "Meadow", "Granite", "Willow", "Copper", "Aurora", "Delta", "Echo",
+]
+COMPANY_KINDS = ["Labs", "AI", "Health", "Pay", "Software", "Systems", "Analytics", "Robotics", "Bio", "Cloud"]
+TARGET_COMPANIES = ["Stripe", "Figma", "Notion", "Canva", "Strava", "Calm", "Headspace", "Oura",
+                    "Remitly", "Betterment", "Airbnb", "Amazon", "Microsoft", "Zillow", "Duolingo"]
+VIAS = ["LinkedIn", "Indeed", "Greenhouse", "Lever", "Built In", "Wellfound", "ZipRecruiter", "Glassdoor"]
+SENTENCES = [
+    "We are looking for a {role} to own the roadmap for our {team} team.",
+    "You will partner closely with engineering, design and data science to ship customer-facing features.",
+    "The ideal candidate has shipped products used by millions and is comfortable with ambiguity.",
+    "You will define success metrics, run experiments and turn insights into product decisions.",
+    "This role reports to the VP of Product and works across go-to-market and operations.",
+    "Experience with B2B SaaS, marketplaces or fintech is a strong plus.",
+    "We are a Series B startup backed by top-tier investors, growing revenue 3x year over year.",
+    "Our team is distributed across North America with hubs in Seattle and Austin.",
+    "You have 6+ years of product management experience, including leading a team of PMs.",
+    "Strong written communication and a bias for action are essential.",
+    "You will work with healthcare data partners to build compliant, privacy-preserving workflows.",
+    "Compensation includes competitive salary, equity and comprehensive benefits.",
+    "An MBA or equivalent experience is preferred but not required.",
+    "You will talk to customers every week and bring their voice into planning.",
+    "Familiarity with generative AI, LLM tooling or developer platforms is a plus.",
+    "We offer flexible remote work, a home office stipend and annual team offsites.",
+]
+HIGHLIGHTS = [
+    ("Qualifications", ["6+ years of product management experience", "Track record of shipping 0-to-1 products",
+                        "Excellent cross-functional communication"]),
+    ("Responsibilities", ["Own the product roadmap", "Define and track success metrics",
+                          "Partner with engineering and design"]),
+    ("Benefits", ["$170,000-$230,000 a year", "Equity", "Health, dental and vision insurance"]),
+]
+TITLE_VARIANTS = [
+    ("Senior ", "Sr. "),
+    ("Product Manager", "PM"),
+    ("Product Manager", "Product Mgr"),
+    ("Director of Product", "Product Director"),
+]
+COMPANY_SUFFIXES = [", Inc.", " Inc", " Technologies", " Co."]
+
+
+def company_pool(size, rng):
+    """Distinct company names: the target list plus generated ones"""
+    names = list(TARGET_COMPANIES)
+    for index in range(max(0, size - len(names))):
+        first, second = rng.choice(COMPANY_WORDS), rng.choice(COMPANY_WORDS).lower()
+        names.append(f"{first}{second} {COMPANY_KINDS[index % len(COMPANY_KINDS)]} {index // 100}")
+    return names
+
+
+def near_duplicate(job, rng):
+    """The same posting as another source would list it"""
+    copy = dict(job)
+    title = job['title']
+    for original, variant in rng.sample(TITLE_VARIANTS, len(TITLE_VARIANTS)):
+        if original in title:
+            title = title.replace(original, variant, 1)
+            break
+    copy['title'] = title
+    if rng.random() < 0.5:
+        copy['company_name'] = job['company_name'] + rng.choice(COMPANY_SUFFIXES)
+    copy['via'] = rng.choice(VIAS)
+    copy['job_id'] = job['job_id'] + "-dup"
+    link = f"https://jobs.example.com/{copy['via'].lower().replace(' ', '')}/{copy['job_id']}"
+    copy['apply_options'] = [{"title": copy['via'], "link": link}]
+    copy['share_link'] = link
+    return copy
+
+
+def generate_jobs(n, seed=42, dup_rate=0.15, companies=None):
+    """
+    Yield n Google Jobs results.
+
+    Args:
+        n: jobs to yield
+        seed: same seed, same stream
+        dup_rate: share of jobs that repeat a recent posting (half exact, half near)
+        companies: distinct companies to draw from (default ~1 per 20 jobs)
+    """
+    rng = random.Random(seed)
+    pool = company_pool(companies or max(200, n // 20), rng)
+    recent = deque(maxlen=1000)   # Duplicates repeat recent postings, like overlapping sources do
+
+    for index in range(n):
+        if recent and rng.random() < dup_rate:
+            original = rng.choice(recent)
+            yield dict(original) if rng.random() < 0.5 else near_duplicate(original, rng)
+            continue
+
+        role, team = rng.choice(ROLES), rng.choice(TEAMS)
+        title = " ".join(part for part in (rng.choice(SENIORITIES), role) if part)
+        if rng.random() < 0.6:
+            title += f", {team}"
+        company = rng.choice(pool)
+        via = rng.choice(VIAS)
+        job_id = f"bench-{seed}-{index}"
+        link = f"https://jobs.example.com/{via.lower().replace(' ', '')}/{job_id}"
+        description = " ".join(
+            sentence.format(role=role, team=team) for sentence in rng.sample(SENTENCES, rng.randint(6, 12))
+        )
+        job = {
+            "title": title,
+            "company_name": company,
+            "location": rng.choice(LOCATIONS),
+            "via": via,
+            "share_link": link,
+            "extensions": [f"{rng.randint(1, 29)} days ago", "Full-time", "Health insurance"],
+            "detected_extensions": {"posted_at": f"{rng.randint(1, 29)} days ago", "schedule_type": "Full-time"},
+            "description": description,
+            "job_highlights": [{"title": heading, "items": items} for heading, items in HIGHLIGHTS],
+            "apply_options": [{"title": via, "link": link}],
+            "job_id": job_id,
+        }
+        recent.append(job)
+        yield job
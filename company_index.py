@@ -0,0 +1,148 @@
+"""
+Company name canonicalization
+
+canonical_company() turns any spelling of a company name into a stable ID:
+lowercase tokens, legal suffixes stripped ("Stripe, Inc." -> "stripe") and
+known renames/aliases resolved ("TripActions" -> "navan"). CompanyIndex adds
+an O(1) lookup table plus a token trie for prefix matches, so
+"Amazon.com Services LLC" resolves to the indexed "amazon".
+
+known_companies is built from TARGET_COMPANIES when this module is
+imported, so company_id() gives the same answer in every process and
+import order - the agent, the API and the sheet sync all store the same
+jobs.company_canonical for a company.
+"""
+
+import re
+from functools import lru_cache
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "gmbh", "plc", "pbc", "lp", "llp", "sa", "ag", "holdings", "group", "technologies",
+}
+
+# Renames and common alternate names -> canonical ID
+ALIASES = {
+    "tripactions": "navan",
+    "scott s cheap flights": "going",
+    "facebook": "meta",
+    "meta platforms": "meta",
+    "alphabet": "google",
+    "aws": "amazon",
+    "amazon web services": "amazon",
+    "amazon com": "amazon",
+    "linkedin corporation": "linkedin",
+    "ro health": "ro",
+    "oura health": "oura",
+    "calm com": "calm",
+}
+
+# The user's target companies by category (user_profile['target_companies'])
+TARGET_COMPANIES = {
+    # Health & Wellness
+    "health_wellness": ["Calm", "Headspace", "BetterHelp", "Grow Therapy", "Ro", "Zocdoc", "Oura", "Levels", "Accolade", "Superpower", "Visible Health", "Equip", "Brightside", "Turquoise Health", "Xealth"],
+    
+    # Fintech & Finance  
+    "fintech": ["Remitly", "Betterment", "Stripe", "Monarch Money", "Farther", "Possible Finance"],
+    
+    # Travel & Lifestyle
+    "travel_lifestyle": ["Navan", "TripActions", "Going", "Scott's Cheap Flights", "Hopper", "The Dyrt", "Outdoorsy", "Fora", "Airbnb", "Expedia"],
+    
+    # Consumer & E-commerce
+    "consumer_ecommerce": ["Strava", "VSCO", "Cuyana", "Italic", "Preply", "Duolingo", "Cambly", "REI"],
+    
+    # Productivity & Design
+    "productivity_design": ["Descript", "Canva", "Figma", "Notion", "Bending Spoons", "Evernote", "Aha!", "Scribe", "LinkedIn"],
+    
+    # Real Estate & Housing
+    "real_estate": ["Zillow", "Knock", "Pacaso"],
+    
+    # Climate & Sustainability  
+    "climate": ["Nori", "Future"],
+    
+    # Enterprise & B2B
+    "enterprise": ["Amazon", "Microsoft", "Google", "Katalyst", "Symbl.ai", "Center"],
+    
+    # Other Consumer Tech
+    "other_consumer": ["Otto", "Tolan", "Portola", "Sketchy", "Ravenna", "Jargon"]
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+@lru_cache(maxsize=8192)
+def canonical_company(name):
+    """Stable canonical ID for a company name ("" when there is nothing to go on)"""
+    tokens = _TOKEN_RE.findall((name or "").lower())
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    key = " ".join(tokens)
+    return ALIASES.get(key, key)
+
+
+class CompanyIndex:
+    """Known companies keyed by canonical ID, with token-prefix lookup"""
+
+    def __init__(self, names=()):
+        self.display_names = {}   # canonical ID -> first display name seen
+        self._trie = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        canonical = canonical_company(name)
+        if not canonical:
+            return None
+        self.display_names.setdefault(canonical, name)
+
+        node = self._trie
+        for token in canonical.split():
+            node = node.setdefault(token, {})
+        node[None] = canonical   # Terminal marker
+        return canonical
+
+    def lookup(self, name):
+        """
+        Canonical ID of the indexed company this name refers to, or None.
+
+        Exact canonical matches are a dict hit; otherwise the longest indexed
+        company whose tokens prefix the name wins.
+        """
+        canonical = canonical_company(name)
+        if not canonical:
+            return None
+        if canonical in self.display_names:
+            return canonical
+
+        node, best = self._trie, None
+        for token in canonical.split():
+            node = node.get(token)
+            if node is None:
+                break
+            best = node.get(None, best)
+        return best
+
+    def __contains__(self, name):
+        return self.lookup(name) is not None
+
+    def __len__(self):
+        return len(self.display_names)
+
+
+# Companies the app cares about, resolved by prefix ("Amazon.com Services LLC" -> "amazon")
+known_companies = CompanyIndex(company for companies in TARGET_COMPANIES.values() for company in companies)
+
+
+def company_id(name):
+    """ID stored in jobs.company_canonical: the known company it resolves to, else its canonical form"""
+    return known_companies.lookup(name) or canonical_company(name)
+
+
+def same_company(a, b):
+    """True when two names refer to the same company (either may be a prefix form)"""
+    canonical_a, canonical_b = canonical_company(a), canonical_company(b)
+    if not canonical_a or not canonical_b:
+        return False
+    if canonical_a == canonical_b:
+        return True
+    return CompanyIndex([a]).lookup(b) is not None or CompanyIndex([b]).lookup(a) is not None
@@ -0,0 +1,208 @@
+"""
+Per-company LinkedIn contact discovery
+
+Contacts depend on the company, not the posting, so lookups are keyed by
+canonical company ID: five Stripe jobs in one run cost one search per role
+keyword, not one per job. Results are cached in the contacts table with a
+TTL (source = 'linkedin_search') and linked to jobs through job_contacts.
+A company whose searches found nobody gets a marker row instead
+(source = 'linkedin_search_empty'), so it is not searched again until the
+TTL runs out either.
+Companies not in the cache are searched concurrently on the fan-out
+executor. lookup() is safe to call from several pipeline workers at once;
+a company another worker is already resolving is waited for, not searched
+twice.
+"""
+
+import os
+import threading
+from company_index import company_id
+from search_executor import SearchTask, FanOutExecutor
+
+CONTACT_TTL_DAYS = int(os.getenv("CONTACT_TTL_DAYS", "14"))
+CONTACT_SOURCE = "linkedin_search"
+NO_CONTACTS_SOURCE = "linkedin_search_empty"   # Marker row: searched, nobody found
+CONTACT_CONCURRENCY = 4
+
+
+class ContactFinder:
+    """Finds team members per company, via the contacts table when fresh"""
+
+    def __init__(self, connect, search_fn, role_keywords, ttl_days=None):
+        """
+        Args:
+            connect: callable returning a DB connection (or None when offline)
+            search_fn: callable(company, [role keyword]) -> list of people dicts
+            role_keywords: roles to search for at each company
+            ttl_days: how long stored contacts are reused before searching again
+        """
+        self.connect = connect
+        self.search_fn = search_fn
+        self.role_keywords = list(role_keywords)
+        self.ttl_days = CONTACT_TTL_DAYS if ttl_days is None else ttl_days
+        self.found = {}        # canonical company -> people, for this run
+        self.cache_hits = 0
+        self.searches = 0
+        self._lock = threading.Lock()
+        self._pending = {}     # canonical company -> Event set once its lookup finishes
+
+    def _load_cached(self, canonicals):
+        if not canonicals:
+            return {}
+        conn = self.connect()
+        if not conn:
+            return {}
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT company_canonical, name, linkedin_url, snippet, source
+                    FROM contacts
+                    WHERE source IN (%s, %s)
+                      AND company_canonical = ANY(%s)
+                      AND discovered_at > NOW() - make_interval(days => %s)
+                    ORDER BY discovered_at
+                """, (CONTACT_SOURCE, NO_CONTACTS_SOURCE, list(canonicals), self.ttl_days))
+                cached = {}
+                for canonical, name, linkedin, snippet, source in cur.fetchall():
+                    people = cached.setdefault(canonical, [])
+                    if source == CONTACT_SOURCE:
+                        people.append({"name": name, "linkedin": linkedin, "snippet": snippet})
+                return cached
+        except Exception as e:
+            print(f"⚠️ Could not load cached contacts: {e}")
+            conn.rollback()
+            return {}
+        finally:
+            conn.close()
+
+    def _store(self, found, names):
+        rows = [
+            (person["name"] or "", names[canonical], canonical, person["linkedin"], person["snippet"], CONTACT_SOURCE)
+            for canonical, people in found.items()
+            for person in people
+            if person.get("linkedin")
+        ]
+        # One empty-URL marker per company that came back with nobody
+        rows += [("", names[canonical], canonical, "", "", NO_CONTACTS_SOURCE)
+                 for canonical, people in found.items() if not people]
+        if not rows:
+            return
+        conn = self.connect()
+        if not conn:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.executemany("""
+                    INSERT INTO contacts (name, company, company_canonical, linkedin_url, snippet, source, discovered_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (company_canonical, linkedin_url) DO UPDATE SET
+                        name = EXCLUDED.name,
+                        snippet = EXCLUDED.snippet,
+                        discovered_at = EXCLUDED.discovered_at
+                """, rows)
+            conn.commit()
+        except Exception as e:
+            print(f"⚠️ Could not cache contacts: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def lookup(self, company_names):
+        """
+        People for each company, keyed by canonical company ID.
+
+        Each company is resolved at most once per run: from this run's
+        results, then the contacts table, then concurrent searches (one per
+        role keyword) for whatever is left.
+        """
+        names, waits = {}, set()
+        done = threading.Event()
+        with self._lock:
+            for name in company_names:
+                canonical = company_id(name)
+                if not canonical or canonical in self.found or canonical in names:
+                    continue
+                if canonical in self._pending:
+                    waits.add(self._pending[canonical])
+                else:
+                    names[canonical] = name
+                    self._pending[canonical] = done
+        try:
+            if names:
+                self._resolve(names)
+        finally:
+            with self._lock:
+                for canonical in names:
+                    del self._pending[canonical]
+            done.set()
+        for event in waits:
+            event.wait()
+        return self.found
+
+    def _resolve(self, names):
+        cached = self._load_cached(names)
+        with self._lock:
+            self.cache_hits += len(cached)
+            self.found.update(cached)
+
+        missing = [canonical for canonical in names if canonical not in cached]
+        tasks = {
+            SearchTask("linkedin", self.search_fn, names[canonical], [keyword], label=f"{names[canonical]}: {keyword}"): (canonical, keyword)
+            for canonical in missing
+            for keyword in self.role_keywords
+        }
+        by_keyword, failed = {}, set()
+        for result in FanOutExecutor(source_limits={"linkedin": CONTACT_CONCURRENCY}).run(list(tasks)):
+            with self._lock:
+                self.searches += 1
+            if result.ok:
+                by_keyword[tasks[result.task]] = result.value
+            else:
+                failed.add(tasks[result.task][0])
+                print(f"⚠️ Contact search failed for {result.task.label}: {result.error}")
+
+        # Role-keyword order regardless of completion order; one entry per profile
+        searched = {}
+        for canonical in missing:
+            people, seen = [], set()
+            for keyword in self.role_keywords:
+                for person in by_keyword.get((canonical, keyword), []):
+                    if person.get("linkedin") not in seen:
+                        seen.add(person.get("linkedin"))
+                        people.append(person)
+            searched[canonical] = people
+
+        with self._lock:
+            self.found.update(searched)
+        # A failed search is not evidence of nobody: leave those companies unmarked
+        self._store({canonical: people for canonical, people in searched.items() if people or canonical not in failed}, names)
+
+    def contacts_for(self, company_name):
+        return self.found.get(company_id(company_name), [])
+
+    def link_jobs(self, job_hashes):
+        """Link stored jobs to their company's discovered contacts in job_contacts"""
+        if not job_hashes:
+            return 0
+        conn = self.connect()
+        if not conn:
+            return 0
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO job_contacts (job_id, contact_id, relationship)
+                    SELECT j.id, c.id, 'team_member'
+                    FROM jobs j
+                    JOIN contacts c ON c.company_canonical = j.company_canonical AND c.source = %s
+                    WHERE j.job_hash = ANY(%s)
+                    ON CONFLICT DO NOTHING
+                """, (CONTACT_SOURCE, list(job_hashes)))
+                linked = cur.rowcount
+            conn.commit()
+            return linked
+        except Exception as e:
+            print(f"⚠️ Could not link contacts to jobs: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
@@ -0,0 +1,172 @@
+"""
+Yield-aware SerpAPI credit planner
+
+Records, for every (source, query) pair, how many never-before-seen job
+hashes each live call produced, and spends a fixed per-run credit budget on
+the queries with the best recent yield per credit. Queries with no history
+get an optimistic prior so new queries are always tried at least once.
+"""
+
+import os
+from collections import defaultdict
+from source_registry import get_source
+
+# Covers the baseline source set at worst-case cost: Google Jobs (4 queries x 2 pages),
+# target companies (2), Y Combinator (1) and AngelList (1)
+SERPAPI_CREDIT_BUDGET = int(os.getenv("SERPAPI_CREDIT_BUDGET", "12"))
+HISTORY_DAYS = 30
+HISTORY_RUNS = 10      # Most recent runs considered per query
+DECAY = 0.7            # Weight of each older run relative to the next newer one
+UNTRIED_PRIOR = 5.0    # Expected new jobs per credit for a query never run before
+
+
+class CreditPlanner:
+    """Chooses which (source, query) tasks to run and learns from their yield"""
+
+    def __init__(self, connect, budget=None):
+        """
+        Args:
+            connect: callable returning a DB connection (or None when offline)
+            budget: SerpAPI credits to spend per run
+        """
+        self.connect = connect
+        self.budget = SERPAPI_CREDIT_BUDGET if budget is None else budget
+        self.history = {}
+        self.planned_costs = {}
+        self.observations = []
+
+    def load_history(self):
+        """Load decayed new-jobs-per-credit for every query run recently"""
+        conn = self.connect()
+        if not conn:
+            return self.history
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT source, query, credits, new_jobs FROM (
+                        SELECT source, query, credits, new_jobs,
+                               ROW_NUMBER() OVER (PARTITION BY source, query ORDER BY created_at DESC) AS rn
+                        FROM query_yields
+                        WHERE created_at > NOW() - make_interval(days => %s)
+                    ) recent
+                    WHERE rn <= %s
+                    ORDER BY source, query, rn
+                """, (HISTORY_DAYS, HISTORY_RUNS))
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"⚠️ Could not load query yield history: {e}")
+            conn.rollback()
+            return self.history
+        finally:
+            conn.close()
+
+        weighted = defaultdict(lambda: [0.0, 0.0])  # key -> [new jobs, credits]
+        last_key, weight = None, 1.0
+        for source, query, credits, new_jobs in rows:
+            key = (source, query)
+            weight = 1.0 if key != last_key else weight * DECAY
+            last_key = key
+            weighted[key][0] += weight * new_jobs
+            weighted[key][1] += weight * max(credits, 1)
+
+        self.history = {key: new / credits for key, (new, credits) in weighted.items()}
+        return self.history
+
+    def expected_yield(self, source_name, spec):
+        return self.history.get((source_name, str(spec)), UNTRIED_PRIOR)
+
+    def plan(self, tasks):
+        """
+        Pick tasks to run within the credit budget, best expected yield first.
+
+        Cached queries cost nothing and are always kept. Ties keep the
+        registration order, so with no history the hand-tuned order wins.
+        """
+        scored = []
+        for index, task in enumerate(tasks):
+            spec = task.args[0]
+            cost = get_source(task.source).cost(spec)
+            self.planned_costs[id(task)] = cost
+            scored.append((-self.expected_yield(task.source, spec), index, cost, task))
+        scored.sort(key=lambda item: (item[0], item[1]))
+
+        selected, spent, skipped = [], 0, 0
+        for _, _, cost, task in scored:
+            if spent + cost > self.budget:
+                skipped += 1
+                continue
+            spent += cost
+            selected.append(task)
+
+        print(f"💳 Credit plan: {len(selected)} queries for ~{spent}/{self.budget} credits ({skipped} deferred)")
+        return selected
+
+    def observe(self, task, job_hashes, stored_hashes=None):
+        """
+        Remember which job hashes a task returned.
+
+        stored_hashes, when given, are the ones already in the jobs table at
+        the time - needed when jobs may be saved before record() runs.
+        """
+        self.observations.append((task, list(job_hashes), stored_hashes))
+
+    def _known_hashes(self, hashes):
+        if not hashes:
+            return set()
+        conn = self.connect()
+        if not conn:
+            return set()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT job_hash FROM jobs WHERE job_hash = ANY(%s)", (list(hashes),))
+                return {row[0] for row in cur.fetchall()}
+        finally:
+            conn.close()
+
+    def record(self):
+        """
+        Persist per-query yield for this run.
+
+        Must run before the run's jobs are saved, unless every observation
+        carried its stored_hashes: a hash counts as new only if it was not in
+        the jobs table and no earlier task in this run found it.
+        Cache hits are not recorded - they say nothing about live yield.
+        """
+        unchecked = {h for _, hashes, stored in self.observations if stored is None for h in hashes}
+        try:
+            known = self._known_hashes(unchecked)
+        except Exception as e:
+            print(f"⚠️ Could not check job history for yield tracking: {e}")
+            return
+        for _, _, stored in self.observations:
+            known |= stored or set()
+
+        rows = []
+        for task, hashes, _ in self.observations:
+            credits = self.planned_costs.get(id(task), 1)
+            new_jobs = 0
+            for job_hash in hashes:
+                if job_hash not in known:
+                    known.add(job_hash)
+                    new_jobs += 1
+            if credits > 0:
+                rows.append((task.source, str(task.args[0]), credits, len(hashes), new_jobs))
+
+        if not rows:
+            return
+        conn = self.connect()
+        if not conn:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.executemany("""
+                    INSERT INTO query_yields (source, query, credits, results, new_jobs)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, rows)
+            conn.commit()
+        except Exception as e:
+            print(f"⚠️ Could not save query yields: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
@@ -25,8 +25,8 @@ def daily_search():
     try:
         logging.info("Starting daily job search...")
         
-        # Run the job search
-        run_job_search()
+        # Run the job search - resumes today's run if an earlier attempt was cut short
+        run_job_search(trigger="daily")
         
         logging.info("Daily job search completed successfully")
         
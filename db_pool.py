@@ -0,0 +1,217 @@
+"""
+Shared Postgres connection pool
+
+One psycopg2 ThreadedConnectionPool per database URL and process, used by
+the search agent, the API and the Google Sheets sync. Connections are
+checked out with get_connection() and handed back by calling close() on
+them, so existing "connect, use, conn.close()" code needs no other change.
+
+- min/max sizing (DB_POOL_MIN / DB_POOL_MAX); checkouts wait up to
+  DB_POOL_CHECKOUT_TIMEOUT seconds for a free connection instead of
+  failing as soon as the pool is exhausted
+- connections idle longer than DB_POOL_HEALTHCHECK_IDLE seconds are pinged
+  on checkout and replaced if the server has dropped them
+- every connection runs with statement_timeout = DB_STATEMENT_TIMEOUT_MS
+- stats() reports sizes, checkouts, wait times and replaced connections
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions, pool
+
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "10"))
+DB_POOL_HEALTHCHECK_IDLE = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE", "30"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+
+class PooledConnection:
+    """A checked-out connection; close() returns it to the pool"""
+
+    def __init__(self, owner, conn):
+        self._owner = owner
+        self._conn = conn
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._owner.putconn(conn)
+
+    @property
+    def raw(self):
+        if self._conn is None:
+            raise psycopg2.InterfaceError("connection already returned to the pool")
+        return self._conn
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def __enter__(self):
+        self.raw.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self.raw.__exit__(*exc)
+
+    def __del__(self):
+        # Safety net for callers that forget close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """ThreadedConnectionPool with blocking checkout, health checks and metrics"""
+
+    def __init__(self, dsn, minconn=None, maxconn=None, statement_timeout_ms=None,
+                 checkout_timeout=None, healthcheck_idle=None):
+        self.minconn = DB_POOL_MIN if minconn is None else minconn
+        self.maxconn = max(self.minconn, DB_POOL_MAX if maxconn is None else maxconn, 1)
+        self.checkout_timeout = DB_POOL_CHECKOUT_TIMEOUT if checkout_timeout is None else checkout_timeout
+        self.healthcheck_idle = DB_POOL_HEALTHCHECK_IDLE if healthcheck_idle is None else healthcheck_idle
+        timeout = DB_STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+
+        self._pool = pool.ThreadedConnectionPool(
+            self.minconn, self.maxconn, dsn, options=f"-c statement_timeout={int(timeout)}"
+        )
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._lock = threading.Lock()
+        self._returned_at = {}     # id(conn) -> monotonic time it went back to the pool
+        self.checkouts = 0
+        self.waits = 0             # checkouts that found the pool exhausted
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.replaced = 0          # connections discarded by the health check
+
+    def _healthy(self, conn):
+        if conn.closed:
+            return False
+        returned_at = self._returned_at.get(id(conn))
+        if returned_at is not None and time.monotonic() - returned_at < self.healthcheck_idle:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    def getconn(self):
+        started = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            if not self._slots.acquire(timeout=self.checkout_timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise pool.PoolError(f"no database connection free after {self.checkout_timeout}s")
+            waited = time.monotonic() - started
+            with self._lock:
+                self.waits += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        try:
+            # Bounded: every idle connection could be stale after a server restart
+            for _ in range(self.maxconn + 1):
+                conn = self._pool.getconn()
+                if self._healthy(conn):
+                    break
+                with self._lock:
+                    self.replaced += 1
+                self._returned_at.pop(id(conn), None)
+                self._pool.putconn(conn, close=True)
+            else:
+                raise pool.PoolError("could not get a healthy database connection")
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.checkouts += 1
+        return PooledConnection(self, conn)
+
+    def putconn(self, conn):
+        """Return a raw connection, rolling back anything left uncommitted"""
+        close = bool(conn.closed)
+        if not close and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                close = True
+        if close:
+            self._returned_at.pop(id(conn), None)
+        else:
+            self._returned_at[id(conn)] = time.monotonic()
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "in_use": len(self._pool._used),
+                "idle": len(self._pool._pool),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "avg_wait_ms": round(1000 * self.wait_seconds / self.waits, 1) if self.waits else 0.0,
+                "max_wait_ms": round(1000 * self.max_wait_seconds, 1),
+                "timeouts": self.timeouts,
+                "replaced": self.replaced,
+            }
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(dsn=None):
+    """The process-wide pool for dsn (default DATABASE_URL), or None without one"""
+    dsn = dsn or os.getenv("DATABASE_URL")
+    if not dsn:
+        return None
+    key = (os.getpid(), dsn)   # A forked worker must not share its parent's sockets
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(dsn)
+        return _pools[key]
+
+
+def get_connection(dsn=None):
+    """A pooled connection for dsn (default DATABASE_URL), or None when not configured"""
+    db_pool = get_pool(dsn)
+    return db_pool.getconn() if db_pool else None
+
+
+def pool_stats():
+    """stats() for every pool in this process"""
+    with _pools_lock:
+        pools = [p for (pid, _), p in _pools.items() if pid == os.getpid()]
+    return [p.stats() for p in pools]
+
+
+def close_pools():
+    with _pools_lock:
+        pools = [p for (pid, _), p in _pools.items() if pid == os.getpid()]
+        _pools.clear()
+    for p in pools:
+        p.closeall()
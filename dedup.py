@@ -0,0 +1,273 @@
+"""
+Job de-duplication
+
+Exact de-duplication by URL/job hash, plus near-duplicate detection for the
+same posting formatted differently by different sources ("Senior PM - Stripe"
+from Built In vs "Senior Product Manager" at "Stripe, Inc." from Google Jobs).
+
+Near duplicates are found with MinHash signatures over normalized title and
+company tokens, bucketed with LSH so each new job is only compared with the
+handful of jobs sharing a band - roughly linear time over a batch.
+
+A candidate is confirmed conservatively: different URLs on the same site or
+different job IDs are always different postings (even on an identical
+URL, which must also have the same company), short titles must match
+token for token ("Senior PM, Payments" and "..., Billing" differ in one
+word that matters), and a match against a stored row needs the same URL or
+the same normalized title - dropping a new posting is never undone.
+"""
+
+import hashlib
+import random
+import re
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from company_index import company_id
+
+NUM_PERM = 64
+BANDS = 16                   # 16 bands x 4 rows -> candidates from ~50% similarity up
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.8   # Estimated Jaccard needed to call two long titles the same
+SHORT_TITLE_TOKENS = 6       # Titles this short must have identical tokens to match
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(1729)   # Fixed seed: signatures must be stable across runs
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+TITLE_ABBREVIATIONS = {
+    "pm": "product manager",
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "mgr": "manager",
+    "mngr": "manager",
+    "dir": "director",
+    "svp": "senior vice president",
+    "vp": "vice president",
+    "eng": "engineering",
+    "prod": "product",
+    "gm": "general manager",
+    "cos": "chief of staff",
+    "ii": "2",
+    "iii": "3",
+}
+TITLE_STOPWORDS = {"the", "a", "an", "of", "and", "for", "to", "in", "at", "job", "jobs", "hiring", "remote", "apply", "now"}
+
+# Placeholder companies some sources emit when the real one is only in the title
+PLACEHOLDER_COMPANIES = {"", "tech company", "yc company", "startup"}
+GENERIC_LOCATIONS = {"", "various", "remote/various", "see company site", "anywhere", "multiple locations"}
+
+# Query parameters that only say how a visitor arrived; any other parameter
+# may identify the posting (indeed.com/viewjob?jk=..., Google's htidocid=...)
+TRACKING_PARAMS = {"ref", "referrer", "src", "source", "trk", "trackingid", "refid", "gclid", "fbclid", "utm"}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_TITLE_COMPANY_SUFFIX = re.compile(r"\s+(?:-|–|—|\||@|at)\s+([^-–—|@]+?)\s*$", re.IGNORECASE)
+
+
+def normalize_url(url):
+    """Scheme- and www-free URL for exact matching, tracking parameters dropped and the rest sorted"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip().lower())
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    params = sorted((key, value) for key, value in parse_qsl(parts.query)
+                    if key not in TRACKING_PARAMS and not key.startswith("utm_"))
+    query = f"?{urlencode(params)}" if params else ""
+    return f"{host}{parts.path.rstrip('/')}{query}"
+
+
+def split_title_company(title, company):
+    """
+    Separate an embedded company from the title ("Senior PM - Stripe").
+
+    Returns (title, normalized company). A placeholder company ("Tech
+    Company") is replaced by the embedded name, or by "" when there is none,
+    so placeholder jobs only ever match each other.
+    """
+    title = title or ""
+    placeholder = (company or "").lower().strip() in PLACEHOLDER_COMPANIES
+    company_norm = "" if placeholder else company_id(company)
+    match = _TITLE_COMPANY_SUFFIX.search(title)
+    if match:
+        embedded = company_id(match.group(1))
+        if placeholder or embedded == company_norm:
+            return title[:match.start()], embedded
+    return title, company_norm
+
+
+def normalize_title_tokens(title, company=""):
+    """Title tokens with abbreviations expanded and company/stop words removed"""
+    company_tokens = set(company.split())
+    tokens = []
+    for token in _TOKEN_RE.findall(title.lower()):
+        expanded = TITLE_ABBREVIATIONS.get(token, token)
+        for word in expanded.split():
+            if word not in TITLE_STOPWORDS and word not in company_tokens:
+                tokens.append(word)
+    return tokens
+
+
+def url_host(url):
+    """Host part of a normalize_url() value"""
+    return url.split("/", 1)[0]
+
+
+def job_signature_parts(job):
+    """(title tokens, company, location tokens, url) used for near-duplicate checks"""
+    title, company = split_title_company(job.get('title', ''), job.get('company_name', ''))
+    location = (job.get('location') or "").lower().strip()
+    location_tokens = set() if location in GENERIC_LOCATIONS else set(_TOKEN_RE.findall(location))
+    url = normalize_url(job.get('job_url') or job.get('source_url') or job.get('link') or "")
+    return normalize_title_tokens(title, company), company, location_tokens, url
+
+
+def _shingles(title_tokens, company):
+    shingles = set(title_tokens)
+    shingles.update(f"{a} {b}" for a, b in zip(title_tokens, title_tokens[1:]))
+    shingles.update(f"company:{token}" for token in company.split())
+    return shingles
+
+
+def minhash(shingles):
+    """NUM_PERM-value MinHash signature of a shingle set"""
+    if not shingles:
+        return (_MAX_HASH,) * NUM_PERM
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimated_similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """LSH index over job signatures; add() reports what a job duplicates"""
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.entries = []          # (signature, company, location tokens, title tokens, url, job)
+        self.buckets = {}          # (band, band values) -> entry ids
+        self.urls = {}             # normalized url -> entry id
+
+    def _same_posting(self, signature, title_tokens, url, job_id, entry):
+        other_sig, _, _, other_tokens, other_url, other = entry
+        other_id = other.get('job_id')
+        if job_id and other_id and job_id != other_id:
+            return False   # Same source, two listings
+        if url and other_url and url_host(url) == url_host(other_url):
+            return False   # Same site, different pages (identical URLs matched earlier)
+        if other.get('_existing'):
+            return set(title_tokens) == set(other_tokens)   # Stored rows need the strongest signal
+        if min(len(title_tokens), len(other_tokens)) <= SHORT_TITLE_TOKENS:
+            return set(title_tokens) == set(other_tokens)
+        return estimated_similarity(signature, other_sig) >= self.threshold
+
+    def _find(self, signature, company, location_tokens, title_tokens, url, job_id):
+        if url and url in self.urls:
+            entry_id = self.urls[url]
+            _, other_company, _, _, _, other = self.entries[entry_id]
+            other_id = other.get('job_id')
+            if company == other_company and not (job_id and other_id and job_id != other_id):
+                return entry_id
+
+        candidates = set()
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS:(band + 1) * ROWS])
+            candidates.update(self.buckets.get(key, ()))
+
+        for entry_id in sorted(candidates):
+            entry = self.entries[entry_id]
+            _, other_company, other_locations = entry[:3]
+            if company != other_company:
+                continue
+            if location_tokens and other_locations and location_tokens.isdisjoint(other_locations):
+                continue  # Same role in two different cities is two postings
+            if self._same_posting(signature, title_tokens, url, job_id, entry):
+                return entry_id
+        return None
+
+    def add(self, job):
+        """
+        Index a job. Returns None if it is new, otherwise the earlier job it
+        duplicates (rows seeded from the database carry _existing=True).
+        """
+        title_tokens, company, location_tokens, url = job_signature_parts(job)
+        signature = minhash(_shingles(title_tokens, company))
+
+        match = self._find(signature, company, location_tokens, title_tokens, url, job.get('job_id'))
+        if match is not None:
+            return self.entries[match][-1]
+
+        entry_id = len(self.entries)
+        self.entries.append((signature, company, location_tokens, title_tokens, url, job))
+        for band in range(BANDS):
+            key = (band, signature[band * ROWS:(band + 1) * ROWS])
+            self.buckets.setdefault(key, []).append(entry_id)
+        if url:
+            self.urls[url] = entry_id
+        return None
+
+    def seed(self, rows):
+        """Index recent database rows so new jobs are also checked against them"""
+        for row in rows:
+            self.add(dict(row, _existing=True))
+        return len(self.entries)
+
+
+def load_recent_jobs(connect, days=30, limit=5000):
+    """Title/company/location/url of recently stored jobs for seeding an index"""
+    conn = connect()
+    if not conn:
+        return []
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT title, company_name, location, job_url
+                FROM jobs
+                WHERE created_at > NOW() - make_interval(days => %s)
+                ORDER BY created_at DESC
+                LIMIT %s
+            """, (days, limit))
+            columns = [col[0] for col in cur.description]
+            return [dict(zip(columns, row)) for row in cur.fetchall()]
+    except Exception as e:
+        print(f"⚠️ Could not load recent jobs for de-duplication: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+class IncrementalDeduper:
+    """Accepts jobs one at a time and rejects repeats by URL, job hash or near-duplicate match"""
+
+    def __init__(self, hash_fn, near_index=None):
+        self.hash_fn = hash_fn
+        self.near_index = near_index
+        self.seen_urls = set()
+        self.seen_hashes = set()
+        self.unique = []
+
+    def add(self, job):
+        """Keep job if it is new; returns True when it was kept"""
+        url = job.get('job_url', '') or job.get('source_url', '')
+        if not url or url in self.seen_urls:
+            return False
+
+        job_hash = self.hash_fn(job)
+        if job_hash in self.seen_hashes:
+            return False
+
+        if self.near_index is not None and self.near_index.add(job) is not None:
+            return False
+
+        self.seen_urls.add(url)
+        self.seen_hashes.add(job_hash)
+        self.unique.append(job)
+        return True
+
+    def __len__(self):
+        return len(self.unique)
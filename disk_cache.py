@@ -0,0 +1,136 @@
+"""
+SQLite-backed response cache with per-entry TTL and LRU eviction
+
+Values are stored as zlib-compressed JSON. The cache keeps the total stored
+size under max_bytes by evicting the least recently used entries, and counts
+hits, misses and evictions for the current process.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class DiskCache:
+    """Small persistent key/value cache shared by every thread in the process"""
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024, default_ttl=24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries(last_access)")
+
+    def get(self, key):
+        """Return the cached value or None when missing/expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+
+        return json.loads(zlib.decompress(value))
+
+    def contains(self, key):
+        """True if a live entry exists - does not touch counters or LRU order"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row is not None
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value for ttl seconds"""
+        blob = zlib.compress(json.dumps(value, default=str).encode())
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.default_ttl)
+
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO cache_entries (key, value, size, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    size = excluded.size,
+                    expires_at = excluded.expires_at,
+                    last_access = excluded.last_access
+            """, (key, blob, len(blob), expires_at, now))
+            self._evict(now)
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+    def _evict(self, now):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM cache_entries ORDER BY last_access ASC")
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self):
+        """Hit/miss counters for this process plus current on-disk footprint"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
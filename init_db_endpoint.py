@@ -3,8 +3,8 @@ Add this endpoint to your FastAPI app to initialize the database
 """
 
 from fastapi import HTTPException
-import psycopg2
 import os
+from db_pool import get_connection
 
 def add_db_init_endpoint(app):
     @app.post("/api/init-database")
@@ -27,10 +27,18 @@ def add_db_init_endpoint(app):
                 job_hash VARCHAR(32) UNIQUE NOT NULL,
                 title VARCHAR(255) NOT NULL,
                 company_name VARCHAR(255) NOT NULL,
+                company_canonical VARCHAR(255),
                 location VARCHAR(255),
                 description TEXT,
                 job_url TEXT,
                 match_score INTEGER,
+                base_score INTEGER,
+                location_bonus INTEGER,
+                company_bonus INTEGER,
+                match_rationale TEXT,
+                score_status VARCHAR(20) DEFAULT 'scored',
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                relevance_score INTEGER,
                 ai_analysis TEXT,
                 contacts JSONB,
                 status VARCHAR(50) DEFAULT 'new',
@@ -53,6 +61,10 @@ def add_db_init_endpoint(app):
                 name VARCHAR(255) NOT NULL,
                 company VARCHAR(255),
                 linkedin_url TEXT,
+                company_canonical VARCHAR(255),
+                snippet TEXT,
+                source VARCHAR(50),
+                discovered_at TIMESTAMP,
                 position VARCHAR(255),
                 notes TEXT,
                 last_contacted TIMESTAMP,
@@ -67,11 +79,88 @@ def add_db_init_endpoint(app):
                 PRIMARY KEY (job_id, contact_id)
             );
 
+            -- SerpAPI credit planner: new jobs found per query per run
+            CREATE TABLE IF NOT EXISTS query_yields (
+                id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+                source VARCHAR(100) NOT NULL,
+                query TEXT NOT NULL,
+                credits INTEGER NOT NULL DEFAULT 1,
+                results INTEGER NOT NULL DEFAULT 0,
+                new_jobs INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_query_yields_lookup ON query_yields(source, query, created_at DESC);
+
+            -- Last fully processed result set per query (skip unchanged queries)
+            CREATE TABLE IF NOT EXISTS query_fingerprints (
+                source VARCHAR(100) NOT NULL,
+                query TEXT NOT NULL,
+                fingerprint VARCHAR(64) NOT NULL,
+                result_count INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (source, query)
+            );
+
+            -- Search runs with per-stage checkpoints, so an interrupted run resumes
+            CREATE TABLE IF NOT EXISTS search_runs (
+                id SERIAL PRIMARY KEY,
+                trigger VARCHAR(20) NOT NULL DEFAULT 'manual',
+                status VARCHAR(20) NOT NULL DEFAULT 'running',
+                stage VARCHAR(30) NOT NULL DEFAULT 'search',
+                attempts INTEGER NOT NULL DEFAULT 1,
+                queries_fetched INTEGER NOT NULL DEFAULT 0,
+                jobs_scored INTEGER NOT NULL DEFAULT 0,
+                jobs_persisted INTEGER NOT NULL DEFAULT 0,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_search_runs_status ON search_runs(status, started_at DESC);
+
+            CREATE TABLE IF NOT EXISTS search_run_checkpoints (
+                run_id INTEGER NOT NULL REFERENCES search_runs(id) ON DELETE CASCADE,
+                stage VARCHAR(30) NOT NULL,
+                key TEXT NOT NULL,
+                payload JSONB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, stage, key)
+            );
+
+            -- Per-run instrumentation: timings, upstream calls, cache hits, tokens, credits, job counts
+            CREATE TABLE IF NOT EXISTS run_metrics (
+                run_id INTEGER NOT NULL REFERENCES search_runs(id) ON DELETE CASCADE,
+                stage VARCHAR(100) NOT NULL,
+                metric VARCHAR(50) NOT NULL,
+                value DOUBLE PRECISION NOT NULL DEFAULT 0,
+                recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, stage, metric)
+            );
+
             -- Indexes for performance
             CREATE INDEX IF NOT EXISTS idx_jobs_match_score ON jobs(match_score DESC);
             CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
             CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
             CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company_name);
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS company_canonical VARCHAR(255);
+            CREATE INDEX IF NOT EXISTS idx_jobs_company_canonical ON jobs(company_canonical);
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS score_status VARCHAR(20) DEFAULT 'scored';
+            CREATE INDEX IF NOT EXISTS idx_jobs_score_status ON jobs(score_status);
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS relevance_score INTEGER;
+            CREATE INDEX IF NOT EXISTS idx_jobs_relevance_score ON jobs(relevance_score DESC);
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS base_score INTEGER;
+            CREATE INDEX IF NOT EXISTS idx_jobs_base_score ON jobs(base_score DESC);
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+            CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen DESC);
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS location_bonus INTEGER;
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS company_bonus INTEGER;
+            ALTER TABLE jobs ADD COLUMN IF NOT EXISTS match_rationale TEXT;
+            ALTER TABLE contacts ADD COLUMN IF NOT EXISTS company_canonical VARCHAR(255);
+            ALTER TABLE contacts ADD COLUMN IF NOT EXISTS snippet TEXT;
+            ALTER TABLE contacts ADD COLUMN IF NOT EXISTS source VARCHAR(50);
+            ALTER TABLE contacts ADD COLUMN IF NOT EXISTS discovered_at TIMESTAMP;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_contacts_company_linkedin ON contacts(company_canonical, linkedin_url);
 
             -- Update timestamp function
             CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -91,11 +180,13 @@ def add_db_init_endpoint(app):
             """
             
             # Connect and execute schema
-            conn = psycopg2.connect(database_url)
-            with conn.cursor() as cur:
-                cur.execute(schema_sql)
-            conn.commit()
-            conn.close()
+            conn = get_connection(database_url)
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(schema_sql)
+                conn.commit()
+            finally:
+                conn.close()
             
             return {"message": "✅ Database initialized successfully! Tables created."}
             
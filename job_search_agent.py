@@ -1,15 +1,34 @@
 import os
-import json
 import hashlib
+import asyncio
+import itertools
+import time
 from datetime import datetime
-from openai import OpenAI
-from serpapi import GoogleSearch
 from dotenv import load_dotenv
-import psycopg2
 from psycopg2.extras import RealDictCursor
+from search_executor import SearchTask, TaskResult, FanOutExecutor
+from serpapi_client import serpapi_search, cache_stats
+from source_registry import Source, register_source, get_source, run_source, source_tasks, source_concurrency
+from credit_planner import CreditPlanner
+from query_fingerprints import QueryFingerprints
+from dedup import IncrementalDeduper, NearDuplicateIndex, load_recent_jobs
+from company_index import CompanyIndex, TARGET_COMPANIES, company_id, same_company
+from location_matcher import get_location_matcher
+from llm_executor import AsyncCompletionExecutor, run_deadline, SCORING_CONCURRENCY
+from prefilter import LocalPrefilter
+from relevance import RelevanceModel, DESCRIPTION_CHARS
+from match_score import MatchScore, SCORE_TOOL, parse_score_results
+from contact_finder import ContactFinder
+from known_jobs import KnownJobHashes
+from job_writer import JobBatchWriter
+from job_spool import JobSpool
+from db_pool import get_connection
+from pipeline import Pipeline, Stage, RunBudget
+from search_runs import SearchRun
+from run_metrics import metrics, METRICS_FLUSH_SECONDS
+from score_cache import scoring_version, score_cache_key, get_cached_score, cache_score, score_cache_stats
 
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -47,436 +66,474 @@ user_profile = {
     "company_stages": ["seed", "series A", "series B", "series C", "growth stage", "pre-IPO"],
     "company_sizes": ["10-50", "50-200", "200-1000", "startup", "scale-up"],
     "startup_focused": True,
-    "target_companies": {
-        # Health & Wellness
-        "health_wellness": ["Calm", "Headspace", "BetterHelp", "Grow Therapy", "Ro", "Zocdoc", "Oura", "Levels", "Accolade", "Superpower", "Visible Health", "Equip", "Brightside", "Turquoise Health", "Xealth"],
-        
-        # Fintech & Finance  
-        "fintech": ["Remitly", "Betterment", "Stripe", "Monarch Money", "Farther", "Possible Finance"],
-        
-        # Travel & Lifestyle
-        "travel_lifestyle": ["Navan", "TripActions", "Going", "Scott's Cheap Flights", "Hopper", "The Dyrt", "Outdoorsy", "Fora", "Airbnb", "Expedia"],
-        
-        # Consumer & E-commerce
-        "consumer_ecommerce": ["Strava", "VSCO", "Cuyana", "Italic", "Preply", "Duolingo", "Cambly", "REI"],
-        
-        # Productivity & Design
-        "productivity_design": ["Descript", "Canva", "Figma", "Notion", "Bending Spoons", "Evernote", "Aha!", "Scribe", "LinkedIn"],
-        
-        # Real Estate & Housing
-        "real_estate": ["Zillow", "Knock", "Pacaso"],
-        
-        # Climate & Sustainability  
-        "climate": ["Nori", "Future"],
-        
-        # Enterprise & B2B
-        "enterprise": ["Amazon", "Microsoft", "Google", "Katalyst", "Symbl.ai", "Center"],
-        
-        # Other Consumer Tech
-        "other_consumer": ["Otto", "Tolan", "Portola", "Sketchy", "Ravenna", "Jargon"]
-    }
+    "target_companies": TARGET_COMPANIES   # Kept in company_index so every importer canonicalizes alike
 }
 
+# Canonical company index for the target lists, built once at import
+TARGET_COMPANY_INDEX = CompanyIndex(
+    company for companies in user_profile['target_companies'].values() for company in companies
+)
+
+def get_target_company_index(profile):
+    """Target-company index for a profile (the prebuilt one for user_profile)"""
+    if profile is user_profile:
+        return TARGET_COMPANY_INDEX
+    return CompanyIndex(company for companies in profile.get('target_companies', {}).values() for company in companies)
+
+_relevance_models = {}
+
+def load_relevance_corpus():
+    """job_hash/title/description of every stored job, for fitting relevance IDF"""
+    conn = get_db_connection()
+    if not conn:
+        return []
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT job_hash, title, LEFT(description, %s) FROM jobs", (DESCRIPTION_CHARS,))
+            return [{'job_hash': h, 'title': t, 'description': d} for h, t, d in cur.fetchall()]
+    finally:
+        conn.close()
+
+def get_relevance_model(profile):
+    """
+    Local relevance model for a profile, built once per profile object.
+
+    IDF is fitted on the jobs table, as rerank_jobs_table does, so scores
+    written at insert time are on the same scale as re-ranked ones.
+    """
+    model = _relevance_models.get(id(profile))
+    if model is None:
+        model = RelevanceModel(profile)
+        try:
+            corpus = load_relevance_corpus()
+        except Exception as e:
+            print(f"⚠️ Could not load jobs to fit the relevance model: {e}")
+            corpus = []
+        if corpus:
+            model.fit(corpus)
+        model = _relevance_models.setdefault(id(profile), model)
+    return model
+
 def get_db_connection():
-    """Get database connection"""
-    if DATABASE_URL:
-        return psycopg2.connect(DATABASE_URL)
-    return None
+    """Get a pooled database connection - close() hands it back to the pool"""
+    return get_connection(DATABASE_URL)
 
 def calculate_location_priority_score(job_location, user_profile):
     """Calculate location priority score based on job location"""
     if not job_location:
         return 0
     
-    location_lower = job_location.lower().strip()
-    location_weights = user_profile.get('location_priority_weights', {})
-    
-    # Check for exact matches first
-    for location_key, weight in location_weights.items():
-        if location_key.lower() in location_lower:
-            return weight
-    
-    # Check for common variations and keywords
-    location_keywords = {
-        'remote': ['remote', 'work from home', 'anywhere', 'distributed'],
-        'seattle': ['seattle', 'wa', 'washington'],
-        'bellevue': ['bellevue'],
-        'kirkland': ['kirkland'],
-        'redmond': ['redmond'],
-        'eastside': ['eastside', 'east side'],
-        'san francisco': ['san francisco', 'sf', 'bay area', 'silicon valley'],
-        'new york': ['new york', 'nyc', 'brooklyn', 'queens', 'bronx'],
-        'austin': ['austin', 'tx', 'texas'],
-        'denver': ['denver', 'co', 'colorado'],
-        'boston': ['boston', 'ma', 'massachusetts', 'cambridge'],
-        'los angeles': ['los angeles', 'la', 'california', 'ca'],
-        'portland': ['portland', 'or', 'oregon'],
-        'vancouver': ['vancouver', 'bc', 'british columbia']
-    }
-    
-    for base_location, keywords in location_keywords.items():
-        if any(keyword in location_lower for keyword in keywords):
-            return location_weights.get(base_location, 0)
-    
-    return 0  # No location bonus/penalty
+    matcher = get_location_matcher(user_profile.get('location_priority_weights', {}))
+    return matcher.score(job_location)
+
+def calculate_location_priority_scores(job_locations, user_profile):
+    """Batch version of calculate_location_priority_score (e.g. re-scoring the whole table)"""
+    matcher = get_location_matcher(user_profile.get('location_priority_weights', {}))
+    return matcher.score_many(job_locations)
 
 def create_job_hash(job):
     """Create unique hash for job to prevent duplicates"""
     key_data = f"{job.get('company_name', '')}-{job.get('title', '')}-{job.get('location', '')}"
     return hashlib.md5(key_data.encode()).hexdigest()
 
+# Hashes of stored jobs, warmed once per process and updated as jobs are saved
+known_jobs = KnownJobHashes(get_db_connection)
+
+def filter_new_job_hashes(job_hashes):
+    """The hashes not in the database yet - one query for the whole batch"""
+    return known_jobs.filter_new(job_hashes)
+
 def job_exists(job_hash):
     """Check if job already exists in database"""
+    return not filter_new_job_hashes([job_hash])
+
+# Jobs that could not be written to the database, replayed on the next run
+job_spool = JobSpool()
+
+def new_job_writer(on_saved=None, **kwargs):
+    """Batched upsert writer for the jobs table, spooling to local JSONL on failure"""
+    def saved(job_hashes):
+        known_jobs.update(job_hashes)
+        if on_saved:
+            on_saved(job_hashes)
+    return JobBatchWriter(get_db_connection, job_spool, on_saved=saved, **kwargs)
+
+def replay_job_spool():
+    """Load jobs spooled while the database was unavailable; safe to repeat"""
+    if not DATABASE_URL:
+        return 0
+    try:
+        return job_spool.replay(get_db_connection)
+    except Exception as e:
+        print(f"⚠️ Could not replay job spool: {e}")
+        return 0
+
+def save_job_to_db(job_data):
+    """Save job to database"""
+    with new_job_writer() as writer:
+        writer.add(job_data)
+
+def backfill_company_canonical():
+    """Fill jobs.company_canonical for rows stored before the column existed"""
     conn = get_db_connection()
     if not conn:
-        return False
-    
+        return 0
+
     try:
         with conn.cursor() as cur:
-            cur.execute("SELECT id FROM jobs WHERE job_hash = %s", (job_hash,))
-            return cur.fetchone() is not None
-    except:
-        return False
+            cur.execute("SELECT DISTINCT company_name FROM jobs WHERE company_canonical IS NULL")
+            names = [row[0] for row in cur.fetchall()]
+            cur.executemany(
+                "UPDATE jobs SET company_canonical = %s WHERE company_name = %s AND company_canonical IS NULL",
+                [(company_id(name), name) for name in names]
+            )
+        conn.commit()
+        return len(names)
     finally:
         conn.close()
 
-def save_job_to_db(job_data):
-    """Save job to database"""
+def rescore_pending_jobs(limit=50, deadline=None, created_before=None):
+    """Retry AI scoring for jobs saved with score_status = 'pending'"""
     conn = get_db_connection()
     if not conn:
-        print("No database connection - saving to local JSON")
-        save_to_json(job_data)
-        return
-    
+        return 0
+
     try:
-        with conn.cursor() as cur:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute("""
-                INSERT INTO jobs (
-                    job_hash, title, company_name, location, description,
-                    job_url, match_score, ai_analysis, contacts, 
-                    created_at, status
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                job_data['job_hash'],
-                job_data['title'],
-                job_data['company_name'], 
-                job_data['location'],
-                job_data['description'],
-                job_data['job_url'],
-                job_data['match_score'],
-                job_data['ai_analysis'],
-                json.dumps(job_data['contacts']),
-                datetime.now(),
-                'new'
-            ))
+                SELECT job_hash, title, company_name, location, description
+                FROM jobs
+                WHERE score_status = 'pending' AND created_at < %s
+                ORDER BY created_at DESC
+                LIMIT %s
+            """, (created_before or datetime.now(), limit))
+            jobs = cur.fetchall()
+    finally:
+        conn.close()   # Don't hold a pooled connection while waiting on the LLM
+    if not jobs:
+        return 0
+
+    print(f"🔁 Re-scoring {len(jobs)} jobs left pending by earlier runs")
+    scores = match_jobs_to_user([dict(job) for job in jobs], user_profile, deadline=deadline)
+    rows = [dict(score.columns(), job_hash=job['job_hash']) for job, score in zip(jobs, scores) if score is not None]
+    if not rows:
+        return 0
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.executemany("""
+                UPDATE jobs
+                SET match_score = %(match_score)s, base_score = %(base_score)s,
+                    location_bonus = %(location_bonus)s, company_bonus = %(company_bonus)s,
+                    match_rationale = %(match_rationale)s, ai_analysis = %(ai_analysis)s,
+                    score_status = %(score_status)s, updated_at = CURRENT_TIMESTAMP
+                WHERE job_hash = %(job_hash)s
+            """, rows)
         conn.commit()
-    except Exception as e:
-        print(f"Database error: {e}")
-        save_to_json(job_data)
+        return len(rows)
     finally:
         conn.close()
 
-def save_to_json(job_data):
-    """Fallback: save to JSON file"""
-    filename = 'jobs_backup.json'
+def rerank_jobs_table(batch_size=2000):
+    """Recompute relevance_score for every stored job with IDF fitted on the whole table"""
+    jobs = load_relevance_corpus()
+    if not jobs:
+        return 0
+    model = RelevanceModel(user_profile).fit(jobs)
+    _relevance_models[id(user_profile)] = model   # New inserts in this process score on the same IDF
+
+    conn = get_db_connection()
     try:
-        with open(filename, 'r') as f:
-            jobs = json.load(f)
-    except:
-        jobs = []
-    
-    jobs.append(job_data)
-    
-    with open(filename, 'w') as f:
-        json.dump(jobs, f, indent=2, default=str)
+        updated = 0
+        with conn.cursor() as cur:
+            for start in range(0, len(jobs), batch_size):
+                batch = jobs[start:start + batch_size]
+                scores = model.score_many(batch)
+                cur.executemany(
+                    "UPDATE jobs SET relevance_score = %s WHERE job_hash = %s",
+                    [(score, job['job_hash']) for score, job in zip(scores, batch)]
+                )
+                updated += len(batch)
+        conn.commit()
+        return updated
+    finally:
+        conn.close()
 
 
-def search_jobs_serpapi(query: str, location: str = "Remote"):
-    """Search jobs using SerpAPI - Google Jobs"""
-    params = {
+def normalize_google_job(job, source):
+    """Add source metadata to a raw Google Jobs result"""
+    job['source'] = source
+    job['source_url'] = job.get('apply_options', [{}])[0].get('link', job.get('share_link', ''))
+    return job
+
+# ---------------------------------------------------------------------------
+# Job sources
+#
+# Each source is registered with its queries, SerpAPI params, parser, rate
+# limit and result budgets. Add a source by registering another Source.
+# ---------------------------------------------------------------------------
+
+def google_jobs_params(query):
+    return {
         "engine": "google_jobs",
-        "q": f"{query} {location}",
+        "q": query,
         "hl": "en",
         "api_key": SERPAPI_KEY
     }
 
-    search = GoogleSearch(params)
-    results = search.get_dict()
-    jobs = results.get("jobs_results", [])
-    
-    # Add source metadata
-    for job in jobs:
-        job['source'] = 'google_jobs'
-        job['source_url'] = job.get('apply_options', [{}])[0].get('link', job.get('share_link', ''))
-    
+def google_search_params(num):
+    """Params builder for plain Google searches returning `num` results"""
+    def build(query):
+        return {
+            "engine": "google",
+            "q": query,
+            "api_key": SERPAPI_KEY,
+            "num": num
+        }
+    return build
+
+def parse_google_jobs(source):
+    """Parser for Google Jobs result pages, tagging jobs with `source`"""
+    def parse(results, query):
+        return [normalize_google_job(job, source) for job in results.get("jobs_results", [])]
+    return parse
+
+def parse_ycombinator_results(results, query):
+    jobs = []
+    for result in results.get("organic_results", [])[:5]:  # Only check first 5
+        if '/jobs/' in result.get('link', ''):
+            jobs.append({
+                'title': result.get('title', ''),
+                'company_name': 'YC Company',
+                'location': 'Various',
+                'description': result.get('snippet', ''),
+                'job_url': result.get('link', ''),
+                'source': 'ycombinator',
+                'source_url': result.get('link', '')
+            })
     return jobs
 
+def parse_angellist_results(results, query):
+    jobs = []
+    for result in results.get("organic_results", [])[:6]:  # Only check first 6
+        if any(keyword in result.get('link', '') for keyword in ['/jobs/', '/job/']):
+            title = result.get('title', '')
+            company_name = 'Startup'
+            if ' at ' in title:
+                parts = title.split(' at ')
+                if len(parts) > 1:
+                    company_name = parts[1].split(' - ')[0].strip()
+
+            jobs.append({
+                'title': title.split(' at ')[0] if ' at ' in title else title,
+                'company_name': company_name,
+                'location': 'Remote/Various',
+                'description': result.get('snippet', ''),
+                'job_url': result.get('link', ''),
+                'source': 'angellist',
+                'source_url': result.get('link', '')
+            })
+    return jobs
+
+def parse_builtin_results(results, location):
+    jobs = []
+    for result in results.get("organic_results", []):
+        if '/jobs/' in result.get('link', ''):
+            jobs.append({
+                'title': result.get('title', ''),
+                'company_name': 'Tech Company',
+                'location': location.upper(),
+                'description': result.get('snippet', ''),
+                'job_url': result.get('link', ''),
+                'source': 'builtin',
+                'source_url': result.get('link', '')
+            })
+    return jobs
+
+def parse_target_company_results(results, company):
+    for result in results.get("organic_results", []):
+        link = result.get('link', '')
+        if any(keyword in link.lower() for keyword in ['job', 'career', 'hiring']):
+            # Only take first relevant result per company
+            return [{
+                'title': result.get('title', ''),
+                'company_name': company,
+                'location': 'See Company Site',
+                'description': result.get('snippet', ''),
+                'job_url': link,
+                'source': 'target_company_direct',
+                'source_url': link
+            }]
+    return []
+
+# STREAMLINED: Fewer, more targeted queries including plain "product manager"
+CORE_QUERIES = [
+    "senior product manager remote OR seattle OR bellevue",
+    "product manager startup OR \"series A\" OR fintech OR healthtech OR remote",
+    "principal product manager OR head of product \"early stage\" OR \"growth stage\" remote",
+    "founding product manager OR director product startup"
+]
+
+# STREAMLINED: Just 2 high-impact queries including plain "product manager"
+TARGETED_COMPANY_QUERIES = [
+    '"product manager" OR "senior product manager" OR "principal product manager" (Stripe OR Figma OR Notion OR Calm OR Strava OR Airbnb)',
+    '"head of product" OR "director product" (Amazon OR Microsoft OR Remitly OR Betterment OR Canva OR Oura)'
+]
+
+STARTUP_QUERIES = [
+    "\"senior product manager\" startup \"series A\" OR \"series B\" OR \"seed funded\"",
+    "\"head of product\" \"early stage\" startup remote",
+    "\"founding product manager\" \"well funded\" startup",
+    "\"director of product\" fintech OR healthtech OR \"climate tech\" startup"
+]
+
+# FOCUS ON TOP-TIER COMPANIES ONLY (much faster)
+PRIORITY_COMPANIES = [
+    "Stripe", "Figma", "Notion", "Canva", "Strava",
+    "Calm", "Headspace", "Oura", "Remitly", "Betterment",
+    "Airbnb", "Amazon", "Microsoft"  # 13 companies max
+]
+
+def count_new_jobs(jobs):
+    """How many of jobs are not stored yet - decides whether a query's next page is worth a credit"""
+    return len(filter_new_job_hashes([create_job_hash(job) for job in jobs]))
+
+register_source(Source(
+    "google_jobs", CORE_QUERIES, google_jobs_params, parse_google_jobs('google_jobs'),
+    display_name="Google Jobs optimized", concurrency=4, per_query_limit=20,
+    max_pages=2, min_novelty=0.5, count_new=count_new_jobs
+))
+register_source(Source(
+    "target_company_jobs", TARGETED_COMPANY_QUERIES, google_jobs_params, parse_google_jobs('target_company_jobs'),
+    display_name="Target companies", per_query_limit=10, budget=15
+))
+register_source(Source(
+    "startup_focused", STARTUP_QUERIES, google_jobs_params, parse_google_jobs('startup_focused'),
+    display_name="Startup focused", budget=20
+))
+register_source(Source(
+    "ycombinator", ["site:ycombinator.com/jobs product manager"],
+    google_search_params(10), parse_ycombinator_results,  # Reduced from 20
+    display_name="Y Combinator", budget=5
+))
+register_source(Source(
+    "angellist", ["site:wellfound.com OR site:angel.co product manager startup"],  # Single optimized query instead of 3
+    google_search_params(8), parse_angellist_results,  # Reduced from 15
+    display_name="AngelList", budget=8
+))
+register_source(Source(
+    "builtin", ["sf", "nyc", "austin", "seattle", "boston"],
+    lambda location: google_search_params(10)(f"site:builtin.com/{location} (senior OR principal OR head) product manager"),
+    parse_builtin_results,
+    display_name="Built In", budget=10
+))
+register_source(Source(
+    "target_company_direct", PRIORITY_COMPANIES,
+    # Single broad query per company (instead of multiple role queries)
+    lambda company: google_search_params(3)(f'("product manager" OR "head of product" OR "chief of staff") site:{company.lower()}.com'),
+    parse_target_company_results,
+    display_name="Target company sites", rate_per_sec=3, burst=3, concurrency=3, budget=10
+))
+
 def search_jobs_ycombinator():
     """Search Y Combinator jobs using SerpAPI - QUICK VERSION"""
     if not SERPAPI_KEY:
         return []
-    
-    params = {
-        "engine": "google",
-        "q": "site:ycombinator.com/jobs product manager",
-        "api_key": SERPAPI_KEY,
-        "num": 10  # Reduced from 20
-    }
-
-    try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        organic_results = results.get("organic_results", [])
-        
-        jobs = []
-        for result in organic_results[:5]:  # Only check first 5
-            if '/jobs/' in result.get('link', ''):
-                jobs.append({
-                    'title': result.get('title', ''),
-                    'company_name': 'YC Company',
-                    'location': 'Various',
-                    'description': result.get('snippet', ''),
-                    'job_url': result.get('link', ''),
-                    'source': 'ycombinator',
-                    'source_url': result.get('link', '')
-                })
-        
-        return jobs  # Return all found (max 5)
-    except Exception as e:
-        print(f"Error searching YC jobs: {e}")
-        return []
+    return run_source('ycombinator')
 
 def search_jobs_angellist():
     """Search AngelList jobs using SerpAPI - QUICK VERSION"""
     if not SERPAPI_KEY:
         return []
-    
-    # Single optimized query instead of 3
-    query = "site:wellfound.com OR site:angel.co product manager startup"
-    
-    params = {
-        "engine": "google",
-        "q": query,
-        "api_key": SERPAPI_KEY,
-        "num": 8  # Reduced from 15
-    }
-
-    try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        organic_results = results.get("organic_results", [])
-        
-        jobs = []
-        for result in organic_results[:6]:  # Only check first 6
-            if any(keyword in result.get('link', '') for keyword in ['/jobs/', '/job/']):
-                title = result.get('title', '')
-                company_name = 'Startup'
-                if ' at ' in title:
-                    parts = title.split(' at ')
-                    if len(parts) > 1:
-                        company_name = parts[1].split(' - ')[0].strip()
-                
-                jobs.append({
-                    'title': title.split(' at ')[0] if ' at ' in title else title,
-                    'company_name': company_name,
-                    'location': 'Remote/Various',
-                    'description': result.get('snippet', ''),
-                    'job_url': result.get('link', ''),
-                    'source': 'angellist',
-                    'source_url': result.get('link', '')
-                })
-        
-        return jobs  # Return all found (max 6)
-    except Exception as e:
-        print(f"Error searching AngelList: {e}")
-        return []
+    return run_source('angellist')
 
 def search_jobs_builtin():
     """Search Built In jobs using SerpAPI"""
     if not SERPAPI_KEY:
         return []
-    
-    locations = ["sf", "nyc", "austin", "seattle", "boston"]
-    all_jobs = []
-    
-    for location in locations:
-        params = {
-            "engine": "google",
-            "q": f"site:builtin.com/{location} (senior OR principal OR head) product manager",
-            "api_key": SERPAPI_KEY,
-            "num": 10
-        }
-
-        try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            organic_results = results.get("organic_results", [])
-            
-            for result in organic_results:
-                if '/jobs/' in result.get('link', ''):
-                    all_jobs.append({
-                        'title': result.get('title', ''),
-                        'company_name': 'Tech Company',
-                        'location': location.upper(),
-                        'description': result.get('snippet', ''),
-                        'job_url': result.get('link', ''),
-                        'source': 'builtin',
-                        'source_url': result.get('link', '')
-                    })
-        except Exception as e:
-            print(f"Error searching Built In jobs for {location}: {e}")
-            continue
-    
-    return all_jobs[:10]  # Limit to 10 results
+    return run_source('builtin')
 
 def search_startup_jobs_general():
     """Search for startup jobs using general startup-focused queries"""
     if not SERPAPI_KEY:
         return []
-    
-    startup_queries = [
-        "\"senior product manager\" startup \"series A\" OR \"series B\" OR \"seed funded\"",
-        "\"head of product\" \"early stage\" startup remote",
-        "\"founding product manager\" \"well funded\" startup",
-        "\"director of product\" fintech OR healthtech OR \"climate tech\" startup"
-    ]
-    
-    all_jobs = []
-    
-    for query in startup_queries:
-        params = {
-            "engine": "google_jobs",
-            "q": query,
-            "api_key": SERPAPI_KEY
-        }
-
-        try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            jobs = results.get("jobs_results", [])
-            
-            for job in jobs:
-                job['source'] = 'startup_focused'
-                job['source_url'] = job.get('apply_options', [{}])[0].get('link', job.get('share_link', ''))
-            
-            all_jobs.extend(jobs)
-        except Exception as e:
-            print(f"Error searching startup jobs with query '{query}': {e}")
-            continue
-    
-    return all_jobs[:20]  # Limit to 20 results
+    return run_source('startup_focused')
 
 def search_target_companies():
     """Search for jobs at specific target companies - OPTIMIZED"""
     if not SERPAPI_KEY:
         return []
-    
-    all_jobs = []
-    
-    # FOCUS ON TOP-TIER COMPANIES ONLY (much faster)
-    priority_companies = [
-        "Stripe", "Figma", "Notion", "Canva", "Strava", 
-        "Calm", "Headspace", "Oura", "Remitly", "Betterment",
-        "Airbnb", "Amazon", "Microsoft"  # 13 companies max
-    ]
-    
-    # Single broad query per company (instead of multiple role queries)
-    for company in priority_companies:
-        try:
-            query = f'("product manager" OR "head of product" OR "chief of staff") site:{company.lower()}.com'
-            
-            params = {
-                "engine": "google",
-                "q": query,
-                "api_key": SERPAPI_KEY,
-                "num": 3  # Reduced from 5
-            }
-            
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            organic_results = results.get("organic_results", [])
-            
-            for result in organic_results:
-                link = result.get('link', '')
-                if any(keyword in link.lower() for keyword in ['job', 'career', 'hiring']):
-                    all_jobs.append({
-                        'title': result.get('title', ''),
-                        'company_name': company,
-                        'location': 'See Company Site',
-                        'description': result.get('snippet', ''),
-                        'job_url': link,
-                        'source': 'target_company_direct',
-                        'source_url': link
-                    })
-                    break  # Only take first relevant result per company
-        
-        except Exception as e:
-            print(f"Error searching {company}: {e}")
-            continue
-    
-    return all_jobs[:10]  # Further limit results
+    return run_source('target_company_direct')
 
 def search_company_careers_general():
     """Search for jobs using general company + role queries - OPTIMIZED"""
     if not SERPAPI_KEY:
         return []
-    
-    all_jobs = []
-    
-    # STREAMLINED: Just 2 high-impact queries including plain "product manager"
-    targeted_queries = [
-        '"product manager" OR "senior product manager" OR "principal product manager" (Stripe OR Figma OR Notion OR Calm OR Strava OR Airbnb)',
-        '"head of product" OR "director product" (Amazon OR Microsoft OR Remitly OR Betterment OR Canva OR Oura)'
-    ]
-    
-    for query in targeted_queries:
-        try:
-            params = {
-                "engine": "google_jobs", 
-                "q": query,
-                "api_key": SERPAPI_KEY
-            }
-            
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            jobs = results.get("jobs_results", [])
-            
-            for job in jobs:
-                job['source'] = 'target_company_jobs'
-                job['source_url'] = job.get('apply_options', [{}])[0].get('link', job.get('share_link', ''))
-            
-            all_jobs.extend(jobs[:10])  # Limit to 10 per query
-            
-        except Exception as e:
-            print(f"Error searching: {e}")
-            continue
-    
-    return all_jobs[:15]  # Total limit of 15
+    return run_source('target_company_jobs')
+
+def run_company_strategy(company_name, strategy, engine, query, num):
+    """Run one search strategy for search_single_company and return candidate jobs"""
+    params = {
+        "engine": engine,
+        "q": query,
+        "api_key": SERPAPI_KEY,
+        "num": num
+    }
+    results = serpapi_search(params)
+    candidates = []
 
-def search_single_company(company_name):
-    """Search for product management roles at a specific company"""
-    print(f"🔑 SERPAPI_KEY in search_single_company: {bool(SERPAPI_KEY)}")
-    if SERPAPI_KEY:
-        print(f"🔑 SERPAPI_KEY first 10 chars: {SERPAPI_KEY[:10]}...")
+    if engine == "google_jobs":
+        # Handle Google Jobs results
+        jobs = results.get("jobs_results", [])
+        for job in jobs:
+            if same_company(company_name, job.get('company_name', '')):  # handles "Microsoft Corporation", aliases
+                candidates.append(normalize_google_job(job, f'company_search_{engine}'))
+        print(f"    ✓ Strategy {strategy}: {len(candidates)} relevant of {len(jobs)} Google Jobs results")
     else:
-        print("❌ SERPAPI_KEY is missing! Cannot perform search.")
-        
+        # Handle regular Google results
+        for result in results.get("organic_results", [])[:6]:  # Check first 6 results
+            link = result.get('link', '')
+            title = result.get('title', '')
+
+            # Look for job-related keywords in the link or title
+            if any(keyword in link.lower() for keyword in ['job', 'career', 'hiring', 'position']) or \
+               any(keyword in title.lower() for keyword in ['product manager', 'product lead', 'pm ']):
+                candidates.append({
+                    'title': title,
+                    'company_name': company_name,
+                    'location': 'See Company Site',
+                    'description': result.get('snippet', ''),
+                    'job_url': link,
+                    'source': f'company_search_web_{strategy}',
+                    'source_url': link
+                })
+        print(f"    ✓ Strategy {strategy}: {len(candidates)} potential job postings")
+
+    return candidates
+
+def search_single_company(company_name, max_results=12):
+    """Search for product management roles at a specific company
+
+    All strategies run concurrently; their results are merged through an
+    incremental URL/hash de-duplicator, and strategies still in flight are
+    abandoned as soon as max_results unique jobs have been collected.
+    """
     if not SERPAPI_KEY:
+        print("❌ SERPAPI_KEY is missing! Cannot perform search.")
         return []
-    
-    all_jobs = []
-    
+
     print(f"🔍 Searching for product roles at {company_name}...")
-    
+
     # Multiple search strategies for the company
     company_lower = company_name.lower()
-    
+
     # Add common career site patterns for major companies
     career_sites = [
         f'site:careers.{company_lower}.com',
         f'site:jobs.{company_lower}.com'
     ]
-    
+
     # Special cases for major companies
     if company_lower in ['microsoft', 'google', 'amazon', 'meta', 'apple']:
         if company_lower == 'microsoft':
@@ -489,207 +546,189 @@ def search_single_company(company_name):
             career_sites.extend(['site:careers.meta.com', 'site:metacareers.com'])
         elif company_lower == 'apple':
             career_sites.append('site:jobs.apple.com')
-    
+
     search_strategies = [
         # Strategy 1: Direct company site search
         f'"product manager" OR "senior product manager" OR "principal product manager" site:{company_lower}.com',
-        
+
         # Strategy 2: Google Jobs search
         f'"product manager" OR "head of product" OR "director product" "{company_name}"',
-        
+
         # Strategy 3: Career page search
         f'({" OR ".join(career_sites)}) ("product manager" OR "PM " OR "product lead")',
-        
+
         # Strategy 4: General web search for job postings
         f'"{company_name}" "product manager" (job OR career OR hiring OR position)'
     ]
-    
+
+    tasks = []
     for i, query in enumerate(search_strategies, 1):
-        try:
-            print(f"  📝 Strategy {i}: {query}")
-            
-            # Use Google Jobs for strategy 2, regular Google for others
-            engine = "google_jobs" if i == 2 else "google"
-            
-            params = {
-                "engine": engine,
-                "q": query,
-                "api_key": SERPAPI_KEY,
-                "num": 8 if i <= 2 else 5  # More results for primary strategies
-            }
-            
-            print(f"  🔧 API Request - Engine: {engine}, Query: {query}")
-            print(f"  🔧 Full params: {params}")
-            
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            
-            print(f"  🔧 Raw API Response keys: {list(results.keys())}")
-            print(f"  🔧 API Response sample: {str(results)[:200]}...")
-            
-            if engine == "google_jobs":
-                # Handle Google Jobs results
-                jobs = results.get("jobs_results", [])
-                print(f"  🔧 Google Jobs found: {len(jobs)} total jobs")
-                
-                for idx, job in enumerate(jobs):
-                    job_company = job.get('company_name', '').lower()
-                    company_lower = company_name.lower()
-                    
-                    print(f"    Job {idx+1}: '{job.get('title', 'No title')}' at '{job.get('company_name', 'No company')}'")
-                    
-                    # Check if company name appears in job company OR vice versa (handles variations like "Microsoft Corporation")
-                    match_1 = company_lower in job_company
-                    match_2 = job_company in company_lower
-                    match_3 = any(word in job_company for word in company_lower.split() if len(word) > 3)
-                    
-                    print(f"    🔍 Matching: '{company_lower}' vs '{job_company}' - match1: {match_1}, match2: {match_2}, match3: {match_3}")
-                    
-                    if match_1 or match_2 or match_3:
-                        job['source'] = f'company_search_{engine}'
-                        job['source_url'] = job.get('apply_options', [{}])[0].get('link', job.get('share_link', ''))
-                        all_jobs.append(job)
-                        print(f"    ✅ INCLUDED this job")
-                    else:
-                        print(f"    ❌ FILTERED OUT this job")
-                        
-                # Count jobs that match our flexible criteria
-                matching_jobs = []
-                for j in jobs:
-                    job_company = j.get('company_name', '').lower()
-                    company_lower = company_name.lower()
-                    if company_lower in job_company or job_company in company_lower or \
-                       any(word in job_company for word in company_lower.split() if len(word) > 3):
-                        matching_jobs.append(j)
-                print(f"    ✓ Found {len(matching_jobs)} relevant jobs")
-            else:
-                # Handle regular Google results  
-                organic_results = results.get("organic_results", [])
-                job_count = 0
-                
-                for result in organic_results[:6]:  # Check first 6 results
-                    link = result.get('link', '')
-                    title = result.get('title', '')
-                    
-                    # Look for job-related keywords in the link or title
-                    if any(keyword in link.lower() for keyword in ['job', 'career', 'hiring', 'position']) or \
-                       any(keyword in title.lower() for keyword in ['product manager', 'product lead', 'pm ']):
-                        
-                        all_jobs.append({
-                            'title': title,
-                            'company_name': company_name,
-                            'location': 'See Company Site',
-                            'description': result.get('snippet', ''),
-                            'job_url': link,
-                            'source': f'company_search_web_{i}',
-                            'source_url': link
-                        })
-                        job_count += 1
-                
-                print(f"    ✓ Found {job_count} potential job postings")
-            
-        except Exception as e:
-            print(f"    ❌ Strategy {i} failed: {e}")
-            continue
-    
-    # Remove duplicates based on URL
-    seen_urls = set()
-    unique_jobs = []
-    for job in all_jobs:
-        url = job.get('job_url', '') or job.get('source_url', '')
-        if url and url not in seen_urls:
-            seen_urls.add(url)
-            unique_jobs.append(job)
-    
+        # Use Google Jobs for strategy 2, regular Google for others
+        engine = "google_jobs" if i == 2 else "google"
+        num = 8 if i <= 2 else 5  # More results for primary strategies
+        tasks.append(SearchTask("company_search", run_company_strategy, company_name, i, engine, query, num,
+                                label=f"Strategy {i}"))
+
+    deduper = IncrementalDeduper(create_job_hash, near_index=NearDuplicateIndex())
+    executor = FanOutExecutor(per_source_limit=len(tasks))
+    results = executor.run(tasks)
+    try:
+        for result in results:
+            if not result.ok:
+                print(f"    ❌ {result.task.label} failed: {result.error}")
+                continue
+            for job in result.value:
+                deduper.add(job)
+                if len(deduper) >= max_results:
+                    break
+            if len(deduper) >= max_results:
+                print(f"    ⚡ {max_results} unique matches - cancelling remaining strategies")
+                break
+    finally:
+        results.close()
+
+    unique_jobs = deduper.unique[:max_results]
     print(f"✅ Found {len(unique_jobs)} unique opportunities at {company_name}")
-    return unique_jobs[:12]  # Limit to 12 results
+    return unique_jobs
+
+def iter_all_sources(planner=None, fingerprints=None, run=None):
+    """Search jobs from all available sources, yielding jobs as each search lands
 
-def search_all_sources():
-    """Search jobs from all available sources - OPTIMIZED VERSION"""
+    The credit planner picks which (source, query) pairs to run within the
+    per-run SerpAPI credit budget, based on each query's recent yield of
+    never-before-seen jobs. When fingerprints are given, queries whose result
+    set is unchanged since the last processed run are dropped entirely.
+    Jobs stream out while slower searches are still in flight, so downstream
+    stages start work as soon as the first results arrive. With a resumed
+    SearchRun, searches it already checkpointed are replayed, not re-fetched.
+    """
     print("🔎 Searching for senior product leadership roles...")
-    
-    all_jobs = []
-    sources_searched = []
-    
-    # STREAMLINED: Fewer, more targeted queries including plain "product manager"
-    core_queries = [
-        "senior product manager remote OR seattle OR bellevue",
-        "product manager startup OR \"series A\" OR fintech OR healthtech OR remote", 
-        "principal product manager OR head of product \"early stage\" OR \"growth stage\" remote",
-        "founding product manager OR director product startup"
+
+    total_jobs = 0
+    source_counts = {}
+
+    if not SERPAPI_KEY:
+        print("❌ SERPAPI_KEY is missing! Cannot perform search.")
+        return
+
+    if planner is None:
+        planner = CreditPlanner(get_db_connection)
+        planner.load_history()
+
+    # Candidate pool in hand-tuned priority order (used to break yield ties)
+    sources = ["google_jobs", "target_company_jobs", "ycombinator", "angellist",
+               "startup_focused", "builtin", "target_company_direct"]
+    tasks = source_tasks(sources)
+
+    # Searches an interrupted attempt of this run already paid for
+    replayed = []
+    if run is not None:
+        checkpointed = [(task, run.fetched_jobs(task.source, task.args[0])) for task in tasks]
+        replayed = [TaskResult(task, value=jobs) for task, jobs in checkpointed if jobs is not None]
+        if replayed:
+            print(f"♻️ Replaying {len(replayed)} checkpointed searches")
+        done = {id(result.task) for result in replayed}
+        tasks = [task for task in tasks if id(task) not in done]
+    tasks = planner.plan(tasks)
+
+    # Every (source, query) pair fans out at once - wall time is set by the slowest call
+    executor = FanOutExecutor(source_limits=source_concurrency(sources))
+
+    print(f"⚡ Fanning out {len(tasks)} searches across {len(sources)} sources...")
+    replayed_ids = {id(result) for result in replayed}
+    for result in itertools.chain(replayed, executor.run(tasks)):
+        task = result.task
+        stage = f"search:{task.source}"
+        metrics.add(stage, "queries")
+        metrics.add(stage, "wall_seconds", result.elapsed)
+        if not result.ok:
+            metrics.add(stage, "errors")
+            print(f"  ❌ {task.label[:50]} error: {result.error}")
+            continue
+
+        source = get_source(task.source)
+        jobs = result.value or []
+        job_hashes = [create_job_hash(job) for job in jobs]
+
+        if id(result) in replayed_ids:
+            metrics.add(stage, "replayed")
+            for job in jobs:
+                job['_replayed'] = True   # Already counted by the attempt that fetched it
+        else:
+            if run is not None:
+                run.record_fetch(task.source, task.args[0], jobs)
+
+            # Yield is judged against what was stored before this run's jobs start being saved
+            try:
+                stored_hashes = set(job_hashes) - set(filter_new_job_hashes(job_hashes))
+            except Exception as e:
+                print(f"⚠️ Could not check stored jobs for yield tracking: {e}")
+                stored_hashes = None
+            planner.observe(task, job_hashes, stored_hashes)
+
+        if fingerprints is not None and fingerprints.check(task.source, task.args[0], jobs, job_hashes):
+            metrics.add(stage, "unchanged")
+            print(f"  ⏭️ Unchanged since last run ({result.elapsed:.1f}s): {task.label[:50]}...")
+            continue
+        taken = source_counts.get(source.name, 0)
+        if source.budget is not None:
+            jobs = jobs[:max(0, source.budget - taken)]
+
+        total_jobs += len(jobs)
+        source_counts[source.name] = taken + len(jobs)
+        metrics.add(stage, "jobs", len(jobs))
+        print(f"  ✓ Found {len(jobs)} jobs ({result.elapsed:.1f}s): {task.label[:50]}...")
+        yield from jobs
+
+    planner.record()
+
+    sources_searched = [
+        f"{get_source(name).display_name} ({count} jobs)"
+        for name, count in source_counts.items()
     ]
-    
-    # PRIMARY SEARCH: Focus on high-value sources only
-    print("🎯 Phase 1: Core job board search...")
-    for query in core_queries:
-        try:
-            jobs = search_jobs_serpapi(query, "")  # No location filter, it's in the query
-            all_jobs.extend(jobs)
-            print(f"  ✓ Found {len(jobs)} jobs: {query[:50]}...")
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-    
-    sources_searched.append(f"Google Jobs optimized ({len(all_jobs)} jobs)")
-    
-    # TARGET COMPANIES: Only high-priority ones
-    print("🏢 Phase 2: Target company search...")
-    try:
-        company_jobs = search_company_careers_general()  # This is more efficient
-        all_jobs.extend(company_jobs)
-        sources_searched.append(f"Target companies ({len(company_jobs)} jobs)")
-        print(f"  ✓ Found {len(company_jobs)} jobs from target companies")
-    except Exception as e:
-        print(f"  ❌ Target company search error: {e}")
-    
-    # STARTUP SOURCES: Quick sampling only
-    print("🚀 Phase 3: Startup platforms...")
-    
-    # Y Combinator - quick search
-    try:
-        yc_jobs = search_jobs_ycombinator()
-        if yc_jobs:
-            all_jobs.extend(yc_jobs[:5])  # Limit to top 5
-            sources_searched.append(f"Y Combinator ({len(yc_jobs[:5])} jobs)")
-            print(f"  ✓ Found {len(yc_jobs[:5])} YC jobs")
-    except Exception as e:
-        print(f"  ❌ YC search error: {e}")
-    
-    # AngelList - quick search
-    try:
-        angel_jobs = search_jobs_angellist()
-        if angel_jobs:
-            all_jobs.extend(angel_jobs[:8])  # Limit to top 8
-            sources_searched.append(f"AngelList ({len(angel_jobs[:8])} jobs)")
-            print(f"  ✓ Found {len(angel_jobs[:8])} AngelList jobs")
-    except Exception as e:
-        print(f"  ❌ AngelList search error: {e}")
-    
+
     print(f"\n📊 SEARCH COMPLETE")
     print(f"📈 Sources: {', '.join(sources_searched)}")
-    print(f"🎯 Total opportunities found: {len(all_jobs)}")
-    
-    return all_jobs
+    print(f"🎯 Total opportunities found: {total_jobs}")
+    stats = cache_stats()
+    if not stats.get("disabled"):
+        print(f"💾 SerpAPI cache: {stats['hits']} hits, {stats['misses']} misses")
 
+def search_all_sources(planner=None, fingerprints=None):
+    """Search jobs from all available sources - returns every job as one list"""
+    return list(iter_all_sources(planner=planner, fingerprints=fingerprints))
 
-def match_job_to_user(job, user_profile):
+
+SCORING_MODEL = os.getenv("OPENAI_SCORING_MODEL", "gpt-4")
+SCORING_BATCH_TOKEN_BUDGET = int(os.getenv("SCORING_BATCH_TOKEN_BUDGET", "6000"))  # prompt + completion per request
+SCORING_MAX_BATCH_SIZE = int(os.getenv("SCORING_MAX_BATCH_SIZE", "10"))
+SCORING_OUTPUT_TOKENS_PER_JOB = 120
+
+SCORING_INSTRUCTIONS = """
+    Score each of the {count} jobs below independently, from 0-100, with 2-3 sentences of rationale on
+    company fit, location preference, role seniority, industry alignment and any concerns.
+    Report every job through the record_job_scores function.
+
+    {jobs}
+    """
+
+def calculate_job_bonuses(job, user_profile):
+    """Location priority and target company bonuses for a job"""
     # Calculate location priority score
     location_bonus = calculate_location_priority_score(job.get('location', ''), user_profile)
     
     # Calculate target company bonus
     target_company_bonus = 0
-    company_name = job.get('company_name', '').lower()
-    target_companies = user_profile.get('target_companies', {})
     
     # Check if this is one of our target companies
-    for category, companies in target_companies.items():
-        for target_company in companies:
-            if target_company.lower() in company_name or company_name in target_company.lower():
-                target_company_bonus = 10  # +10 points for target companies
-                break
+    if get_target_company_index(user_profile).lookup(job.get('company_name', '')):
+        target_company_bonus = 10  # +10 points for target companies
     
-    total_bonus = location_bonus + target_company_bonus
-    
-    prompt = f"""
+    return location_bonus, target_company_bonus
+
+def build_profile_prompt(user_profile):
+    """Candidate profile and scoring rubric - identical for every job, so it is sent once per batch"""
+    return f"""
     You are evaluating job fit for a senior product leader with this startup-focused profile:
     
     CANDIDATE PROFILE:
@@ -705,13 +744,6 @@ def match_job_to_user(job, user_profile):
     - Personality: High-agency, startup sensibilities, thrives in ambiguity, enjoys building from ground up, proven at scale
     - Avoids: {', '.join(user_profile['avoid'])}
 
-    JOB DETAILS:
-    Title: {job.get('title', 'N/A')}
-    Company: {job.get('company_name', 'N/A')} [Target Company Bonus: {target_company_bonus:+d}]
-    Location: {job.get('location', 'Not specified')} [Location Priority Score: {location_bonus:+d}]
-    Source: {job.get('source', 'unknown')}
-    Description: {job.get('description', 'No description available')[:500]}...
-
     SCORING CRITERIA (Base 0-100):
     1. Seniority Match (25 points): Senior/Principal/Head/Director level roles preferred
     2. Industry Fit (25 points): Strong preference for AI/ML, fintech, healthtech, productivity tools, consumer tech
@@ -719,46 +751,203 @@ def match_job_to_user(job, user_profile):
     4. Role Impact (25 points): Strategic role with product ownership, not execution-only
 
     BONUS FACTORS:
-    - Target company fit: Already calculated as {target_company_bonus:+d} points
-    - Location fit: Already calculated as {location_bonus:+d} points
+    - Target company fit and location fit: already calculated for each job (shown in brackets)
     - Remote work option: +10 points
     - Startup/venture-backed company: +10 points
     - "Founding" or "0-to-1" opportunity: +10 points
     - AI/ML/data focus: +10 points
     - Consumer or B2B SaaS: +5 points
 
-    IMPORTANT: Factor the total bonus/penalty of {total_bonus:+d} points ({location_bonus:+d} location + {target_company_bonus:+d} company) heavily into your scoring.
+    IMPORTANT: Factor each job's pre-calculated bonus/penalty heavily into your scoring.
+    """
 
-    Provide: SCORE (0-100) and 2-3 sentences explaining the match rationale, highlighting company fit, location preference, role seniority, industry alignment, and any concerns.
+def build_job_details(job, location_bonus, target_company_bonus):
+    """Per-job block of the scoring prompt"""
+    total_bonus = location_bonus + target_company_bonus
+    return f"""
+    Title: {job.get('title', 'N/A')}
+    Company: {job.get('company_name', 'N/A')} [Target Company Bonus: {target_company_bonus:+d}]
+    Location: {job.get('location', 'Not specified')} [Location Priority Score: {location_bonus:+d}]
+    Source: {job.get('source', 'unknown')}
+    Description: {job.get('description', 'No description available')[:500]}...
+    Total pre-calculated bonus/penalty: {total_bonus:+d} points ({location_bonus:+d} location + {target_company_bonus:+d} company)
     """
 
-    try:
-        completion = client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3  # Lower temperature for more consistent scoring
-        )
-        ai_response = completion.choices[0].message.content.strip()
-        
-        # Apply location bonus to the final score
-        import re
-        score_match = re.search(r'score:?\s*(\d+)', ai_response.lower())
-        if score_match:
-            base_score = int(score_match.group(1))
-            adjusted_score = max(0, min(100, base_score + total_bonus))  # Clamp between 0-100
-            
-            # Update the response with the adjusted score
-            ai_response = re.sub(r'score:?\s*\d+', f'Score: {adjusted_score}', ai_response, flags=re.IGNORECASE)
-            if target_company_bonus > 0:
-                ai_response += f" [Base: {base_score}, Location: {location_bonus:+d}, Company: {target_company_bonus:+d}]"
-            else:
-                ai_response += f" [Base: {base_score}, Location: {location_bonus:+d}]"
-        
-        return ai_response
-    except Exception as e:
-        print(f"Error getting AI match score: {e}")
-        return f"Score: 70 - Unable to analyze job details due to API error. Bonuses: Location {location_bonus:+d}, Company {target_company_bonus:+d}"
+def get_scoring_version(user_profile):
+    """Version hash for cached scores - changes whenever the profile, prompts or model change"""
+    return scoring_version(SCORING_MODEL, user_profile, build_profile_prompt(user_profile),
+                           SCORING_INSTRUCTIONS, SCORE_TOOL)
+
+def scoring_request(prefix, blocks):
+    """Chat completion request scoring a batch of job blocks via the record_job_scores function"""
+    numbered = "\n".join(f"JOB {n}:{block}" for n, block in enumerate(blocks, 1))
+    return {
+        "model": SCORING_MODEL,
+        "messages": [
+            {"role": "system", "content": prefix},
+            {"role": "user", "content": SCORING_INSTRUCTIONS.format(count=len(blocks), jobs=numbered)}
+        ],
+        "tools": [SCORE_TOOL],
+        "tool_choice": {"type": "function", "function": {"name": "record_job_scores"}},
+        "temperature": 0.3,  # Lower temperature for more consistent scoring
+        "max_tokens": SCORING_OUTPUT_TOKENS_PER_JOB * len(blocks) + 50
+    }
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) for batch sizing"""
+    return len(text) // 4 + 1
+
+def plan_scoring_batches(job_blocks, prefix_tokens, token_budget=None, max_batch_size=None):
+    """
+    Group job indexes into batches that fit the per-request token budget.
 
+    Each batch pays for the shared profile prefix once, plus every job's
+    block and its expected share of the completion.
+    """
+    token_budget = token_budget or SCORING_BATCH_TOKEN_BUDGET
+    max_batch_size = max_batch_size or SCORING_MAX_BATCH_SIZE
+    batches, current, used = [], [], prefix_tokens
+
+    for index, block in enumerate(job_blocks):
+        cost = estimate_tokens(block) + SCORING_OUTPUT_TOKENS_PER_JOB
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, used = [], prefix_tokens
+        current.append(index)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+async def score_jobs_async(jobs, user_profile, executor=None):
+    """
+    Score many jobs with as few chat completions as possible.
+
+    Jobs already scored under the current profile/prompt version come from
+    the score cache, and identical postings within the call are scored once.
+    The rest are packed into batches sized by a token budget; each request
+    sends the candidate profile once and gets per-job scores back through
+    the record_job_scores function. Batches run concurrently through an
+    AsyncCompletionExecutor, and jobs missing from a batch response get a
+    retry on their own.
+
+    Returns one MatchScore per job, with None for jobs that could not be
+    scored before the deadline.
+    """
+    if not jobs:
+        return []
+
+    version = get_scoring_version(user_profile)
+    outputs = []
+    for job in jobs:
+        cached = get_cached_score(job, version)
+        outputs.append(MatchScore.from_dict(cached) if cached is not None else None)
+
+    # One representative per distinct content hash among the cache misses
+    pending = {}
+    for index, job in enumerate(jobs):
+        if outputs[index] is None:
+            pending.setdefault(score_cache_key(job, version), []).append(index)
+    to_score = [indexes[0] for indexes in pending.values()]
+
+    cached_count = len(jobs) - sum(len(indexes) for indexes in pending.values())
+    metrics.add("score", "cache_hits", cached_count)
+    metrics.add("score", "cache_misses", len(to_score))
+    if cached_count:
+        print(f"💾 {cached_count} match scores served from cache")
+
+    if to_score:
+        owned = executor is None   # Ours to close before the caller's event loop ends
+        executor = executor or AsyncCompletionExecutor()
+        prefix = build_profile_prompt(user_profile)
+        bonuses = {index: calculate_job_bonuses(jobs[index], user_profile) for index in to_score}
+        blocks = {index: build_job_details(jobs[index], *bonuses[index]) for index in to_score}
+
+        async def score_batches(batches):
+            """Score batches of job indexes; returns the indexes left without a score"""
+            completions = await executor.map(
+                scoring_request(prefix, [blocks[index] for index in batch]) for batch in batches
+            )
+            missing = []
+            for batch, completion in zip(batches, completions):
+                scores = parse_score_results(completion.choices[0].message) if completion else {}
+                for n, index in enumerate(batch, 1):
+                    if n not in scores:
+                        missing.append(index)
+                        continue
+                    base_score, rationale = scores[n]
+                    outputs[index] = MatchScore(base_score, *bonuses[index], rationale=rationale)
+                    cache_score(jobs[index], version, outputs[index].to_dict())
+            return missing
+
+        batches = [[to_score[position] for position in batch]
+                   for batch in plan_scoring_batches([blocks[index] for index in to_score], estimate_tokens(prefix))]
+        print(f"🧠 Scoring {len(to_score)} jobs in {len(batches)} batched request(s), "
+              f"{executor.concurrency} at a time")
+
+        # Jobs the batch response skipped (or whose batch failed) get one attempt on their own
+        try:
+            missing = await score_batches(batches)
+            if missing:
+                missing = await score_batches([[index] for index in missing])
+        finally:
+            if owned:
+                await executor.close()
+
+        if missing:
+            metrics.add("score", "pending", len(missing))
+            print(f"⚠️ {len(missing)} jobs could not be scored - marked for re-scoring")
+
+    # Identical postings share the representative's score
+    for indexes in pending.values():
+        for index in indexes[1:]:
+            outputs[index] = outputs[indexes[0]]
+
+    return outputs
+
+def scoring_requests_for(jobs, user_profile, prefix_tokens):
+    """OpenAI requests scoring these jobs takes, given how scoring batches them"""
+    return len(plan_scoring_batches(
+        [build_job_details(job, *calculate_job_bonuses(job, user_profile)) for job in jobs], prefix_tokens
+    ))
+
+def match_jobs_to_user(jobs, user_profile, deadline=None):
+    """Synchronous score_jobs_async() for scripts; deadline is a time.monotonic() value"""
+    async def run():
+        async with AsyncCompletionExecutor(deadline=deadline) as executor:
+            return await score_jobs_async(jobs, user_profile, executor)
+    return asyncio.run(run())
+
+def match_job_to_user(job, user_profile):
+    """MatchScore for one job, or None if it could not be scored"""
+    return match_jobs_to_user([job], user_profile)[0]
+
+LOCAL_ESTIMATE_CAP = 50   # Highest match_score a local relevance estimate can get
+
+def fill_with_local_scores(jobs, scores, user_profile):
+    """
+    Replace missing AI scores with the local relevance model's estimate.
+
+    Returns (match scores, relevance scores). Jobs scored locally keep
+    status 'pending' so a later run re-scores them with the LLM, and their
+    total is capped at LOCAL_ESTIMATE_CAP so an estimate never outranks a
+    good LLM score in the jobs list.
+    """
+    relevance_scores = get_relevance_model(user_profile).score_many(jobs)
+    filled = []
+    for job, score, relevance in zip(jobs, scores, relevance_scores):
+        if score is None:
+            bonuses = calculate_job_bonuses(job, user_profile)
+            score = MatchScore(
+                min(relevance, LOCAL_ESTIMATE_CAP - max(0, sum(bonuses))), *bonuses,
+                rationale="Local relevance estimate; AI scoring unavailable, will be re-scored.",
+                status='pending'
+            )
+        filled.append(score)
+    return filled, relevance_scores
+
+CONTACT_ROLE_KEYWORDS = ["senior product manager", "principal product manager", "chief of staff", "head of product"]
 
 def find_team_members(company, role_keywords=["product manager", "chief of staff"]):
     people = []
@@ -768,8 +957,7 @@ def find_team_members(company, role_keywords=["product manager", "chief of staff
             "q": f"site:linkedin.com/in/ {keyword} {company}",
             "api_key": SERPAPI_KEY
         }
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = serpapi_search(params)
 
         if "organic_results" in results:
             for res in results["organic_results"][:3]:
@@ -781,82 +969,265 @@ def find_team_members(company, role_keywords=["product manager", "chief of staff
     return people
 
 
-def main():
-    # Use the comprehensive search function
-    all_jobs = search_all_sources()
-    
-    # Remove duplicates based on company + title + location
-    seen = set()
-    unique_jobs = []
-    for job in all_jobs:
-        # Create a more robust key for deduplication
-        title = job.get('title', '').lower().strip()
-        company = job.get('company_name', '').lower().strip()
-        location = job.get('location', '').lower().strip()
-        
-        key = f"{company}|{title}|{location}"
-        if key not in seen and title and company:  # Only include jobs with title and company
-            seen.add(key)
-            unique_jobs.append(job)
-    
-    print(f"\n🔍 Deduplication complete: {len(unique_jobs)} unique opportunities")
+PIPELINE_JOB_BUDGET = int(os.getenv("PIPELINE_JOB_BUDGET", "50"))  # New jobs scored per run
+PIPELINE_EXISTS_WORKERS = int(os.getenv("PIPELINE_EXISTS_WORKERS", "2"))    # Concurrent existence queries
+PIPELINE_CONTACT_WORKERS = int(os.getenv("PIPELINE_CONTACT_WORKERS", "3"))  # Concurrent contact lookups
 
-    final_results = []
+def job_url_for(job):
+    """Job URL from the various fields sources put it in"""
+    return (job.get('job_url') or
+            job.get('link') or
+            job.get('source_url') or
+            (job.get('apply_options') or [{}])[0].get('link', ''))
 
-    new_jobs_count = 0
-    
-    # Process jobs and save new ones to database
-    for job in unique_jobs[:15]:  # analyze top 15 opportunities
-        job_hash = create_job_hash(job)
-        
-        # Skip if we've already processed this job
-        if job_exists(job_hash):
-            continue
-            
-        new_jobs_count += 1
-        print(f"\n🆕 NEW JOB: {job['title']} at {job['company_name']}")
-        
-        score_output = match_job_to_user(job, user_profile)
-        print(f"🧠 Match Score: {score_output}")
-
-        contacts = find_team_members(job['company_name'], ["senior product manager", "principal product manager", "chief of staff", "head of product"])
-
-        # Extract numeric score for sorting
-        import re
-        score_numbers = re.findall(r'\b(\d+)\b', score_output)
-        numeric_score = int(score_numbers[0]) if score_numbers else 0
-        
-        # Get job URL from various possible fields
-        job_url = (job.get('job_url') or 
-                  job.get('link') or 
-                  job.get('source_url') or 
-                  job.get('apply_options', [{}])[0].get('link', '') if job.get('apply_options') else '')
-        
-        # Prepare job data for database
-        job_data = {
-            'job_hash': job_hash,
-            'title': job.get('title', ''),
-            'company_name': job.get('company_name', ''),
-            'location': job.get('location', 'Remote'),
-            'description': job.get('description', ''),
-            'job_url': job_url,
-            'match_score': numeric_score,
-            'ai_analysis': score_output,
-            'contacts': contacts
-        }
-        
-        # Save to database
-        save_job_to_db(job_data)
-
-        final_results.append({
-            "job": job,
-            "score": score_output,
-            "contacts": contacts,
-            "job_url": job_url,
-            "numeric_score": numeric_score
-        })
-    
-    print(f"\n📊 Found {new_jobs_count} new jobs out of {len(unique_jobs)} total opportunities")
+def run_daily_pipeline(fingerprints, scoring_deadline, job_budget=None, run=None):
+    """
+    Stream the daily search through its stages:
+
+        search → normalize → dedupe → exists → prefilter → score → contacts → persist
+
+    Stages run concurrently on their own workers, connected by bounded
+    queues, so scoring and contact lookups start while searches are still in
+    flight. Instead of a fixed top-N cut, new jobs are scored until the run's
+    budget (job_budget jobs, or scoring_deadline) is spent; the rest are
+    deferred to the next run. With a SearchRun, fetched results and LLM
+    scores are checkpointed as they land and reused when the run resumes.
+
+    Returns a dict with the persisted results, every job hash the searches
+    returned, the deferred hashes, the hashes of jobs in batches a stage
+    failed on and the pipeline's stage stats.
+    """
+    budget = RunBudget(PIPELINE_JOB_BUDGET if job_budget is None else job_budget, scoring_deadline)
+    near_index = NearDuplicateIndex()
+    near_index.seed(load_recent_jobs(get_db_connection))
+    prefilter = LocalPrefilter(user_profile, lambda job: calculate_job_bonuses(job, user_profile))
+    contact_finder = ContactFinder(get_db_connection, find_team_members, CONTACT_ROLE_KEYWORDS)
+    writer = new_job_writer(on_saved=run.record_persisted if run is not None else None)
+
+    seen_hashes, deferred_hashes, stored_hashes = set(), set(), []
+    counts = {'batch_duplicates': 0, 'stored_duplicates': 0, 'requests_saved': 0}
+    prefix_tokens = estimate_tokens(build_profile_prompt(user_profile))
+
+    # jobs.* counters skip replayed jobs; the interrupted attempt already counted them
+    def count_unreplayed(items):
+        return sum(1 for _, job in items if not job.get('_replayed'))
+
+    def normalize(jobs):
+        replayed = sum(1 for job in jobs if job.get('_replayed'))
+        metrics.add("jobs", "seen", len(jobs) - replayed)
+        metrics.add("jobs", "replayed", replayed)
+        normalized = []
+        for job in jobs:
+            job_hash = create_job_hash(job)
+            seen_hashes.add(job_hash)
+            if job.get('title', '').strip() and job.get('company_name', '').strip():
+                normalized.append((job_hash, job))  # Only include jobs with title and company
+        return normalized
+
+    def dedupe(items):
+        # Near-duplicates across sources and against recently stored jobs
+        unique = []
+        for job_hash, job in items:
+            duplicate_of = near_index.add(job)
+            if duplicate_of is None:
+                unique.append((job_hash, job))
+            elif duplicate_of.get('_existing'):
+                if not job.get('_replayed'):
+                    counts['stored_duplicates'] += 1
+                    metrics.add("jobs", "stored_duplicates")
+                print(f"  🧬 {job.get('title', 'Unknown')} at {job.get('company_name', 'Unknown')}: "
+                      f"already stored as {duplicate_of.get('job_url') or duplicate_of.get('title')}")
+            elif not job.get('_replayed'):
+                counts['batch_duplicates'] += 1
+                metrics.add("jobs", "batch_duplicates")
+        return unique
+
+    def exists(items):
+        # One existence query per batch; stored jobs only get last_seen bumped
+        new_hashes = set(filter_new_job_hashes([job_hash for job_hash, _ in items]))
+        stored_hashes.extend(job_hash for job_hash, _ in items if job_hash not in new_hashes)
+        new_items = [(job_hash, job) for job_hash, job in items if job_hash in new_hashes]
+        metrics.add("jobs", "already_stored", count_unreplayed(items) - count_unreplayed(new_items))
+        metrics.add("jobs", "new", count_unreplayed(new_items))
+        return new_items
+
+    def local_filter(items):
+        jobs = [job for _, job in items]
+        candidates, rejects = prefilter.split(jobs)
+        metrics.add("jobs", "prefilter_rejected", len(rejects))
+        if rejects:
+            # OpenAI requests the rejects would have cost on top of the candidates
+            saved = (scoring_requests_for(jobs, user_profile, prefix_tokens)
+                     - scoring_requests_for(candidates, user_profile, prefix_tokens))
+            counts['requests_saved'] += saved
+            metrics.add("openai", "requests_saved", saved)
+        for job, score, reason in rejects:
+            print(f"  🪓 {job.get('title', 'Unknown')} at {job.get('company_name', 'Unknown')}: {reason}")
+        keep = {id(job) for job in candidates}
+        return [(job_hash, job) for job_hash, job in items if id(job) in keep]
+
+    def score(items):
+        items, deferred = budget.admit(items)
+        deferred_hashes.update(job_hash for job_hash, _ in deferred)
+        metrics.add("jobs", "deferred", len(deferred))
+        jobs = [job for _, job in items]
+        checkpointed = [run.scored_job(job_hash) if run is not None else None for job_hash, _ in items]
+        unscored = [index for index, score in enumerate(checkpointed) if score is None]
+        fresh = match_jobs_to_user([jobs[index] for index in unscored], user_profile, deadline=scoring_deadline) if unscored else []
+        scores = [MatchScore.from_dict(score) if score is not None else None for score in checkpointed]
+        for index, score in zip(unscored, fresh):
+            scores[index] = score
+        if run is not None:
+            run.record_scores({items[index][0]: scores[index].to_dict() for index in unscored if scores[index] is not None})
+        # Jobs the LLM couldn't score get a local relevance estimate and stay pending
+        scores, relevance_scores = fill_with_local_scores(jobs, scores, user_profile)
+        return [(job_hash, job, match, relevance)
+                for (job_hash, job), match, relevance in zip(items, scores, relevance_scores)]
+
+    def contacts(items):
+        # One lookup per company, served from the contacts table while fresh
+        contact_finder.lookup([job['company_name'] for _, job, _, _ in items])
+        return [(job_hash, job, match, relevance, contact_finder.contacts_for(job['company_name']))
+                for job_hash, job, match, relevance in items]
+
+    def persist(items):
+        results = []
+        for job_hash, job, match, relevance, people in items:
+            print(f"\n🆕 NEW JOB: {job['title']} at {job['company_name']}")
+            print(f"🧠 Match Score: {match.summary()}")
+            job_url = job_url_for(job)
+            # Buffered - written in batches by the writer
+            writer.add({
+                'job_hash': job_hash,
+                'title': job.get('title', ''),
+                'company_name': job.get('company_name', ''),
+                'location': job.get('location', 'Remote'),
+                'description': job.get('description', ''),
+                'job_url': job_url,
+                **match.columns(),
+                'relevance_score': relevance,
+                'contacts': people
+            })
+            results.append({
+                "job_hash": job_hash,
+                "job": job,
+                "score": match.summary(),
+                "contacts": people,
+                "job_url": job_url,
+                "numeric_score": match.total
+            })
+        metrics.add("jobs", "persisted", len(results))
+        metrics.flush(get_db_connection, run.id if run is not None else None, min_interval=METRICS_FLUSH_SECONDS)
+        return results
+
+    scoring_batch = SCORING_MAX_BATCH_SIZE * SCORING_CONCURRENCY
+    pipeline = Pipeline([
+        Stage("normalize", normalize, batch_size=50),
+        Stage("dedupe", dedupe, batch_size=50),
+        Stage("exists", exists, workers=PIPELINE_EXISTS_WORKERS, batch_size=100, max_wait=0.2),
+        Stage("prefilter", local_filter, batch_size=50),
+        Stage("score", score, batch_size=scoring_batch, max_wait=1.0),
+        Stage("contacts", contacts, workers=PIPELINE_CONTACT_WORKERS, batch_size=10, max_wait=0.5),
+        Stage("persist", persist, batch_size=50),
+    ])
+    # A failing search stream re-raises here once the jobs it did yield are saved,
+    # so main() finishes the run as failed and keeps its checkpoints
+    try:
+        results = pipeline.run(iter_all_sources(fingerprints=fingerprints, run=run))
+    finally:
+        writer.touch(stored_hashes)
+        writer.close()
+    contact_finder.link_jobs([result['job_hash'] for result in results])
+
+    # Jobs lost to a failing stage were not handled; normalize still gets raw jobs
+    failed_hashes = {item[0] if isinstance(item, tuple) else create_job_hash(item)
+                     for _, item in pipeline.failed()}
+    metrics.add("jobs", "failed", len(failed_hashes))
+
+    metrics.add("pipeline", "wall_seconds", pipeline.elapsed)
+    for stats in pipeline.stats():
+        for key in ("received", "emitted", "errors", "busy_seconds"):
+            metrics.add(f"pipeline:{stats['stage']}", key, stats[key])
+    metrics.add("contacts", "cache_hits", contact_finder.cache_hits)
+    metrics.add("contacts", "searches", contact_finder.searches)
+
+    print(f"\n🧬 Near-duplicates removed: {counts['batch_duplicates']} within this run, "
+          f"{counts['stored_duplicates']} already stored")
+    if prefilter.rejected:
+        print(f"🪓 Pre-filter: {prefilter.rejected} of {prefilter.checked} jobs dropped locally "
+              f"(saved {prefilter.rejected} LLM scorings, ~{counts['requests_saved']} OpenAI requests)")
+    if budget.deferred:
+        print(f"⏳ Run budget spent: {budget.deferred} new jobs deferred to the next run")
+    if failed_hashes:
+        print(f"❌ {len(failed_hashes)} jobs lost to failing pipeline stages - left for the next run")
+    if contact_finder.searches or contact_finder.cache_hits:
+        print(f"👥 Contacts: {contact_finder.cache_hits} companies from cache, {contact_finder.searches} LinkedIn searches")
+    score_stats = score_cache_stats()
+    if score_stats:
+        print(f"💾 Score cache: {score_stats['hits']} hits, {score_stats['misses']} misses")
+    print(f"⏱️ Pipeline finished in {pipeline.elapsed:.1f}s")
+    for stats in pipeline.stats():
+        print(f"  {stats['stage']:>9}: {stats['received']} in, {stats['emitted']} out, {stats['busy_seconds']:.1f}s busy")
+
+    return {
+        "results": results,
+        "seen_hashes": seen_hashes,
+        "deferred_hashes": deferred_hashes,
+        "failed_hashes": failed_hashes,
+        "stored_hashes": stored_hashes,
+        "stages": pipeline.stats(),
+    }
+
+
+def main(trigger=None):
+    metrics.reset()
+    started = time.monotonic()
+
+    # Jobs spooled by an earlier run that couldn't reach the database
+    replayed = replay_job_spool()
+    if replayed:
+        print(f"📥 Replayed {replayed} spooled jobs into the database")
+
+    # Existence checks are answered from memory for every job already stored
+    print(f"🗂️ Loaded {known_jobs.warm()} known job hashes")
+
+    # Queries whose results haven't changed since the last run are skipped outright
+    fingerprints = QueryFingerprints(get_db_connection)
+    fingerprints.load()
+
+    # Picks up an interrupted run from its checkpoints instead of starting over
+    search_run = SearchRun(get_db_connection, trigger or os.getenv("SEARCH_RUN_TRIGGER", "manual")).start()
+
+    scoring_started = datetime.now()
+    scoring_deadline = run_deadline()
+    try:
+        run = run_daily_pipeline(fingerprints, scoring_deadline, run=search_run)
+        search_run.reached("persisted")
+        if fingerprints.skipped:
+            print(f"⏭️ Skipped {fingerprints.skipped} unchanged queries")
+
+        final_results = run["results"]
+        new_jobs_count = len(final_results)
+        print(f"\n📊 Found {new_jobs_count} new jobs out of {len(run['seen_hashes'])} total opportunities")
+
+        # Deferred and failed jobs stay unhandled, so their queries are re-processed next run
+        fingerprints.commit(run["seen_hashes"] - run["deferred_hashes"] - run["failed_hashes"])
+
+        # Retry jobs earlier runs could not score, within what is left of the scoring deadline
+        rescored = rescore_pending_jobs(deadline=scoring_deadline, created_before=scoring_started)
+        if rescored:
+            print(f"🔁 Re-scored {rescored} previously pending jobs")
+    except Exception:
+        # Checkpoints are kept, so the next run resumes from here
+        metrics.add("run", "wall_seconds", time.monotonic() - started)
+        metrics.flush(get_db_connection, search_run.id)
+        search_run.finish("failed")
+        raise
+    metrics.add("run", "wall_seconds", time.monotonic() - started)
+    metrics.flush(get_db_connection, search_run.id)
+    # A run that lost jobs keeps its checkpoints so the next run resumes and retries them
+    search_run.finish("failed" if run["failed_hashes"] else "completed")
+    metrics.report()
     
     # Sort results by numeric score
     final_results.sort(key=lambda x: x['numeric_score'], reverse=True)
@@ -876,4 +1247,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,173 @@
+"""
+Append-only JSONL spool for jobs that could not be written to Postgres
+
+Each spooled job is one JSON line appended to JOB_SPOOL_PATH, so an offline
+run costs one small write per job instead of rewriting a growing JSON file.
+Lines are flushed to the OS immediately (a crash of this process loses
+nothing) and fsync'd in batches - every JOB_SPOOL_FSYNC_EVERY records,
+every JOB_SPOOL_FSYNC_SECONDS, and on close.
+
+replay() bulk-loads the spool into the jobs table with the same
+INSERT ... ON CONFLICT (job_hash) upsert the batch writer uses, so replaying
+the same records twice is harmless. The spool is renamed aside under a lock
+before it is read, so jobs spooled by a concurrent run land in a fresh file
+instead of being lost.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from psycopg2.extras import execute_values
+from job_writer import UPSERT_SQL, job_row
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; single-process use only there
+    fcntl = None
+
+JOB_SPOOL_PATH = os.getenv("JOB_SPOOL_PATH", "jobs_spool.jsonl")
+JOB_SPOOL_FSYNC_EVERY = int(os.getenv("JOB_SPOOL_FSYNC_EVERY", "50"))
+JOB_SPOOL_FSYNC_SECONDS = float(os.getenv("JOB_SPOOL_FSYNC_SECONDS", "1"))
+REPLAY_BATCH_SIZE = 500
+
+
+def read_spool(path):
+    """Spooled records in file order; a torn last line from a crash is skipped"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping unreadable spool line {line_number} in {path}")
+
+
+class JobSpool:
+    """Appends job records to a JSONL file with batched fsync"""
+
+    def __init__(self, path=None, fsync_every=None, fsync_seconds=None):
+        self.path = path or JOB_SPOOL_PATH
+        self.fsync_every = fsync_every or JOB_SPOOL_FSYNC_EVERY
+        self.fsync_seconds = JOB_SPOOL_FSYNC_SECONDS if fsync_seconds is None else fsync_seconds
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self.spooled = 0
+        atexit.register(self.close)
+
+    def _process_lock(self):
+        """Exclusive lock shared with other processes using the same spool"""
+        handle = open(self.path + ".lock", "a")
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _open(self):
+        # Reopen if replay() moved the file we were appending to
+        if self._file is not None:
+            try:
+                rotated = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                self._close_file()
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def append_many(self, records):
+        """Append job_data dicts; returns how many were spooled"""
+        if not records:
+            return 0
+        spooled_at = datetime.now().isoformat()
+        lines = "".join(json.dumps(dict(record, spooled_at=spooled_at), default=str) + "\n" for record in records)
+        with self._lock:
+            lock = self._process_lock()
+            try:
+                f = self._open()
+                f.write(lines)
+                f.flush()
+                self._unsynced += len(records)
+                if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_seconds:
+                    self._sync()
+            finally:
+                lock.close()
+            self.spooled += len(records)
+        return len(records)
+
+    def append(self, job_data):
+        return self.append_many([job_data])
+
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+    def replay(self, connect, batch_size=REPLAY_BATCH_SIZE):
+        """
+        Upsert every spooled job into the jobs table; returns jobs replayed.
+
+        All records load in one transaction keyed on job_hash (the last
+        spooled copy of a job wins). If the load fails the spooled file is
+        kept and picked up again by the next replay.
+        """
+        replaying = self.path + ".replaying"
+        with self._lock:
+            lock = self._process_lock()
+            try:
+                self._close_file()
+                if not os.path.exists(replaying) and os.path.exists(self.path):
+                    os.replace(self.path, replaying)
+            finally:
+                lock.close()
+
+        records = {}
+        for record in read_spool(replaying):
+            if record.get('job_hash'):
+                records[record['job_hash']] = record
+        if not records:
+            if os.path.exists(replaying):
+                os.remove(replaying)
+            return 0
+
+        conn = connect()
+        if not conn:
+            raise RuntimeError("No database configured to replay the job spool into")
+        try:
+            rows = [job_row(record, datetime.fromisoformat(record['spooled_at']) if record.get('spooled_at') else None) for record in records.values()]
+            with conn.cursor() as cur:
+                for start in range(0, len(rows), batch_size):
+                    batch = rows[start:start + batch_size]
+                    execute_values(cur, UPSERT_SQL, batch, page_size=len(batch))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        os.remove(replaying)
+        return len(records)
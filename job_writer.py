@@ -0,0 +1,186 @@
+"""
+Batched job writer
+
+Buffers job records and writes them with one multi-row
+INSERT ... ON CONFLICT (job_hash) DO UPDATE per flush (psycopg2's
+execute_values), so saving hundreds of jobs is a single transaction instead
+of a connection and commit per job. A buffer is flushed when it reaches
+max_rows, when a timer started by its first job fires after max_seconds
+(so a lone job never waits for the next add()), and on close. Batches that
+cannot be written go to the local JSONL spool (job_spool.py).
+
+Re-seen jobs only get last_seen and their score refreshed; a local
+'pending' estimate never overwrites a real LLM score.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from psycopg2.extras import execute_values
+from company_index import company_id
+
+JOB_WRITER_MAX_ROWS = int(os.getenv("JOB_WRITER_MAX_ROWS", "200"))
+JOB_WRITER_MAX_SECONDS = float(os.getenv("JOB_WRITER_MAX_SECONDS", "5"))
+
+INSERT_COLUMNS = [
+    "job_hash", "title", "company_name", "company_canonical", "location", "description",
+    "job_url", "match_score", "base_score", "location_bonus", "company_bonus", "match_rationale",
+    "ai_analysis", "score_status", "relevance_score", "contacts", "created_at", "last_seen", "status",
+]
+SCORE_COLUMNS = [
+    "match_score", "base_score", "location_bonus", "company_bonus", "match_rationale",
+    "ai_analysis", "score_status", "relevance_score",
+]
+
+# Keep a stored LLM score when the incoming one is only a local estimate
+_KEEP_STORED_SCORE = "EXCLUDED.score_status = 'pending' AND jobs.score_status = 'scored'"
+
+UPSERT_SQL = f"""
+    INSERT INTO jobs ({", ".join(INSERT_COLUMNS)})
+    VALUES %s
+    ON CONFLICT (job_hash) DO UPDATE SET
+        last_seen = EXCLUDED.last_seen,
+        {", ".join(f"{column} = CASE WHEN {_KEEP_STORED_SCORE} THEN jobs.{column} ELSE EXCLUDED.{column} END" for column in SCORE_COLUMNS)}
+"""
+
+
+def job_row(job_data, now=None):
+    """Values for INSERT_COLUMNS from a job_data dict"""
+    now = now or datetime.now()
+    return (
+        job_data['job_hash'],
+        job_data['title'],
+        job_data['company_name'],
+        company_id(job_data['company_name']),
+        job_data['location'],
+        job_data['description'],
+        job_data['job_url'],
+        job_data['match_score'],
+        job_data.get('base_score'),
+        job_data.get('location_bonus'),
+        job_data.get('company_bonus'),
+        job_data.get('match_rationale'),
+        job_data['ai_analysis'],
+        job_data.get('score_status', 'scored'),
+        job_data.get('relevance_score'),
+        json.dumps(job_data['contacts']),
+        now,
+        now,
+        'new',
+    )
+
+
+class JobBatchWriter:
+    """Buffers job_data dicts and upserts them in batches"""
+
+    def __init__(self, connect, spool, max_rows=None, max_seconds=None, on_saved=None):
+        """
+        Args:
+            connect: callable returning a DB connection (or None when offline)
+            spool: JobSpool for batches that could not be written
+            max_rows: flush once this many jobs are buffered
+            max_seconds: flush once the oldest buffered job is this old
+            on_saved: optional callable(job_hashes) after a successful flush
+        """
+        self.connect = connect
+        self.spool = spool
+        self.max_rows = max_rows or JOB_WRITER_MAX_ROWS
+        self.max_seconds = JOB_WRITER_MAX_SECONDS if max_seconds is None else max_seconds
+        self.on_saved = on_saved
+        self.buffer = {}            # job_hash -> job_data (last write wins within a batch)
+        self.first_buffered = None
+        self.written = 0
+        self.flushes = 0
+        self._lock = threading.Lock()
+        self._timer = None          # Flushes the buffer max_seconds after its first job
+
+    def add(self, job_data):
+        with self._lock:
+            if not self.buffer:
+                self.first_buffered = time.monotonic()
+                self._timer = threading.Timer(self.max_seconds, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+            self.buffer[job_data['job_hash']] = job_data
+            full = len(self.buffer) >= self.max_rows or time.monotonic() - self.first_buffered >= self.max_seconds
+        if full:
+            self.flush()
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"⚠️ Timed job writer flush failed: {e}")
+
+    def flush(self):
+        """Write everything buffered in one transaction; returns rows written"""
+        with self._lock:
+            if not self.buffer:
+                return 0
+            batch, self.buffer = list(self.buffer.values()), {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        try:
+            conn = self.connect()
+        except Exception as e:
+            print(f"Database unavailable: {e}")
+            conn = None
+        if not conn:
+            print(f"No database connection - spooled {self.spool.append_many(batch)} jobs to {self.spool.path}")
+            return 0
+
+        try:
+            now = datetime.now()
+            with conn.cursor() as cur:
+                execute_values(cur, UPSERT_SQL, [job_row(job_data, now) for job_data in batch], page_size=len(batch))
+            conn.commit()
+        except Exception as e:
+            print(f"Database error: {e} - spooled {self.spool.append_many(batch)} jobs to {self.spool.path}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+
+        self.written += len(batch)
+        self.flushes += 1
+        if self.on_saved:
+            self.on_saved([job_data['job_hash'] for job_data in batch])
+        return len(batch)
+
+    def touch(self, job_hashes):
+        """Bump last_seen for stored jobs seen again in this run"""
+        if not job_hashes:
+            return 0
+        conn = self.connect()
+        if not conn:
+            return 0
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE jobs SET last_seen = CURRENT_TIMESTAMP WHERE job_hash = ANY(%s)",
+                    (list(job_hashes),)
+                )
+                touched = cur.rowcount
+            conn.commit()
+            return touched
+        except Exception as e:
+            print(f"⚠️ Could not update last_seen: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+
+    def close(self):
+        written = self.flush()
+        self.spool.sync()
+        return written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
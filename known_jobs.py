@@ -0,0 +1,85 @@
+"""
+In-process set of stored job hashes
+
+Answers "is this job already in the database?" for a whole batch at once:
+hashes the set already knows are settled in memory, and the rest are
+checked in a single job_hash = ANY(%s) query. The set is warmed from the
+jobs table once per process and updated as jobs are saved, so dedup costs
+one round trip per run instead of one connection per job.
+"""
+
+import threading
+
+
+class KnownJobHashes:
+    """Job hashes known to be stored in the jobs table"""
+
+    def __init__(self, connect):
+        """
+        Args:
+            connect: callable returning a DB connection (or None when offline)
+        """
+        self.connect = connect
+        self.hashes = set()
+        self.warmed = False
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Load every stored job hash; returns how many are known"""
+        conn = self.connect()
+        if not conn:
+            return 0
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT job_hash FROM jobs")
+                hashes = {row[0] for row in cur.fetchall()}
+        finally:
+            conn.close()
+        with self._lock:
+            self.hashes |= hashes
+            self.warmed = True
+        return len(self.hashes)
+
+    def filter_new(self, job_hashes):
+        """
+        The hashes from job_hashes that are not stored yet, in input order.
+
+        Database errors propagate - treating a failed check as "new" would
+        re-score and re-insert jobs that already exist. With no database
+        configured every unknown hash counts as new.
+        """
+        if not self.warmed:
+            self.warm()
+        with self._lock:
+            unknown = list(dict.fromkeys(h for h in job_hashes if h not in self.hashes))
+        if not unknown:
+            return []
+
+        conn = self.connect()
+        if conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT job_hash FROM jobs WHERE job_hash = ANY(%s)", (unknown,))
+                    stored = {row[0] for row in cur.fetchall()}
+            finally:
+                conn.close()
+            with self._lock:
+                self.hashes |= stored
+            unknown = [h for h in unknown if h not in stored]
+
+        unknown = set(unknown)
+        return [h for h in job_hashes if h in unknown]
+
+    def add(self, job_hash):
+        with self._lock:
+            self.hashes.add(job_hash)
+
+    def update(self, job_hashes):
+        with self._lock:
+            self.hashes.update(job_hashes)
+
+    def __contains__(self, job_hash):
+        return job_hash in self.hashes
+
+    def __len__(self):
+        return len(self.hashes)
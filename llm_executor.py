@@ -0,0 +1,130 @@
+"""
+Bounded-concurrency async OpenAI chat completions
+
+AsyncCompletionExecutor runs many chat completions at once, capped by a
+semaphore, retries rate-limit/transient errors with exponential backoff and
+full jitter, and stops starting or waiting on calls once the run deadline
+has passed. A call that still fails returns None so the caller can mark the
+job for re-scoring instead of inventing a score.
+
+A client the executor creates is bound to the running event loop, so close
+the executor (or use it as an async context manager) before that loop ends.
+"""
+
+import asyncio
+import os
+import random
+import time
+import openai
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+from run_metrics import metrics
+
+load_dotenv()
+
+SCORING_CONCURRENCY = int(os.getenv("SCORING_CONCURRENCY", "4"))
+SCORING_MAX_RETRIES = int(os.getenv("SCORING_MAX_RETRIES", "5"))
+SCORING_RUN_DEADLINE = float(os.getenv("SCORING_RUN_DEADLINE", "180"))  # Seconds for all scoring in one run
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# Worth retrying: the same request may well succeed a little later
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def run_deadline(seconds=None):
+    """Absolute monotonic deadline for a run starting now"""
+    return time.monotonic() + (SCORING_RUN_DEADLINE if seconds is None else seconds)
+
+
+class AsyncCompletionExecutor:
+    """Runs chat completions concurrently within one run's deadline"""
+
+    def __init__(self, concurrency=None, deadline=None, max_retries=None, client=None):
+        """
+        Args:
+            concurrency: max requests in flight
+            deadline: time.monotonic() value after which no call is started or awaited
+            max_retries: retries per request on RETRYABLE_ERRORS
+            client: AsyncOpenAI client (one is created for the running loop if omitted)
+        """
+        self.concurrency = concurrency or SCORING_CONCURRENCY
+        self.deadline = deadline if deadline is not None else run_deadline()
+        self.max_retries = SCORING_MAX_RETRIES if max_retries is None else max_retries
+        self._owns_client = client is None
+        self.client = client or AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP client if this executor created it"""
+        if self._owns_client:
+            await self.client.close()
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    async def _create_with_backoff(self, request):
+        stage = f"openai:{request.get('model', 'unknown')}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.calls += 1
+                metrics.add(stage, "calls")
+                started = time.monotonic()
+                completion = await self.client.chat.completions.create(**request)
+                metrics.add(stage, "call_seconds", time.monotonic() - started)
+                # Token usage as billed, from the response itself
+                usage = getattr(completion, "usage", None)
+                if usage is not None:
+                    metrics.add(stage, "prompt_tokens", usage.prompt_tokens or 0)
+                    metrics.add(stage, "completion_tokens", usage.completion_tokens or 0)
+                return completion
+            except RETRYABLE_ERRORS as e:
+                delay = backoff_delay(attempt)
+                if attempt == self.max_retries or delay >= self.remaining():
+                    raise
+                self.retries += 1
+                metrics.add(stage, "retries")
+                print(f"⏳ OpenAI {type(e).__name__}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def complete(self, **request):
+        """One chat completion, or None if it failed or ran past the deadline"""
+        stage = f"openai:{request.get('model', 'unknown')}"
+        async with self._semaphore:
+            remaining = self.remaining()
+            if remaining <= 0:
+                self.failures += 1
+                metrics.add(stage, "failures")
+                return None
+            try:
+                return await asyncio.wait_for(self._create_with_backoff(request), remaining)
+            except asyncio.TimeoutError:
+                print("⏰ OpenAI call abandoned at the scoring deadline")
+            except Exception as e:
+                print(f"Error getting AI match score: {e}")
+            self.failures += 1
+            metrics.add(stage, "failures")
+            return None
+
+    async def map(self, requests):
+        """Run many completions concurrently; results in request order"""
+        return await asyncio.gather(*(self.complete(**request) for request in requests))
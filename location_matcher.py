@@ -0,0 +1,95 @@
+"""
+Compiled location matcher for location priority scoring
+
+Builds one word-boundary regex from the profile's location_priority_weights
+plus common aliases, instead of substring-testing every keyword per call.
+Two-letter codes ("CO", "OR", "LA", "WA") only match as standalone
+upper-case tokens, so "Remote or hybrid" no longer scores as Oregon and
+"Chicago" no longer matches "ca". Scores are memoized per location string.
+"""
+
+import re
+from functools import lru_cache
+
+# Common variations and keywords for each base location
+LOCATION_ALIASES = {
+    'remote': ['remote', 'work from home', 'anywhere', 'distributed'],
+    'seattle': ['seattle', 'wa', 'washington'],
+    'bellevue': ['bellevue'],
+    'kirkland': ['kirkland'],
+    'redmond': ['redmond'],
+    'eastside': ['eastside', 'east side'],
+    'san francisco': ['san francisco', 'sf', 'bay area', 'silicon valley'],
+    'new york': ['new york', 'nyc', 'brooklyn', 'queens', 'bronx'],
+    'austin': ['austin', 'tx', 'texas'],
+    'denver': ['denver', 'co', 'colorado'],
+    'boston': ['boston', 'ma', 'massachusetts', 'cambridge'],
+    'los angeles': ['los angeles', 'la', 'california', 'ca'],
+    'portland': ['portland', 'or', 'oregon'],
+    'vancouver': ['vancouver', 'bc', 'british columbia']
+}
+
+CODE_MAX_LENGTH = 2   # Terms this short are treated as state/city codes
+
+
+class LocationMatcher:
+    """Scores location strings against a weights dict in a single regex pass"""
+
+    def __init__(self, weights, aliases=LOCATION_ALIASES):
+        self.weights = dict(weights)
+
+        # term -> (priority, weight); explicit weight keys beat aliases, earlier beats later
+        self.terms = {}
+        for rank, (location_key, weight) in enumerate(self.weights.items()):
+            self.terms.setdefault(location_key.lower(), (rank, weight))
+        offset = len(self.terms)
+        for rank, (base_location, keywords) in enumerate(aliases.items()):
+            for keyword in keywords:
+                self.terms.setdefault(keyword.lower(), (offset + rank, self.weights.get(base_location, 0)))
+
+        words = sorted((t for t in self.terms if len(t) > CODE_MAX_LENGTH), key=len, reverse=True)
+        codes = sorted(t for t in self.terms if len(t) <= CODE_MAX_LENGTH)
+        self._word_re = re.compile(
+            r"(?<![a-z0-9])(" + "|".join(re.escape(t) for t in words) + r")(?![a-z0-9])"
+        ) if words else None
+        self._code_re = re.compile(
+            r"(?<![A-Za-z0-9])(" + "|".join(re.escape(t.upper()) for t in codes) + r")(?![A-Za-z0-9])"
+        ) if codes else None
+
+        self._score_cached = lru_cache(maxsize=16384)(self._score)
+
+    def _score(self, location):
+        best = None
+        if self._word_re is not None:
+            for match in self._word_re.finditer(location.lower()):
+                candidate = self.terms[match.group(1)]
+                if best is None or candidate[0] < best[0]:
+                    best = candidate
+        if self._code_re is not None:
+            for match in self._code_re.finditer(location):
+                candidate = self.terms[match.group(1).lower()]
+                if best is None or candidate[0] < best[0]:
+                    best = candidate
+        return best[1] if best else 0  # No location bonus/penalty
+
+    def score(self, location):
+        """Priority weight for one location string"""
+        if not location:
+            return 0
+        return self._score_cached(" ".join(location.split()))
+
+    def score_many(self, locations):
+        """Scores for a batch of locations, in input order"""
+        return [self.score(location) for location in locations]
+
+
+_matchers = {}
+
+
+def get_location_matcher(weights):
+    """Matcher compiled once per distinct weights dict"""
+    key = tuple(weights.items())
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = _matchers[key] = LocationMatcher(weights)
+    return matcher
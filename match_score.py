@@ -0,0 +1,117 @@
+"""
+Structured match scores
+
+The LLM returns base_score and rationale through a function call; the
+location and company bonuses are computed locally. MatchScore keeps the
+parts separate so they can be stored as their own jobs columns and
+re-weighted in SQL, and renders the familiar "Score: N - ..." text for
+ai_analysis.
+"""
+
+import json
+
+# Function-calling schema the scorer must answer with
+SCORE_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "record_job_scores",
+        "description": "Record the base fit score and rationale for each job",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "job": {"type": "integer", "description": "Job number from the prompt"},
+                            "score": {"type": "integer", "minimum": 0, "maximum": 100},
+                            "rationale": {"type": "string", "description": "2-3 sentences"},
+                        },
+                        "required": ["job", "score", "rationale"],
+                    },
+                },
+            },
+            "required": ["results"],
+        },
+    },
+}
+
+
+class MatchScore:
+    """Base score from the model plus locally computed bonuses"""
+
+    def __init__(self, base_score, location_bonus=0, company_bonus=0, rationale="", status="scored"):
+        self.base_score = max(0, min(100, int(base_score)))
+        self.location_bonus = int(location_bonus)
+        self.company_bonus = int(company_bonus)
+        self.rationale = rationale or ""
+        self.status = status   # 'scored' by the LLM, or 'pending' when only a local estimate
+
+    @property
+    def total(self):
+        return max(0, min(100, self.base_score + self.location_bonus + self.company_bonus))  # Clamp between 0-100
+
+    def summary(self):
+        """Human-readable analysis stored in jobs.ai_analysis"""
+        text = f"Score: {self.total} - {self.rationale}"
+        if self.company_bonus > 0:
+            return text + f" [Base: {self.base_score}, Location: {self.location_bonus:+d}, Company: {self.company_bonus:+d}]"
+        return text + f" [Base: {self.base_score}, Location: {self.location_bonus:+d}]"
+
+    def columns(self):
+        """jobs table columns for this score"""
+        return {
+            'match_score': self.total,
+            'base_score': self.base_score,
+            'location_bonus': self.location_bonus,
+            'company_bonus': self.company_bonus,
+            'match_rationale': self.rationale,
+            'ai_analysis': self.summary(),
+            'score_status': self.status,
+        }
+
+    def to_dict(self):
+        return {
+            'base_score': self.base_score,
+            'location_bonus': self.location_bonus,
+            'company_bonus': self.company_bonus,
+            'rationale': self.rationale,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['base_score'], data['location_bonus'], data['company_bonus'], data['rationale'])
+
+    def __repr__(self):
+        return f"MatchScore(total={self.total}, base={self.base_score}, status={self.status!r})"
+
+
+def parse_score_results(message):
+    """
+    {job number: (base score, rationale)} from a chat completion message.
+
+    Reads the record_job_scores tool call, falling back to a JSON object in
+    the message content for models that answer in text.
+    """
+    payloads = []
+    for call in getattr(message, 'tool_calls', None) or []:
+        payloads.append(call.function.arguments)
+    if not payloads and message.content:
+        content = message.content
+        start, end = content.find('{'), content.rfind('}')
+        if start != -1 and end != -1:
+            payloads.append(content[start:end + 1])
+
+    scores = {}
+    for payload in payloads:
+        try:
+            results = json.loads(payload).get('results', [])
+        except (json.JSONDecodeError, AttributeError):
+            continue
+        for item in results:
+            try:
+                scores[int(item['job'])] = (int(item['score']), str(item.get('rationale', '')).strip())
+            except (KeyError, TypeError, ValueError):
+                continue
+    return scores
@@ -0,0 +1,204 @@
+"""
+Streaming staged pipeline
+
+Items flow from a source iterable through a chain of stages connected by
+bounded queues. Each stage has its own worker threads and hands its function
+a batch of items (up to batch_size, waiting at most max_wait seconds to fill
+it), so bulk steps like existence checks and LLM scoring still batch while
+upstream stages keep producing. A full queue blocks the stage feeding it, so
+memory stays bounded and slow stages apply back-pressure instead of piling
+up work.
+
+A batch whose stage function raises is logged and kept on the stage's
+failed list instead of being passed on, so the caller can tell which items
+the run did not handle. A source that raises ends the stream: everything
+it yielded so far is still processed, then run() re-raises its error so
+the caller can treat the run as failed.
+"""
+
+import os
+import queue
+import threading
+import time
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "200"))
+
+_DONE = object()   # End-of-stream marker passed between stages
+
+
+class Stage:
+    """One pipeline step: fn(list of items) -> iterable of items for the next stage"""
+
+    def __init__(self, name, fn, workers=1, batch_size=1, max_wait=0.0):
+        """
+        Args:
+            name: label used in stats and error messages
+            fn: callable(batch) returning the items to pass on (any number)
+            workers: threads running fn concurrently; use 1 for stateful steps
+            batch_size: most items handed to fn at once
+            max_wait: seconds to wait for a batch to fill before running it
+        """
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.received = 0
+        self.emitted = 0
+        self.batches = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.failed = []      # Items of batches fn raised on
+        self._lock = threading.Lock()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "stage": self.name,
+                "workers": self.workers,
+                "received": self.received,
+                "emitted": self.emitted,
+                "batches": self.batches,
+                "errors": self.errors,
+                "busy_seconds": round(self.busy_seconds, 3),
+            }
+
+
+class Pipeline:
+    """Runs a source through stages on threads connected by bounded queues"""
+
+    def __init__(self, stages, queue_size=None):
+        self.stages = list(stages)
+        self.queue_size = queue_size or PIPELINE_QUEUE_SIZE
+        self.elapsed = 0.0
+        self.source_error = None
+
+    def _next_batch(self, stage, inbox):
+        """Up to batch_size items, plus whether the stream has ended"""
+        item = inbox.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + stage.max_wait
+        while len(batch) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = inbox.get(timeout=remaining) if remaining > 0 else inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _work(self, stage, inbox, outbox, running):
+        done = False
+        while not done:
+            batch, done = self._next_batch(stage, inbox)
+            if not batch:
+                continue
+            started = time.monotonic()
+            try:
+                outputs = list(stage.fn(batch) or [])
+            except Exception as e:
+                print(f"  ❌ Pipeline stage {stage.name} failed on {len(batch)} items: {e}")
+                outputs = []
+                with stage._lock:
+                    stage.errors += 1
+                    stage.failed.extend(batch)
+            with stage._lock:
+                stage.received += len(batch)
+                stage.emitted += len(outputs)
+                stage.batches += 1
+                stage.busy_seconds += time.monotonic() - started
+            for output in outputs:
+                outbox.put(output)
+
+        # Let sibling workers see the end of the stream; the last one passes it on
+        inbox.put(_DONE)
+        with running["lock"]:
+            running[stage.name] -= 1
+            last = running[stage.name] == 0
+        if last:
+            outbox.put(_DONE)
+
+    def _feed(self, source, outbox):
+        try:
+            for item in source:
+                outbox.put(item)
+        except Exception as e:
+            print(f"  ❌ Pipeline source failed: {e}")
+            self.source_error = e
+        finally:
+            outbox.put(_DONE)
+
+    def run(self, source):
+        """
+        Push every item of source through the stages; returns the last
+        stage's outputs, or raises the source's exception once what it
+        yielded before failing has gone through.
+        """
+        started = time.monotonic()
+        self.source_error = None
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        running = {"lock": threading.Lock()}
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0]), name="pipeline-source", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            running[stage.name] = stage.workers
+            for worker in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work, args=(stage, queues[index], queues[index + 1], running),
+                    name=f"pipeline-{stage.name}-{worker}", daemon=True,
+                ))
+        for thread in threads:
+            thread.start()
+
+        results = []
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                break
+            results.append(item)
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.monotonic() - started
+        if self.source_error is not None:
+            raise self.source_error
+        return results
+
+    def stats(self):
+        return [stage.stats() for stage in self.stages]
+
+    def failed(self):
+        """(stage name, item) for every item in a batch that failed"""
+        return [(stage.name, item) for stage in self.stages for item in stage.failed]
+
+
+class RunBudget:
+    """How many jobs a run may push through its expensive stages, and until when"""
+
+    def __init__(self, max_jobs, deadline=None):
+        """
+        Args:
+            max_jobs: most jobs admitted (None = unlimited)
+            deadline: time.monotonic() value after which nothing is admitted
+        """
+        self.max_jobs = max_jobs
+        self.deadline = deadline
+        self.admitted = 0
+        self.deferred = 0
+        self._lock = threading.Lock()
+
+    def admit(self, items):
+        """Split items into (admitted, deferred) against what is left of the budget"""
+        with self._lock:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                room = 0
+            elif self.max_jobs is None:
+                room = len(items)
+            else:
+                room = max(0, self.max_jobs - self.admitted)
+            admitted, deferred = items[:room], items[room:]
+            self.admitted += len(admitted)
+            self.deferred += len(deferred)
+        return admitted, deferred
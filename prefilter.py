@@ -0,0 +1,109 @@
+"""
+Local pre-filter in front of LLM scoring
+
+A cascade of cheap checks that drops obvious misses before they cost an
+OpenAI call:
+
+1. Title relevance - no overlap with the profile's title_keywords is a reject
+2. Avoid list - a user_profile['avoid'] industry in the title or company is a reject
+3. Local score - title match + seniority + location and target-company
+   bonuses must reach the threshold
+
+Everything that survives goes on to match_job_to_user as before.
+"""
+
+import os
+import re
+from dedup import normalize_title_tokens
+
+PREFILTER_THRESHOLD = int(os.getenv("PREFILTER_THRESHOLD", "30"))
+
+TITLE_MATCH_POINTS = 40          # Whole title keyword present
+PARTIAL_MATCH_MIN = 0.5          # Share of a keyword's tokens needed for partial credit
+SENIORITY_POINTS = 20
+
+SENIOR_TOKENS = {"senior", "principal", "staff", "lead", "head", "director", "vice", "president", "chief", "founding", "group", "general"}
+JUNIOR_TOKENS = {"junior", "associate", "intern", "internship", "entry", "apprentice", "graduate", "apm"}
+
+
+def _contains_sequence(tokens, sequence):
+    width = len(sequence)
+    return any(tokens[i:i + width] == sequence for i in range(len(tokens) - width + 1))
+
+
+class LocalPrefilter:
+    """Scores jobs locally and splits them into LLM candidates and rejects"""
+
+    def __init__(self, user_profile, job_bonuses, threshold=None):
+        """
+        Args:
+            user_profile: profile with title_keywords and avoid lists
+            job_bonuses: callable(job) -> (location bonus, target company bonus)
+            threshold: minimum local score to go on to the LLM
+        """
+        self.threshold = PREFILTER_THRESHOLD if threshold is None else threshold
+        self.job_bonuses = job_bonuses
+        self.keywords = [normalize_title_tokens(k) for k in user_profile.get('title_keywords', [])]
+        self.keywords = [k for k in self.keywords if k]
+        avoid = user_profile.get('avoid', [])
+        self._avoid_re = re.compile(
+            r"(?<![a-z0-9])(" + "|".join(re.escape(term.lower()) for term in avoid) + r")(?![a-z0-9])"
+        ) if avoid else None
+        self.checked = 0
+        self.rejected = 0
+
+    def title_score(self, title_tokens):
+        best = 0.0
+        for keyword in self.keywords:
+            if _contains_sequence(title_tokens, keyword):
+                return TITLE_MATCH_POINTS
+            # Seniority words alone ("Staff Engineer" vs "chief of staff") earn no title credit
+            overlap = len((set(keyword) & set(title_tokens)) - SENIOR_TOKENS) / len(set(keyword))
+            if overlap >= PARTIAL_MATCH_MIN:
+                best = max(best, overlap)
+        return int(TITLE_MATCH_POINTS * best / 2)
+
+    def seniority_score(self, title_tokens):
+        tokens = set(title_tokens)
+        if tokens & JUNIOR_TOKENS:
+            return -SENIORITY_POINTS
+        if tokens & SENIOR_TOKENS:
+            return SENIORITY_POINTS
+        return 0
+
+    def avoid_hits(self, job):
+        if self._avoid_re is None:
+            return []
+        text = f"{job.get('title', '')} | {job.get('company_name', '')}".lower()
+        return sorted(set(self._avoid_re.findall(text)))
+
+    def evaluate(self, job):
+        """(local score, reason) - reason is None when the job should go to the LLM"""
+        title_tokens = normalize_title_tokens(job.get('title', ''))
+
+        title_points = self.title_score(title_tokens)
+        if title_points == 0:
+            return 0, "no title keyword match"
+
+        hits = self.avoid_hits(job)
+        if hits:
+            return 0, f"avoid list: {', '.join(hits)}"
+
+        location_bonus, company_bonus = self.job_bonuses(job)
+        score = title_points + self.seniority_score(title_tokens) + location_bonus + company_bonus
+        if score < self.threshold:
+            return score, f"local score {score} < {self.threshold}"
+        return score, None
+
+    def split(self, jobs):
+        """Split jobs into (candidates, [(job, score, reason), ...] rejects)"""
+        candidates, rejects = [], []
+        for job in jobs:
+            score, reason = self.evaluate(job)
+            if reason is None:
+                candidates.append(job)
+            else:
+                rejects.append((job, score, reason))
+        self.checked += len(jobs)
+        self.rejected += len(rejects)
+        return candidates, rejects
@@ -0,0 +1,97 @@
+"""
+Result-set fingerprints for search queries
+
+Each query's results are reduced to a hash of their sorted job IDs/URLs.
+When a query returns exactly the same set as the last fully processed run,
+its whole batch can be skipped before dedupe, existence checks and scoring.
+"""
+
+import hashlib
+
+
+def job_identity(job):
+    """Most stable identifier available for a raw search result"""
+    return (
+        job.get('job_id')
+        or job.get('job_url')
+        or job.get('source_url')
+        or f"{job.get('company_name', '')}|{job.get('title', '')}|{job.get('location', '')}"
+    )
+
+
+def fingerprint_jobs(jobs):
+    """Order-independent hash of a result set"""
+    identities = sorted({str(job_identity(job)) for job in jobs})
+    return hashlib.sha256("\n".join(identities).encode()).hexdigest()
+
+
+class QueryFingerprints:
+    """Loads stored fingerprints and saves new ones once their batch is handled"""
+
+    def __init__(self, connect):
+        self.connect = connect
+        self.stored = {}
+        self.staged = {}   # (source, query) -> (fingerprint, job hashes, result count)
+        self.skipped = 0
+
+    def load(self):
+        conn = self.connect()
+        if not conn:
+            return self.stored
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT source, query, fingerprint FROM query_fingerprints")
+                self.stored = {(source, query): fp for source, query, fp in cur.fetchall()}
+        except Exception as e:
+            print(f"⚠️ Could not load query fingerprints: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+        return self.stored
+
+    def check(self, source, query, jobs, job_hashes):
+        """
+        True when this query's results are unchanged since the last handled run.
+
+        Changed result sets are staged and only saved by commit() once every
+        job in them has been handled, so a run that stops early never hides
+        jobs it did not get to.
+        """
+        key = (source, str(query))
+        fp = fingerprint_jobs(jobs)
+        if jobs and self.stored.get(key) == fp:
+            self.skipped += 1
+            return True
+        self.staged[key] = (fp, set(job_hashes), len(jobs))
+        return False
+
+    def commit(self, handled_hashes):
+        """Save fingerprints of batches whose jobs were all handled this run"""
+        rows = [
+            (source, query, fp, count)
+            for (source, query), (fp, hashes, count) in self.staged.items()
+            if hashes <= handled_hashes
+        ]
+        if not rows:
+            return 0
+        conn = self.connect()
+        if not conn:
+            return 0
+        try:
+            with conn.cursor() as cur:
+                cur.executemany("""
+                    INSERT INTO query_fingerprints (source, query, fingerprint, result_count, updated_at)
+                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (source, query) DO UPDATE SET
+                        fingerprint = EXCLUDED.fingerprint,
+                        result_count = EXCLUDED.result_count,
+                        updated_at = EXCLUDED.updated_at
+                """, rows)
+            conn.commit()
+        except Exception as e:
+            print(f"⚠️ Could not save query fingerprints: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+        return len(rows)
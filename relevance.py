@@ -0,0 +1,124 @@
+"""
+Local relevance model for job/profile fit
+
+A deterministic, CPU-only scorer used where an LLM score is unavailable and
+as an extra ranking feature. Job titles and descriptions are turned into
+hashed TF-IDF vectors (unigrams + bigrams, titles weighted up) and compared
+with a profile vector built from title_keywords, industries and background;
+avoid-list terms pull the score down. Jobs with little text (a bare title,
+no description) are shrunk toward 0, since a two-word title can match the
+profile perfectly without saying much. All vector math runs in NumPy over a
+whole batch at once, so thousands of jobs score per second.
+"""
+
+import re
+import zlib
+from functools import lru_cache
+import numpy as np
+
+HASH_BITS = 18
+HASH_DIM = 1 << HASH_BITS
+TITLE_WEIGHT = 3            # Title terms count this many times over description terms
+DESCRIPTION_CHARS = 2000
+AVOID_PENALTY = 1.5         # Weight of avoid-list similarity subtracted from profile similarity
+SIMILARITY_FULL_MARKS = 0.6   # Cosine similarity that maps to a relevance of 100
+FULL_EVIDENCE_TERMS = 40      # Distinct terms a job needs before its score is not dampened
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+    "or", "our", "the", "this", "to", "we", "will", "with", "you", "your",
+}
+
+
+def _terms(text):
+    tokens = [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash(term):
+    return zlib.crc32(term.encode()) & (HASH_DIM - 1)
+
+
+def job_terms(job):
+    """Hashed term counts for a job: {feature index: count}"""
+    counts = {}
+    for term in _terms(job.get('title', '')):
+        index = _hash(term)
+        counts[index] = counts.get(index, 0) + TITLE_WEIGHT
+    for term in _terms((job.get('description') or '')[:DESCRIPTION_CHARS]):
+        index = _hash(term)
+        counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+def _text_vector(texts):
+    vector = np.zeros(HASH_DIM, dtype=np.float32)
+    for text in texts:
+        for term in _terms(text):
+            vector[_hash(term)] += 1.0
+    return vector
+
+
+class RelevanceModel:
+    """Hashed TF-IDF similarity between jobs and one user profile"""
+
+    def __init__(self, user_profile):
+        self.profile_vector = _text_vector(
+            list(user_profile.get('title_keywords', [])) * TITLE_WEIGHT
+            + list(user_profile.get('industries', []))
+            + [user_profile.get('background', ''), user_profile.get('experience_level', '')]
+        )
+        self.avoid_vector = _text_vector(user_profile.get('avoid', []))
+        self.idf = None   # Uniform until fit()
+
+    def fit(self, jobs):
+        """Learn IDF weights from a corpus of jobs (e.g. the whole jobs table)"""
+        df = np.zeros(HASH_DIM, dtype=np.float32)
+        for job in jobs:
+            df[list(job_terms(job))] += 1.0
+        self.idf = np.log((1.0 + len(jobs)) / (1.0 + df)).astype(np.float32) + 1.0
+        return self
+
+    def _weighted(self, vector):
+        weighted = vector * self.idf if self.idf is not None else vector
+        norm = np.linalg.norm(weighted)
+        return weighted / norm if norm else weighted
+
+    def similarities(self, jobs):
+        """(profile similarity, avoid similarity, distinct terms) arrays, one entry per job"""
+        if not jobs:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        # Sparse batch as flat (job, feature, count) arrays
+        rows, cols, counts = [], [], []
+        for row, job in enumerate(jobs):
+            terms = job_terms(job)
+            rows.extend([row] * len(terms))
+            cols.extend(terms.keys())
+            counts.extend(terms.values())
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.log1p(np.asarray(counts, dtype=np.float32))   # Sublinear TF
+        if self.idf is not None:
+            values *= self.idf[cols]
+
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(jobs)))
+        norms[norms == 0] = 1.0
+
+        profile = self._weighted(self.profile_vector)
+        avoid = self._weighted(self.avoid_vector)
+        profile_sim = np.bincount(rows, weights=values * profile[cols], minlength=len(jobs)) / norms
+        avoid_sim = np.bincount(rows, weights=values * avoid[cols], minlength=len(jobs)) / norms
+        return profile_sim, avoid_sim, np.bincount(rows, minlength=len(jobs))
+
+    def score_many(self, jobs):
+        """0-100 relevance per job, in input order"""
+        profile_sim, avoid_sim, terms = self.similarities(jobs)
+        relevance = (profile_sim - AVOID_PENALTY * avoid_sim) / SIMILARITY_FULL_MARKS
+        relevance *= np.minimum(1.0, terms / FULL_EVIDENCE_TERMS)
+        return np.clip(np.rint(relevance * 100), 0, 100).astype(int).tolist()
+
+    def score(self, job):
+        return self.score_many([job])[0]
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Replay the local job spool into Postgres
+Loads jobs that were spooled to jobs_spool.jsonl while the database was
+unavailable. Upserts are keyed on job_hash, so running it twice is safe.
+"""
+
+import sys
+import time
+from job_search_agent import job_spool, get_db_connection
+
+if __name__ == "__main__":
+    started = time.time()
+    try:
+        replayed = job_spool.replay(get_db_connection)
+    except Exception as e:
+        print(f"❌ Replay failed, spool kept for the next attempt: {e}")
+        sys.exit(1)
+    print(f"📥 Replayed {replayed} spooled jobs in {time.time() - started:.1f}s")
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Offline re-ranking of the jobs table
+Recomputes relevance_score for every stored job with the local relevance
+model - run after changing user_profile. No API credits are used.
+"""
+
+import time
+from job_search_agent import rerank_jobs_table
+
+if __name__ == "__main__":
+    started = time.time()
+    updated = rerank_jobs_table()
+    print(f"📊 Re-ranked {updated} jobs in {time.time() - started:.1f}s")
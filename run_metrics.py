@@ -0,0 +1,126 @@
+"""
+Per-run instrumentation
+
+A process-wide collector of (stage, metric) -> value counters: wall time per
+pipeline stage and search source, upstream calls, cache hits, OpenAI token
+usage from each completion's usage block, SerpAPI credits, and how many jobs
+were new vs duplicates. Modules record into the shared `metrics` instance;
+the daily run resets it when it starts and flushes it into the run_metrics
+table against its search_runs row.
+
+Flushes write only what changed since the previous flush and add it to the
+stored value, so an interrupted run that is resumed accumulates the total
+cost of all its attempts.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+METRICS_FLUSH_SECONDS = 15
+
+
+class RunMetrics:
+    """Thread-safe counters keyed by (stage, metric)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._values = defaultdict(float)
+            self._flushed = {}
+            self._last_flush = time.monotonic()
+
+    def add(self, stage, metric, value=1):
+        with self._lock:
+            self._values[(stage, metric)] += value
+
+    def set(self, stage, metric, value):
+        with self._lock:
+            self._values[(stage, metric)] = value
+
+    def get(self, stage, metric):
+        with self._lock:
+            return self._values.get((stage, metric), 0)
+
+    @contextmanager
+    def timer(self, stage, metric="wall_seconds"):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(stage, metric, time.monotonic() - started)
+
+    def snapshot(self):
+        """{stage: {metric: value}}"""
+        with self._lock:
+            values = dict(self._values)
+        stages = {}
+        for (stage, metric), value in sorted(values.items()):
+            stages.setdefault(stage, {})[metric] = value
+        return stages
+
+    def flush(self, connect, run_id, min_interval=0):
+        """
+        Add changes since the last flush to run_metrics; returns rows written.
+
+        With min_interval, does nothing until that many seconds have passed
+        since the previous flush - cheap enough to call from hot loops.
+        """
+        if run_id is None:
+            return 0
+        with self._lock:
+            if time.monotonic() - self._last_flush < min_interval:
+                return 0
+            deltas = [
+                (stage, metric, value - self._flushed.get((stage, metric), 0))
+                for (stage, metric), value in self._values.items()
+                if value != self._flushed.get((stage, metric), 0)
+            ]
+            self._last_flush = time.monotonic()
+        if not deltas:
+            return 0
+
+        try:
+            conn = connect()
+        except Exception as e:
+            print(f"⚠️ Could not save run metrics: {e}")
+            return 0
+        if not conn:
+            return 0
+        try:
+            with conn.cursor() as cur:
+                cur.executemany("""
+                    INSERT INTO run_metrics (run_id, stage, metric, value)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (run_id, stage, metric) DO UPDATE SET
+                        value = run_metrics.value + EXCLUDED.value,
+                        recorded_at = CURRENT_TIMESTAMP
+                """, [(run_id, stage, metric, delta) for stage, metric, delta in deltas])
+            conn.commit()
+        except Exception as e:
+            print(f"⚠️ Could not save run metrics: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+
+        with self._lock:
+            for stage, metric, delta in deltas:
+                self._flushed[(stage, metric)] = self._flushed.get((stage, metric), 0) + delta
+        return len(deltas)
+
+    def report(self):
+        """Print a compact per-stage summary"""
+        print("\n📈 Run metrics:")
+        for stage, values in self.snapshot().items():
+            parts = [f"{metric}={value:.1f}" if isinstance(value, float) and not value.is_integer() else f"{metric}={int(value)}"
+                     for metric, value in values.items()]
+            print(f"  {stage}: {', '.join(parts)}")
+
+
+# Shared by every module recording into the current run
+metrics = RunMetrics()
@@ -0,0 +1,86 @@
+"""
+Content-addressed cache for AI match scores
+
+Scores are keyed by a hash of the normalized job content (title, company,
+location, description) plus a version hash of everything else that shapes
+the score: the user profile, the prompt templates and the model. The same
+posting seen again - from /api/search-company, another source or after a
+job_hash change - is never sent to OpenAI twice, while editing the profile
+or a prompt changes the version and misses every old entry.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from disk_cache import DiskCache
+from company_index import company_id
+
+SCORE_CACHE_PATH = os.getenv("SCORE_CACHE_PATH", os.path.join(".cache", "scores.sqlite"))
+SCORE_CACHE_MAX_BYTES = int(os.getenv("SCORE_CACHE_MAX_MB", "20")) * 1024 * 1024
+SCORE_CACHE_TTL = int(os.getenv("SCORE_CACHE_TTL_DAYS", "30")) * 24 * 3600
+SCORE_CACHE_DISABLED = os.getenv("SCORE_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_score_cache():
+    """Lazily open the shared score cache (None when disabled)"""
+    global _cache
+    if SCORE_CACHE_DISABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache(SCORE_CACHE_PATH, max_bytes=SCORE_CACHE_MAX_BYTES, default_ttl=SCORE_CACHE_TTL)
+    return _cache
+
+
+def _normalize_text(text):
+    return " ".join(re.findall(r"\w+", (text or "").lower()))
+
+
+def job_content_hash(job, description_chars=500):
+    """
+    Hash of the parts of a job the scorer actually sees.
+
+    Only the first description_chars of the description go into the prompt,
+    so trailing boilerplate differences between sources do not split entries.
+    """
+    payload = json.dumps([
+        _normalize_text(job.get('title')),
+        company_id(job.get('company_name', '')),
+        _normalize_text(job.get('location')),
+        _normalize_text((job.get('description') or '')[:description_chars]),
+    ], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def scoring_version(*parts):
+    """Short stable hash of the profile/prompt/model inputs to scoring"""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def score_cache_key(job, version):
+    return f"{version}:{job_content_hash(job)}"
+
+
+def get_cached_score(job, version):
+    """Cached score output for this job under this scoring version, or None"""
+    cache = get_score_cache()
+    if cache is None:
+        return None
+    return cache.get(score_cache_key(job, version))
+
+
+def cache_score(job, version, score_output):
+    cache = get_score_cache()
+    if cache is not None:
+        cache.set(score_cache_key(job, version), score_output)
+
+
+def score_cache_stats():
+    cache = get_score_cache()
+    return cache.stats() if cache is not None else {}
@@ -0,0 +1,133 @@
+"""
+Concurrent fan-out executor for job search sources
+
+Runs blocking source calls (SerpAPI requests, OpenAI calls) on a shared
+thread pool with a global concurrency cap, a per-source concurrency cap and
+a per-call timeout. Results are yielded in arrival order so the wall-clock
+time of a run is set by the slowest call instead of the sum of all calls.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_MAX_WORKERS = int(os.getenv("SEARCH_MAX_WORKERS", "8"))
+DEFAULT_PER_SOURCE_LIMIT = int(os.getenv("SEARCH_PER_SOURCE_LIMIT", "4"))
+DEFAULT_CALL_TIMEOUT = float(os.getenv("SEARCH_CALL_TIMEOUT", "45"))
+
+
+class SearchTask:
+    """A single call to run on the executor"""
+
+    def __init__(self, source, fn, *args, label=None, **kwargs):
+        self.source = source
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.label = label or source
+
+    def __call__(self):
+        return self.fn(*self.args, **self.kwargs)
+
+    def __repr__(self):
+        return f"SearchTask(source={self.source!r}, label={self.label!r})"
+
+
+class TaskResult:
+    """Outcome of a SearchTask - exactly one of value/error is meaningful"""
+
+    def __init__(self, task, value=None, error=None, elapsed=0.0):
+        self.task = task
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class FanOutExecutor:
+    """Thread-pool fan-out with global and per-source concurrency caps"""
+
+    def __init__(self, max_workers=None, per_source_limit=None, source_limits=None, call_timeout=None):
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.per_source_limit = per_source_limit or DEFAULT_PER_SOURCE_LIMIT
+        self.source_limits = source_limits or {}
+        self.call_timeout = call_timeout or DEFAULT_CALL_TIMEOUT
+
+    def _limit_for(self, source):
+        return self.source_limits.get(source, self.per_source_limit)
+
+    def run(self, tasks):
+        """
+        Run tasks concurrently and yield TaskResult objects as they finish.
+
+        Tasks are only handed to the pool when both the global and the
+        per-source caps have room, so a slow source never starves the others.
+        A call that exceeds call_timeout is reported as a TimeoutError; its
+        thread is abandoned (it keeps its slot until the call returns).
+        Closing the generator early stops dispatching the remaining tasks.
+        """
+        pending = deque(tasks)
+        running = {}        # future -> (task, started_at)
+        reported = set()    # futures already yielded (e.g. timed out)
+        in_flight = {}      # source -> running count
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fanout")
+
+        def dispatch():
+            skipped = deque()
+            while pending and len(running) < self.max_workers:
+                task = pending.popleft()
+                if in_flight.get(task.source, 0) >= self._limit_for(task.source):
+                    skipped.append(task)
+                    continue
+                in_flight[task.source] = in_flight.get(task.source, 0) + 1
+                running[pool.submit(task)] = (task, time.monotonic())
+            pending.extendleft(reversed(skipped))
+
+        try:
+            dispatch()
+            while running:
+                now = time.monotonic()
+                next_deadline = min(
+                    started + self.call_timeout
+                    for future, (_, started) in running.items()
+                    if future not in reported
+                ) if len(reported) < len(running) else now + self.call_timeout
+                done, _ = wait(list(running), timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    task, started = running.pop(future)
+                    in_flight[task.source] -= 1
+                    if future in reported:
+                        reported.discard(future)
+                        continue
+                    elapsed = time.monotonic() - started
+                    error = future.exception()
+                    if error is not None:
+                        yield TaskResult(task, error=error, elapsed=elapsed)
+                    else:
+                        yield TaskResult(task, value=future.result(), elapsed=elapsed)
+
+                now = time.monotonic()
+                for future, (task, started) in running.items():
+                    if future not in reported and now - started >= self.call_timeout:
+                        reported.add(future)
+                        yield TaskResult(
+                            task,
+                            error=TimeoutError(f"{task.label} timed out after {self.call_timeout:.0f}s"),
+                            elapsed=now - started,
+                        )
+
+                dispatch()
+                if not pending and len(reported) == len(running):
+                    break  # only abandoned calls left
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fan_out(tasks, **executor_kwargs):
+    """Convenience wrapper: run tasks on a fresh FanOutExecutor"""
+    return FanOutExecutor(**executor_kwargs).run(tasks)
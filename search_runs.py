@@ -0,0 +1,177 @@
+"""
+Checkpointed, resumable search runs
+
+Each daily run gets a search_runs row. As the pipeline works, it checkpoints
+what cost money to produce into search_run_checkpoints:
+
+- fetched: the raw results of each (source, query) SerpAPI search
+- scored:  the LLM match score of each job
+
+Persisted jobs need no checkpoint of their own - they are in the jobs table,
+and the existence check skips them on a rerun. A run that is killed (e.g. by
+the /api/run-search timeout) or fails stays open; the next run started
+within SEARCH_RUN_RESUME_HOURS picks it up, replays its checkpoints instead
+of repeating those calls, and carries on from there.
+
+Every checkpoint bumps the run's updated_at, which doubles as its lease: a
+'running' run is only taken over once it has been quiet for
+SEARCH_RUN_STALE_MINUTES, so an API-triggered search never hijacks a daily
+run that is still working.
+"""
+
+import os
+from psycopg2.extras import Json
+
+SEARCH_RUN_RESUME_HOURS = float(os.getenv("SEARCH_RUN_RESUME_HOURS", "12"))
+SEARCH_RUN_STALE_MINUTES = float(os.getenv("SEARCH_RUN_STALE_MINUTES", "15"))  # Quiet this long = its process died
+
+
+def query_key(source, query):
+    return f"{source}|{query}"
+
+
+class SearchRun:
+    """A search_runs row plus its checkpoints; works as a no-op without a database"""
+
+    def __init__(self, connect, trigger="manual", resume_hours=None, stale_minutes=None):
+        self.connect = connect
+        self.trigger = trigger
+        self.resume_hours = SEARCH_RUN_RESUME_HOURS if resume_hours is None else resume_hours
+        self.stale_minutes = SEARCH_RUN_STALE_MINUTES if stale_minutes is None else stale_minutes
+        self.id = None
+        self.resumed = False
+        self.fetched = {}   # 'source|query' -> jobs
+        self.scored = {}    # job_hash -> score dict
+
+    def _execute(self, sql, params, fetch=False):
+        conn = self.connect()
+        if not conn:
+            return None
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall() if fetch else None
+            conn.commit()
+            return rows
+        except Exception as e:
+            print(f"⚠️ Search run checkpoint failed: {e}")
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+
+    def start(self):
+        """
+        Resume the latest recent run that failed or whose process stopped
+        checkpointing, else open a new run. A run another process is still
+        working on is left alone.
+        """
+        rows = self._execute("""
+            UPDATE search_runs
+            SET status = 'running', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE id = (
+                SELECT id FROM search_runs
+                WHERE (status = 'failed'
+                       OR (status = 'running' AND updated_at < NOW() - make_interval(secs => %s)))
+                  AND started_at > NOW() - make_interval(secs => %s)
+                ORDER BY started_at DESC
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, attempts
+        """, (self.stale_minutes * 60, self.resume_hours * 3600), fetch=True)
+        if rows:
+            self.id, attempts = rows[0]
+            self.resumed = True
+            self._load_checkpoints()
+            print(f"♻️ Resuming search run {self.id} (attempt {attempts}): "
+                  f"{len(self.fetched)} searches and {len(self.scored)} scores checkpointed")
+            return self
+
+        rows = self._execute(
+            "INSERT INTO search_runs (trigger) VALUES (%s) RETURNING id", (self.trigger,), fetch=True
+        )
+        if rows:
+            self.id = rows[0][0]
+            print(f"🏁 Started search run {self.id}")
+        return self
+
+    def _load_checkpoints(self):
+        rows = self._execute(
+            "SELECT stage, key, payload FROM search_run_checkpoints WHERE run_id = %s", (self.id,), fetch=True
+        ) or []
+        for stage, key, payload in rows:
+            if stage == "fetched":
+                self.fetched[key] = payload
+            elif stage == "scored":
+                self.scored[key] = payload
+
+    def _checkpoint(self, stage, entries, counter):
+        """Store (key, payload) checkpoints and bump the run's counter column"""
+        if self.id is None or not entries:
+            return
+        conn = self.connect()
+        if not conn:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.executemany("""
+                    INSERT INTO search_run_checkpoints (run_id, stage, key, payload)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (run_id, stage, key) DO UPDATE SET payload = EXCLUDED.payload
+                """, [(self.id, stage, key, Json(payload)) for key, payload in entries])
+                cur.execute(
+                    f"UPDATE search_runs SET {counter} = {counter} + %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s",
+                    (len(entries), self.id)
+                )
+            conn.commit()
+        except Exception as e:
+            print(f"⚠️ Search run checkpoint failed: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def fetched_jobs(self, source, query):
+        """Checkpointed results of a search, or None if it has not run yet"""
+        return self.fetched.get(query_key(source, query))
+
+    def record_fetch(self, source, query, jobs):
+        key = query_key(source, query)
+        self.fetched[key] = jobs
+        self._checkpoint("fetched", [(key, jobs)], "queries_fetched")
+
+    def scored_job(self, job_hash):
+        return self.scored.get(job_hash)
+
+    def record_scores(self, scores):
+        """Checkpoint {job_hash: score dict} for jobs the LLM scored"""
+        self.scored.update(scores)
+        self._checkpoint("scored", list(scores.items()), "jobs_scored")
+
+    def record_persisted(self, job_hashes):
+        if self.id is not None and job_hashes:
+            self._execute("""
+                UPDATE search_runs
+                SET jobs_persisted = jobs_persisted + %s, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (len(job_hashes), self.id))
+
+    def reached(self, stage):
+        if self.id is not None:
+            self._execute(
+                "UPDATE search_runs SET stage = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s",
+                (stage, self.id)
+            )
+
+    def finish(self, status="completed"):
+        """Close the run; a completed run drops its checkpoints, a failed one keeps them to resume"""
+        if self.id is None:
+            return
+        self._execute("""
+            UPDATE search_runs
+            SET status = %s, updated_at = CURRENT_TIMESTAMP,
+                finished_at = CASE WHEN %s = 'completed' THEN CURRENT_TIMESTAMP END
+            WHERE id = %s
+        """, (status, status, self.id))
+        if status == "completed":
+            self._execute("DELETE FROM search_run_checkpoints WHERE run_id = %s", (self.id,))
@@ -0,0 +1,133 @@
+"""
+Cached SerpAPI access
+
+All SerpAPI requests go through serpapi_search(), which looks the request up
+in a persistent disk cache before paying for a live GoogleSearch call.
+Cache keys are the canonicalized request params without the api_key, and
+each engine gets its own TTL. Live calls are throttled by a process-wide
+token bucket (plus an optional per-source bucket) to stay under SerpAPI's
+rate limits.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from serpapi import GoogleSearch
+from dotenv import load_dotenv
+from disk_cache import DiskCache
+from rate_limit import TokenBucket
+from run_metrics import metrics
+
+load_dotenv()
+
+SERPAPI_CACHE_PATH = os.getenv("SERPAPI_CACHE_PATH", os.path.join(".cache", "serpapi.sqlite"))
+SERPAPI_CACHE_MAX_BYTES = int(os.getenv("SERPAPI_CACHE_MAX_MB", "100")) * 1024 * 1024
+SERPAPI_CACHE_DISABLED = os.getenv("SERPAPI_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+# Both engines mostly return job listings, which churn daily. google_jobs
+# expires just under a day so the next daily run fetches fresh results.
+# "google" also serves the job-board and career-page searches, so it stays
+# at a day too. Its LinkedIn people searches are kept longer in the
+# contacts table (CONTACT_TTL_DAYS) rather than here.
+ENGINE_TTLS = {
+    "google_jobs": 20 * 3600,
+    "google": 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+# Shared by every live SerpAPI call in this process, whatever the source
+SERPAPI_RATE_PER_SEC = float(os.getenv("SERPAPI_RATE_PER_SEC", "5"))
+SERPAPI_BURST = int(os.getenv("SERPAPI_BURST", "10"))
+serpapi_limiter = TokenBucket(SERPAPI_RATE_PER_SEC, SERPAPI_BURST)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Lazily open the shared SerpAPI cache (None when disabled)"""
+    global _cache
+    if SERPAPI_CACHE_DISABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache(SERPAPI_CACHE_PATH, max_bytes=SERPAPI_CACHE_MAX_BYTES, default_ttl=DEFAULT_TTL)
+    return _cache
+
+
+def canonical_params(params):
+    """Params as a stable dict - api_key dropped, values stringified"""
+    return {k: str(v) for k, v in sorted(params.items()) if k != "api_key" and v is not None}
+
+
+def cache_key(params):
+    """Hash of the canonicalized request"""
+    payload = json.dumps(canonical_params(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def is_cached(params):
+    """True when serpapi_search(params) would be served without a live call"""
+    cache = get_cache()
+    return cache is not None and cache.contains(cache_key(params))
+
+
+def serpapi_search(params, use_cache=True, limiter=None):
+    """
+    Drop-in replacement for GoogleSearch(params).get_dict() with caching.
+
+    Cache hits are free; a live call first takes a token from the optional
+    per-source limiter and then from the shared serpapi_limiter.
+    """
+    cache = get_cache() if use_cache else None
+    key = cache_key(params)
+    stage = f"serpapi:{params.get('engine', 'unknown')}"
+
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            metrics.add(stage, "cache_hits")
+            return cached
+
+    if limiter is not None:
+        limiter.acquire()
+    serpapi_limiter.acquire()
+    started = time.monotonic()
+    results = GoogleSearch(params).get_dict()
+    metrics.add(stage, "call_seconds", time.monotonic() - started)
+    metrics.add(stage, "calls")
+    metrics.add(stage, "credits")   # Every live search costs one credit, errors included
+    if "error" in results:
+        metrics.add(stage, "errors")
+
+    # Never cache failed requests - they would block retries until expiry
+    if cache is not None and "error" not in results:
+        ttl = ENGINE_TTLS.get(params.get("engine"), DEFAULT_TTL)
+        cache.set(key, results, ttl=ttl)
+
+    return results
+
+
+def iter_result_pages(params, max_pages=1, limiter=None):
+    """Yield successive result pages, following next_page_token only on demand"""
+    next_page_token = None
+
+    for _ in range(max_pages):
+        page_params = dict(params)
+        if next_page_token:
+            page_params["next_page_token"] = next_page_token
+
+        results = serpapi_search(page_params, limiter=limiter)
+        yield results
+
+        next_page_token = results.get("serpapi_pagination", {}).get("next_page_token")
+        if not next_page_token:
+            return
+
+
+def cache_stats():
+    """Hit/miss counters for the SerpAPI cache"""
+    cache = get_cache()
+    return cache.stats() if cache is not None else {"disabled": True}
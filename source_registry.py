@@ -0,0 +1,127 @@
+"""
+Pluggable job source registry
+
+Each source declares how to generate its queries, how to turn a query into
+SerpAPI params, how to parse a result page into job records, its own rate
+limit and its result budgets. Sources are fetched one query at a time, so a
+run can fan every (source, query) pair out on the search executor.
+"""
+
+from rate_limit import TokenBucket
+from search_executor import SearchTask
+from serpapi_client import iter_result_pages, is_cached
+
+SOURCES = {}
+
+
+class Source:
+    """A job source backed by SerpAPI"""
+
+    def __init__(self, name, queries, build_params, parser, display_name=None,
+                 rate_per_sec=2.0, burst=2, concurrency=2, per_query_limit=None,
+                 budget=None, max_pages=1, min_novelty=0.0, count_new=None):
+        """
+        Args:
+            name: registry key, also stored as the executor's source label
+            queries: list of query specs, or a callable returning one
+            build_params: callable(spec) -> SerpAPI params dict
+            parser: callable(results, spec) -> list of job dicts
+            rate_per_sec / burst: per-source token bucket for live calls
+            concurrency: max simultaneous calls for this source
+            per_query_limit: max jobs kept from a single query
+            budget: max jobs kept from the whole source in one run
+            max_pages: pages to follow per query (Google Jobs only)
+            min_novelty: stop paginating once the share of new jobs on a page drops below this
+            count_new: callable(jobs) -> how many of them are not stored yet; needed for min_novelty
+        """
+        self.name = name
+        self.display_name = display_name or name
+        self._queries = queries
+        self.build_params = build_params
+        self.parser = parser
+        self.limiter = TokenBucket(rate_per_sec, burst)
+        self.concurrency = concurrency
+        self.per_query_limit = per_query_limit
+        self.budget = budget
+        self.max_pages = max_pages
+        self.min_novelty = min_novelty
+        self.count_new = count_new
+
+    def queries(self):
+        return list(self._queries() if callable(self._queries) else self._queries)
+
+    def cost(self, spec):
+        """Worst-case SerpAPI credits for one query (0 when the first page is cached)"""
+        if is_cached(self.build_params(spec)):
+            return 0
+        return self.max_pages
+
+    def fetch(self, spec):
+        """
+        Run one query and return its parsed jobs (at most per_query_limit).
+
+        The next page is only requested while the limit is not reached and
+        the last page was still mostly new jobs.
+        """
+        jobs = []
+        for results in iter_result_pages(self.build_params(spec), max_pages=self.max_pages, limiter=self.limiter):
+            page = self.parser(results, spec)
+            if not page:
+                break
+            jobs.extend(page)
+            if self.per_query_limit is not None and len(jobs) >= self.per_query_limit:
+                break
+            if self.min_novelty and self.count_new is not None and not self._novel(page):
+                break   # This query has stopped turning up anything new
+        return jobs[:self.per_query_limit] if self.per_query_limit is not None else jobs
+
+    def _novel(self, page):
+        try:
+            return self.count_new(page) / len(page) >= self.min_novelty
+        except Exception as e:
+            print(f"⚠️ Could not check {self.display_name} page novelty, not paginating further: {e}")
+            return False
+
+    def tasks(self):
+        """One executor task per query"""
+        return [SearchTask(self.name, self.fetch, spec, label=f"{self.name}: {spec}") for spec in self.queries()]
+
+    def run(self):
+        """Fetch every query sequentially, honouring the source budget"""
+        all_jobs = []
+        for spec in self.queries():
+            try:
+                all_jobs.extend(self.fetch(spec))
+            except Exception as e:
+                print(f"Error searching {self.display_name} with query '{spec}': {e}")
+                continue
+            if self.budget is not None and len(all_jobs) >= self.budget:
+                break
+        return all_jobs[:self.budget] if self.budget is not None else all_jobs
+
+
+def register_source(source):
+    """Add (or replace) a source in the registry"""
+    SOURCES[source.name] = source
+    return source
+
+
+def get_source(name):
+    return SOURCES[name]
+
+
+def run_source(name):
+    return SOURCES[name].run()
+
+
+def source_tasks(names):
+    """Executor tasks for every query of the named sources"""
+    tasks = []
+    for name in names:
+        tasks.extend(SOURCES[name].tasks())
+    return tasks
+
+
+def source_concurrency(names):
+    """Per-source concurrency caps for FanOutExecutor(source_limits=...)"""
+    return {name: SOURCES[name].concurrency for name in names}
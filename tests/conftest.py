@@ -0,0 +1,76 @@
+"""
+Shared test helpers
+
+Tests import the repo's flat modules directly, so the repo root goes on
+sys.path. FakeConnection stands in for a pooled psycopg2 connection: it
+records every statement and answers fetches from a queue of canned rows.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((" ".join(sql.split()), params))
+        if self.conn.fail_on and self.conn.fail_on in sql:
+            raise RuntimeError("database error")
+        self._rows = self.conn.results.pop(0) if self.conn.results else []
+        self.rowcount = len(self._rows)
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self.conn.executed.append((" ".join(sql.split()), rows))
+        if self.conn.fail_on and self.conn.fail_on in sql:
+            raise RuntimeError("database error")
+        self.rowcount = len(rows)
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeConnection:
+    """Records statements; `results` is a list of row lists, one per execute()"""
+
+    def __init__(self, results=None, fail_on=None):
+        self.results = list(results or [])
+        self.fail_on = fail_on
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def fake_conn():
+    return FakeConnection()
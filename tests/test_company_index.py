@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+from company_index import CompanyIndex, canonical_company, company_id, same_company
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_canonical_company_strips_suffixes_and_resolves_aliases():
+    assert canonical_company("Stripe, Inc.") == "stripe"
+    assert canonical_company("TripActions") == "navan"
+    assert canonical_company("") == ""
+
+
+def test_index_resolves_prefix_forms():
+    index = CompanyIndex(["Amazon", "Bending Spoons"])
+    assert index.lookup("Amazon.com Services LLC") == "amazon"
+    assert index.lookup("Bending Spoons S.p.A.") == "bending spoons"
+    assert index.lookup("Bending") is None
+
+
+def test_company_id_is_the_same_without_importing_the_agent():
+    # The API's sheet sync imports company_index on its own; it must agree with the agent
+    code = "from company_index import company_id; print(company_id('Amazon.com Services LLC'))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "amazon" == company_id("Amazon.com Services LLC")
+
+
+def test_same_company():
+    assert same_company("Oura Health", "Oura")
+    assert not same_company("Stripe", "Strava")
@@ -0,0 +1,53 @@
+import pytest
+
+import source_registry
+from conftest import FakeConnection
+from credit_planner import CreditPlanner, UNTRIED_PRIOR
+from source_registry import Source, register_source, source_tasks
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Two test sources: 'jobs' (2 pages per query) and 'board' (1 page); nothing cached"""
+    monkeypatch.setattr(source_registry, "SOURCES", {})
+    monkeypatch.setattr(source_registry, "is_cached", lambda params: params["q"].startswith("cached"))
+    register_source(Source("jobs", ["a", "b", "c"], lambda q: {"q": q}, lambda results, q: [], max_pages=2))
+    register_source(Source("board", ["x", "y", "cached z"], lambda q: {"q": q}, lambda results, q: []))
+    return ["jobs", "board"]
+
+
+def planned(planner, names):
+    return [(task.source, task.args[0]) for task in planner.plan(source_tasks(names))]
+
+
+def test_plan_stays_within_budget_at_worst_case_cost(sources):
+    # jobs queries cost 2 each, board queries 1, the cached one nothing
+    plan = planned(CreditPlanner(lambda: None, budget=5), sources)
+    assert plan == [("jobs", "a"), ("jobs", "b"), ("board", "x"), ("board", "cached z")]
+
+
+def test_best_recent_yield_is_planned_first(sources):
+    planner = CreditPlanner(lambda: None, budget=4)
+    planner.history = {("board", "y"): UNTRIED_PRIOR * 2, ("jobs", "a"): 0.0, ("jobs", "b"): 0.0, ("jobs", "c"): 0.0}
+    plan = planned(planner, sources)
+    assert plan[:2] == [("board", "y"), ("board", "x")]
+    assert ("jobs", "a") in plan and ("jobs", "b") not in plan
+
+
+def test_history_decays_older_runs():
+    conn = FakeConnection(results=[[("jobs", "a", 1, 10), ("jobs", "a", 1, 0)]])
+    history = CreditPlanner(lambda: conn).load_history()
+    assert history[("jobs", "a")] == pytest.approx(10 / 1.7)
+
+
+def test_record_counts_only_jobs_new_to_the_table_and_the_run(sources):
+    conn = FakeConnection(results=[[("h1",)]])   # h1 was stored before the run
+    planner = CreditPlanner(lambda: conn, budget=10)
+    first, second = planner.plan(source_tasks(["board"]))[:2]
+    planner.observe(first, ["h1", "h2", "h3"])
+    planner.observe(second, ["h2", "h4"])
+    planner.record()
+
+    sql, rows = conn.executed[-1]
+    assert sql.startswith("INSERT INTO query_yields")
+    assert rows == [("board", "x", 1, 3, 2), ("board", "y", 1, 2, 1)]
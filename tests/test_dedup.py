@@ -0,0 +1,54 @@
+from dedup import NearDuplicateIndex, normalize_url
+
+
+def job(title, company, url="", location="Seattle, WA", **extra):
+    return dict(title=title, company_name=company, location=location, job_url=url, **extra)
+
+
+def test_normalize_url_keeps_identifying_query_and_drops_tracking():
+    assert normalize_url("https://www.indeed.com/viewjob?jk=aaa111&utm_source=x") == "indeed.com/viewjob?jk=aaa111"
+    assert normalize_url("https://indeed.com/viewjob?jk=aaa111") != normalize_url("https://indeed.com/viewjob?jk=bbb222")
+    assert normalize_url("https://a.com/jobs/1/?b=2&a=1") == normalize_url("http://www.a.com/jobs/1?a=1&b=2")
+
+
+def test_query_identified_urls_are_different_postings():
+    index = NearDuplicateIndex()
+    index.seed([job("Senior Product Manager", "Stripe", "https://www.indeed.com/viewjob?jk=aaa111")])
+    assert index.add(job("Head of Growth", "Oura", "https://indeed.com/viewjob?jk=bbb222")) is None
+
+    index.add(job("Product Manager", "Calm", "https://www.google.com/search?q=pm&htidocid=A1"))
+    assert index.add(job("Product Manager", "Notion", "https://www.google.com/search?q=pm&htidocid=B2")) is None
+
+
+def test_same_url_same_company_is_a_duplicate():
+    index = NearDuplicateIndex()
+    index.seed([job("Senior Product Manager", "Stripe", "https://indeed.com/viewjob?jk=aaa111")])
+    duplicate = index.add(job("Sr. PM", "Stripe, Inc.", "https://indeed.com/viewjob?jk=aaa111&utm_campaign=y"))
+    assert duplicate is not None and duplicate['_existing']
+
+
+def test_same_url_needs_same_company_and_compatible_job_id():
+    index = NearDuplicateIndex()
+    index.add(job("Product Manager", "Stripe", "https://jobs.example.com/view", job_id="1"))
+    assert index.add(job("Product Manager", "Oura", "https://jobs.example.com/view")) is None
+    assert index.add(job("Product Manager", "Stripe", "https://jobs.example.com/view", job_id="2")) is None
+
+
+def test_cross_source_near_duplicate_matches():
+    index = NearDuplicateIndex()
+    index.add(job("Senior Product Manager - Payments", "Stripe", "https://builtin.com/job/1"))
+    assert index.add(job("Sr. PM - Payments", "Stripe, Inc.", "https://boards.greenhouse.io/stripe/2")) is not None
+
+
+def test_different_team_or_city_is_not_a_duplicate():
+    index = NearDuplicateIndex()
+    index.add(job("Senior Product Manager, Payments", "Stripe", "https://builtin.com/job/1"))
+    assert index.add(job("Senior Product Manager, Billing", "Stripe", "https://greenhouse.io/2")) is None
+    assert index.add(job("Senior Product Manager, Payments", "Stripe", "https://greenhouse.io/3", location="New York, NY")) is None
+
+
+def test_stored_rows_need_identical_titles():
+    index = NearDuplicateIndex()
+    index.seed([job("Senior Product Manager, Consumer Growth Platform", "Stripe", "https://a.com/1")])
+    assert index.add(job("Senior Product Manager, Enterprise Growth Platform", "Stripe", "https://b.com/2")) is None
+    assert index.add(job("Senior Product Manager, Consumer Growth Platform", "Stripe", "https://b.com/3")) is not None
@@ -0,0 +1,64 @@
+import pytest
+
+import job_spool
+from conftest import FakeConnection
+from job_spool import JobSpool, read_spool
+
+
+def record(job_hash, score):
+    return {
+        'job_hash': job_hash, 'title': 'Product Manager', 'company_name': 'Oura', 'location': 'Remote',
+        'description': '', 'job_url': f'https://a.com/{job_hash}', 'match_score': score,
+        'ai_analysis': f'Score: {score}', 'contacts': [],
+    }
+
+
+@pytest.fixture
+def upserts(monkeypatch):
+    calls = []
+    monkeypatch.setattr(job_spool, "execute_values", lambda cur, sql, rows, page_size: calls.append(list(rows)))
+    return calls
+
+
+def test_spooled_records_read_back_and_torn_lines_are_skipped(tmp_path):
+    path = str(tmp_path / "spool.jsonl")
+    spool = JobSpool(path)
+    spool.append_many([record("a", 1), record("b", 2)])
+    spool.close()
+    with open(path, "a") as f:
+        f.write('{"job_hash": "c", "ti')   # Crash mid-write
+    assert [r['job_hash'] for r in read_spool(path)] == ["a", "b"]
+
+
+def test_replay_upserts_the_last_copy_of_each_job_and_empties_the_spool(tmp_path, upserts):
+    path = str(tmp_path / "spool.jsonl")
+    spool = JobSpool(path)
+    spool.append_many([record("a", 10), record("b", 20)])
+    spool.append(record("a", 30))
+    conn = FakeConnection()
+
+    assert spool.replay(lambda: conn) == 2
+    rows = {row[0]: row for row in upserts[0]}
+    assert rows["a"][7] == 30 and rows["b"][7] == 20
+    assert conn.commits == 1
+    assert list(read_spool(path)) == [] and not (tmp_path / "spool.jsonl.replaying").exists()
+    assert spool.replay(lambda: conn) == 0   # Replaying again is a no-op
+
+
+def test_failed_replay_keeps_the_records_for_the_next_one(tmp_path, monkeypatch):
+    path = str(tmp_path / "spool.jsonl")
+    spool = JobSpool(path)
+    spool.append(record("a", 10))
+
+    def failing(cur, sql, rows, page_size):
+        raise RuntimeError("database error")
+    monkeypatch.setattr(job_spool, "execute_values", failing)
+    with pytest.raises(RuntimeError):
+        spool.replay(FakeConnection)
+    spool.append(record("b", 20))   # Lands in a fresh spool file meanwhile
+
+    replayed = []
+    monkeypatch.setattr(job_spool, "execute_values", lambda cur, sql, rows, page_size: replayed.extend(rows))
+    assert spool.replay(FakeConnection) == 1   # The interrupted batch first...
+    assert spool.replay(FakeConnection) == 1   # ...then the newer file
+    assert sorted(row[0] for row in replayed) == ["a", "b"]
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+import job_writer
+from conftest import FakeConnection
+from job_spool import JobSpool, read_spool
+from job_writer import JobBatchWriter, UPSERT_SQL
+
+
+def job_data(job_hash, score=80, status='scored'):
+    return {
+        'job_hash': job_hash, 'title': 'Senior Product Manager', 'company_name': 'Stripe, Inc.',
+        'location': 'Seattle, WA', 'description': 'Payments', 'job_url': f'https://a.com/{job_hash}',
+        'match_score': score, 'ai_analysis': f'Score: {score}', 'score_status': status, 'contacts': [],
+    }
+
+
+@pytest.fixture
+def upserts(monkeypatch):
+    """Rows handed to execute_values, one list per call"""
+    calls = []
+    monkeypatch.setattr(job_writer, "execute_values", lambda cur, sql, rows, page_size: calls.append(list(rows)))
+    return calls
+
+
+def writer_for(conn, tmp_path, saved=None, **kwargs):
+    return JobBatchWriter(lambda: conn, JobSpool(str(tmp_path / "spool.jsonl")),
+                          on_saved=saved.extend if saved is not None else None, **kwargs)
+
+
+def test_flush_upserts_the_buffer_in_one_transaction(tmp_path, upserts):
+    conn, saved = FakeConnection(), []
+    writer = writer_for(conn, tmp_path, saved, max_seconds=60)
+    writer.add(job_data("a", score=50))
+    writer.add(job_data("b"))
+    writer.add(job_data("a", score=90))   # Last write wins within a batch
+
+    assert writer.close() == 2
+    assert len(upserts) == 1
+    rows = {row[0]: row for row in upserts[0]}
+    assert rows["a"][7] == 90
+    assert rows["a"][3] == "stripe"   # company_canonical
+    assert conn.commits == 1 and sorted(saved) == ["a", "b"]
+
+
+def test_flushes_when_max_rows_is_reached(tmp_path, upserts):
+    writer = writer_for(FakeConnection(), tmp_path, max_rows=2, max_seconds=60)
+    writer.add(job_data("a"))
+    assert upserts == []
+    writer.add(job_data("b"))
+    assert len(upserts) == 1 and writer.buffer == {}
+
+
+def test_timer_flushes_a_lone_job_without_another_add(tmp_path, upserts):
+    saved = []
+    writer = writer_for(FakeConnection(), tmp_path, saved, max_seconds=0.05)
+    writer.add(job_data("a"))
+    deadline = time.monotonic() + 2
+    while not saved and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert saved == ["a"]
+
+
+def test_database_error_spools_the_batch(tmp_path, monkeypatch):
+    def failing(cur, sql, rows, page_size):
+        raise RuntimeError("database error")
+    monkeypatch.setattr(job_writer, "execute_values", failing)
+    conn, saved = FakeConnection(), []
+    writer = writer_for(conn, tmp_path, saved, max_seconds=60)
+    writer.add(job_data("a"))
+
+    assert writer.close() == 0
+    assert conn.rollbacks == 1 and saved == []
+    assert [record['job_hash'] for record in read_spool(str(tmp_path / "spool.jsonl"))] == ["a"]
+
+
+def test_upsert_never_replaces_an_llm_score_with_a_pending_estimate():
+    assert "ON CONFLICT (job_hash) DO UPDATE" in UPSERT_SQL
+    assert ("match_score = CASE WHEN EXCLUDED.score_status = 'pending' AND jobs.score_status = 'scored' "
+            "THEN jobs.match_score ELSE EXCLUDED.match_score END") in " ".join(UPSERT_SQL.split())
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+import llm_executor
+from llm_executor import AsyncCompletionExecutor
+from run_metrics import metrics
+
+
+class FakeClient:
+    """AsyncOpenAI stand-in: answers after `fail_times` rate-limit errors"""
+
+    def __init__(self, fail_times=0, *args, **kwargs):
+        self.fail_times = fail_times
+        self.requests = []
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        self.requests.append(request)
+        if len(self.requests) <= self.fail_times:
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            raise openai.RateLimitError("slow down", response=httpx.Response(429, request=request), body=None)
+        return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5), request=request)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_map_returns_results_in_request_order():
+    client = FakeClient()
+    executor = AsyncCompletionExecutor(client=client, concurrency=2)
+    results = asyncio.run(executor.map([{"model": "m", "n": i} for i in range(5)]))
+    assert [result.request["n"] for result in results] == list(range(5))
+
+
+def test_rate_limits_are_retried(monkeypatch):
+    monkeypatch.setattr(llm_executor, "backoff_delay", lambda attempt: 0)
+    client = FakeClient(fail_times=2)
+    executor = AsyncCompletionExecutor(client=client, max_retries=3)
+    assert asyncio.run(executor.complete(model="m")) is not None
+    assert (executor.calls, executor.retries) == (3, 2)
+
+
+def test_past_deadline_fails_under_the_model_stage():
+    metrics.reset()
+    executor = AsyncCompletionExecutor(client=FakeClient(), deadline=time.monotonic() - 1)
+    assert asyncio.run(executor.complete(model="gpt-test")) is None
+    assert metrics.snapshot()["openai:gpt-test"]["failures"] == 1
+
+
+def test_closes_only_a_client_it_created(monkeypatch):
+    created = []
+    monkeypatch.setattr(llm_executor, "AsyncOpenAI", lambda **kwargs: created.append(FakeClient()) or created[-1])
+
+    async def run():
+        async with AsyncCompletionExecutor() as executor:
+            await executor.complete(model="m")
+    asyncio.run(run())
+    assert created[0].closed
+
+    given = FakeClient()
+    asyncio.run(AsyncCompletionExecutor(client=given).close())
+    assert not given.closed
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from pipeline import Pipeline, RunBudget, Stage
+
+
+def test_items_flow_through_every_stage_in_batches():
+    batch_sizes = []
+
+    def double(batch):
+        batch_sizes.append(len(batch))
+        return [item * 2 for item in batch]
+
+    pipeline = Pipeline([Stage("double", double, batch_size=4), Stage("inc", lambda b: [i + 1 for i in b], workers=3)])
+    results = pipeline.run(range(10))
+
+    assert sorted(results) == [i * 2 + 1 for i in range(10)]
+    assert max(batch_sizes) <= 4
+    assert [stats["received"] for stats in pipeline.stats()] == [10, 10]
+
+
+def test_source_failure_is_raised_after_yielded_items_are_processed():
+    processed = []
+
+    def source():
+        yield 1
+        yield 2
+        raise RuntimeError("planner down")
+
+    pipeline = Pipeline([Stage("collect", lambda batch: processed.extend(batch) or batch)])
+    with pytest.raises(RuntimeError, match="planner down"):
+        pipeline.run(source())
+    assert sorted(processed) == [1, 2]
+    assert isinstance(pipeline.source_error, RuntimeError)
+
+
+def test_failed_batches_are_recorded_not_passed_on():
+    def flaky(batch):
+        if 3 in batch:
+            raise ValueError("bad batch")
+        return batch
+
+    pipeline = Pipeline([Stage("flaky", flaky, batch_size=2)])
+    results = pipeline.run(range(6))
+
+    failed = [item for _, item in pipeline.failed()]
+    assert 3 in failed
+    assert sorted(results + failed) == list(range(6))
+    assert pipeline.stats()[0]["errors"] == 1
+
+
+def test_run_budget_admits_up_to_max_jobs_then_defers():
+    budget = RunBudget(3)
+    assert budget.admit([1, 2]) == ([1, 2], [])
+    assert budget.admit([3, 4, 5]) == ([3], [4, 5])
+    assert (budget.admitted, budget.deferred) == (3, 2)
+
+
+def test_run_budget_defers_everything_after_the_deadline():
+    budget = RunBudget(None, deadline=time.monotonic() - 1)
+    assert budget.admit([1, 2]) == ([], [1, 2])
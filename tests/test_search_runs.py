@@ -0,0 +1,46 @@
+from conftest import FakeConnection
+from search_runs import SearchRun
+
+
+def connect_to(conn):
+    return lambda: conn
+
+
+def test_resumes_only_failed_or_stale_running_runs():
+    conn = FakeConnection(results=[[(7, 2)], [("fetched", "google_jobs|pm", [{"title": "PM"}]), ("scored", "h1", {"base_score": 80})]])
+    run = SearchRun(connect_to(conn), resume_hours=12, stale_minutes=15).start()
+
+    assert (run.id, run.resumed) == (7, True)
+    assert run.fetched_jobs("google_jobs", "pm") == [{"title": "PM"}]
+    assert run.scored_job("h1") == {"base_score": 80}
+
+    sql, params = conn.executed[0]
+    assert "status = 'failed' OR (status = 'running' AND updated_at < NOW() - make_interval(secs => %s))" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert params == (15 * 60, 12 * 3600)
+
+
+def test_starts_a_new_run_when_nothing_is_resumable():
+    conn = FakeConnection(results=[[], [(8,)]])   # A live run elsewhere is not returned by the UPDATE
+    run = SearchRun(connect_to(conn), trigger="api").start()
+
+    assert (run.id, run.resumed) == (8, False)
+    assert conn.executed[1] == ("INSERT INTO search_runs (trigger) VALUES (%s) RETURNING id", ("api",))
+
+
+def test_completed_run_drops_checkpoints_failed_run_keeps_them():
+    conn = FakeConnection()
+    run = SearchRun(connect_to(conn))
+    run.id = 3
+
+    run.finish("failed")
+    assert not any(sql.startswith("DELETE") for sql, _ in conn.executed)
+    run.finish("completed")
+    assert conn.executed[-1] == ("DELETE FROM search_run_checkpoints WHERE run_id = %s", (3,))
+
+
+def test_no_database_makes_the_run_a_no_op():
+    run = SearchRun(lambda: None).start()
+    run.record_fetch("google_jobs", "pm", [])
+    run.finish()
+    assert run.id is None and run.fetched_jobs("google_jobs", "pm") == []